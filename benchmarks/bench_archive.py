@@ -0,0 +1,94 @@
+"""
+Benchmark: waveform archive vs. one raw .bin file per capture
+
+Writes and reads synthetic 8-bit scope captures (a noisy sine, as digitized
+by a scope) as raw files and as WaveformArchive files with each codec,
+reporting throughput, size on disk and the cost of reading one chunk:
+
+    python benchmarks/bench_archive.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from visa_bundle.WaveformArchive import WaveformArchive  # noqa: E402
+
+CAPTURES = 20
+SAMPLES = 1_000_000
+
+
+def make_captures():
+    """Noisy sine captures quantized to int8."""
+    rng = numpy.random.default_rng(0)
+    phase = numpy.arange(SAMPLES) * (2 * numpy.pi / 2500.0)
+    return [numpy.clip(numpy.sin(phase + index) * 100 + rng.normal(0, 2, SAMPLES),
+                       -128, 127).astype("i1") for index in range(CAPTURES)]
+
+
+def bench_raw(directory, captures):
+    """Write and read one .bin file per capture."""
+    start = time.perf_counter()
+    for index, data in enumerate(captures):
+        with open(os.path.join(directory, f"capture_{index}.bin"), "wb") as file:
+            file.write(data.tobytes())
+    written = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(len(captures)):
+        with open(os.path.join(directory, f"capture_{index}.bin"), "rb") as file:
+            numpy.frombuffer(file.read(), dtype="i1")
+    read = time.perf_counter() - start
+
+    size = sum(os.path.getsize(os.path.join(directory, f"capture_{index}.bin"))
+               for index in range(len(captures)))
+    return written, read, size, None
+
+
+def bench_archive(directory, captures, codec, level):
+    """Write and read the captures as one archive."""
+    path = os.path.join(directory, f"captures_{codec}.vbw")
+    start = time.perf_counter()
+    with WaveformArchive(path, "w", codec=codec, level=level) as archive:
+        for index, data in enumerate(captures):
+            archive.add(f"capture_{index}", data, {"command": ":WAV:DATA?"})
+    written = time.perf_counter() - start
+
+    with WaveformArchive(path) as archive:
+        start = time.perf_counter()
+        for name in archive.names():
+            archive.read(name)
+        read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in archive.names():
+            archive.read_chunk(name, 0)
+        chunk = (time.perf_counter() - start) / len(captures)
+
+    return written, read, os.path.getsize(path), chunk
+
+
+def main():
+    captures = make_captures()
+    total = sum(data.nbytes for data in captures) / 1e6
+
+    print(f"{CAPTURES} captures x {SAMPLES} samples ({total:.0f} MB)")
+    print(f"{'format':12s} {'write MB/s':>10s} {'read MB/s':>10s} {'size MB':>8s} {'1 chunk ms':>10s}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, run in (("raw .bin", lambda: bench_raw(directory, captures)),
+                           ("zlib -1", lambda: bench_archive(directory, captures, "zlib", 1)),
+                           ("zlib -6", lambda: bench_archive(directory, captures, "zlib", 6)),
+                           ("lzma -1", lambda: bench_archive(directory, captures, "lzma", 1))):
+            written, read, size, chunk = run()
+            chunk_text = f"{chunk * 1000:10.2f}" if chunk is not None else f"{'-':>10s}"
+            print(f"{label:12s} {total / written:10.0f} {total / read:10.0f} "
+                  f"{size / 1e6:8.1f} {chunk_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Microbenchmark: per-call overhead of generic vs. fast-path VISA methods
+
+Uses an in-memory handle that answers instantly, so the timings are the
+library's own dispatch overhead per query()/write():
+
+    python benchmarks/bench_dispatch.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from visa_bundle import VISA, Setting  # noqa: E402
+from visa_bundle import ConnectionRegistry  # noqa: E402
+
+CALLS = 100_000
+
+
+class InstantResource:
+    """Handle answering every request immediately."""
+
+    def __init__(self, address):
+        self.resource_name = address
+
+    def write(self, command):
+        pass
+
+    def query(self, command, delay=None):
+        return "+1.0E+00"
+
+    def read(self):
+        return "+1.0E+00"
+
+    def flush(self, mask):
+        pass
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+ConnectionRegistry.register_message_based_type(InstantResource)
+
+
+def per_call(function):
+    """Average microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        function("READ?")
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def main():
+    with patch("pyvisa.ResourceManager") as mock_rm:
+        mock_rm.return_value.open_resource.side_effect = InstantResource
+
+        for send in (True, False):
+            Setting.VISA_Send_Enable = True
+            generic = VISA("generic", "USB0::1::INSTR", skip_clear=True)
+            fast = VISA("fast", "USB0::1::INSTR", skip_clear=True, fast_path=True)
+            Setting.VISA_Send_Enable = send
+
+            print(f"VISA_Send_Enable = {send}")
+            for method in ("query", "write"):
+                slow = per_call(getattr(generic, method))
+                quick = per_call(getattr(fast, method))
+                print(f"  {method:6s} generic {slow:6.2f} us   fast path {quick:6.2f} us"
+                      f"   ({slow / quick:.1f}x)")
+
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: naive capture loop vs. acquisition pipeline
+
+A simulated scope takes TRANSFER_TIME per query_binary(); each capture is
+then decoded and FFT'd on the CPU. The naive loop does both in one thread,
+the pipeline overlaps transfers with processing in a process pool:
+
+    python benchmarks/bench_pipeline.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from visa_bundle import VISA, Setting  # noqa: E402
+from visa_bundle import ConnectionRegistry  # noqa: E402
+from visa_bundle.Pipeline import AcquisitionPipeline  # noqa: E402
+
+TRANSFER_TIME = 0.030
+SAMPLES = 1 << 20
+CAPTURES = 30
+
+_WAVEFORM = (numpy.sin(numpy.arange(SAMPLES) / 40.0) * 100).astype("i1").tobytes()
+
+
+class ScopeResource:
+    """Scope returning an 8-bit waveform block after a transfer delay."""
+
+    def __init__(self, address):
+        self.resource_name = address
+
+    def write(self, command):
+        pass
+
+    def read_raw(self):
+        time.sleep(TRANSFER_TIME)
+        return b"#7%07d" % SAMPLES + _WAVEFORM + b"\n"
+
+    def flush(self, mask):
+        pass
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+ConnectionRegistry.register_message_based_type(ScopeResource)
+
+
+def decode(response):
+    """Strip the block header and convert to volts."""
+    digits = int(response[1:2])
+    return numpy.frombuffer(response, dtype="i1", count=SAMPLES, offset=2 + digits) * 0.01
+
+
+def spectrum(volts):
+    """Peak frequency bin of a windowed FFT."""
+    magnitude = numpy.abs(numpy.fft.rfft(volts * numpy.hanning(len(volts))))
+    return int(numpy.argmax(magnitude[1:]) + 1)
+
+
+def main():
+    Setting.VISA_Send_Enable = True
+    with patch("pyvisa.ResourceManager") as mock_rm:
+        mock_rm.return_value.open_resource.side_effect = ScopeResource
+        scope = VISA("scope", "TCPIP0::10.0.0.7::INSTR", skip_clear=True)
+
+        start = time.perf_counter()
+        naive = [spectrum(decode(scope.query_binary(":WAV:DATA?", 0))) for _ in range(CAPTURES)]
+        naive_time = time.perf_counter() - start
+
+        pipeline = AcquisitionPipeline(scope, ":WAV:DATA?", [decode, spectrum])
+        start = time.perf_counter()
+        piped = pipeline.run(CAPTURES)
+        piped_time = time.perf_counter() - start
+        scope.close()
+
+    assert piped == naive
+    stats = pipeline.stats()
+    print(f"{CAPTURES} captures, {SAMPLES} samples, {TRANSFER_TIME * 1000:.0f} ms transfer")
+    print(f"naive loop  {CAPTURES / naive_time:6.1f} captures/s")
+    print(f"pipeline    {CAPTURES / piped_time:6.1f} captures/s  ({naive_time / piped_time:.1f}x)")
+    for name, stage in stats["stages"].items():
+        print(f"  {name:8s} {stage['mean_ms']:7.1f} ms/capture")
+    print(f"  backpressure {stats['backpressure_s'] * 1000:.0f} ms, "
+          f"result wait {stats['result_wait_s'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: declarative pipelined sweep vs. a naive write/sleep/query loop
+
+Runs against simulated instruments with realistic latencies (command
+transfer, source settling, measurement conversion time), so no hardware or
+VISA library is needed:
+
+    python benchmarks/bench_sweep.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from visa_bundle import VISAManager, Setting  # noqa: E402
+from visa_bundle import ConnectionRegistry  # noqa: E402
+from visa_bundle.Sweep import Measurement, Sweep, SweepAxis  # noqa: E402
+
+# Simulated latencies (seconds)
+TRANSFER_TIME = 0.0005
+SETTLE_TIME = 0.005
+MEASURE_TIME = 0.010
+POINTS = 40
+
+
+class SimulatedResource:
+    """Instrument that measures in the background after each query command."""
+
+    def __init__(self, address):
+        self.resource_name = address
+        self.value = 0.0
+        self._ready_at = 0.0
+
+    def write(self, command):
+        time.sleep(TRANSFER_TIME)
+        if command.endswith("?"):
+            # Measurement starts on the trigger and runs in the instrument
+            self._ready_at = time.perf_counter() + MEASURE_TIME
+        elif " " in command:
+            self.value = float(command.split(" ", 1)[1])
+
+    def read(self):
+        remaining = self._ready_at - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        time.sleep(TRANSFER_TIME)
+        return f"{self.value * 0.001:.6e}"
+
+    def query(self, command, delay=None):
+        self.write(command)
+        return self.read()
+
+    def flush(self, mask):
+        pass
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+ConnectionRegistry.register_message_based_type(SimulatedResource)
+
+
+def naive_loop(manager, values):
+    """The hand-written loop the sweep engine replaces."""
+    rows = []
+    for value in values:
+        manager.get_instrument("source").write(f"VOLT {value}")
+        time.sleep(SETTLE_TIME)
+        current = float(manager.get_instrument("dmm1").query("MEAS:CURR?"))
+        voltage = float(manager.get_instrument("dmm2").query("MEAS:VOLT?"))
+        power = float(manager.get_instrument("meter").query("MEAS:POW?"))
+        rows.append((value, current, voltage, power))
+    return rows
+
+
+def main():
+    Setting.VISA_Send_Enable = True
+    values = [index * 0.1 for index in range(POINTS)]
+
+    with patch("pyvisa.ResourceManager") as mock_rm:
+        mock_rm.return_value.open_resource.side_effect = SimulatedResource
+        manager = VISAManager()
+        manager.add_instrument("source", "GPIB0::5::INSTR")
+        manager.add_instrument("dmm1", "GPIB0::22::INSTR")
+        manager.add_instrument("dmm2", "USB0::1::INSTR")
+        manager.add_instrument("meter", "TCPIP0::10.0.0.5::INSTR")
+
+        sweep = Sweep(
+            manager,
+            [SweepAxis("volt", "source", "VOLT {value}", values, settle=SETTLE_TIME)],
+            [Measurement("curr", "dmm1", "MEAS:CURR?"),
+             Measurement("vmeas", "dmm2", "MEAS:VOLT?"),
+             Measurement("pow", "meter", "MEAS:POW?")])
+
+        start = time.perf_counter()
+        naive_loop(manager, values)
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sweep.run(pipelined=False)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = sweep.run(pipelined=True)
+        pipelined = time.perf_counter() - start
+
+        manager.close_all()
+
+    print(f"{POINTS} points x 3 measurements")
+    print(f"naive loop          {naive * 1000:8.1f} ms")
+    print(f"sweep (sequential)  {sequential * 1000:8.1f} ms")
+    print(f"sweep (pipelined)   {pipelined * 1000:8.1f} ms  ({naive / pipelined:.1f}x)")
+    print(f"result fields: {result.dtype.names if hasattr(result, 'dtype') else 'list'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Adaptive Timeout - Per-command I/O timeouts learned from latency history
+
+A resource usually carries one worst-case timeout because a few commands
+(*CAL?, long sweeps) take minutes, so a dead instrument hangs that long on
+every ordinary query. AdaptiveTimeout keeps the recent latencies of each
+SCPI header and gives each transaction a timeout of a high percentile times
+a margin, never more than the resource's own timeout. Known-long commands
+get explicit overrides, which may exceed the resource timeout.
+"""
+
+import collections
+import math
+import threading
+from typing import Deque, Dict, Optional
+
+
+def scpi_header(command: str) -> str:
+    """
+    Get the header of a SCPI command, used as its latency statistics key.
+
+    Parameters are dropped, the header is upper-cased and a leading colon
+    removed ('meas:volt? 10' and ':MEAS:VOLT?' share 'MEAS:VOLT?'). Long
+    and short forms (MEASure / MEAS) are not merged.
+
+    Args:
+        command: SCPI command string
+
+    Returns:
+        Normalized header
+    """
+    parts = command.split(None, 1)
+    return parts[0].lstrip(":").upper() if parts else ""
+
+
+class AdaptiveTimeout:
+    """
+    Latency statistics and learned timeouts of one instrument's commands.
+
+    A header uses the resource timeout until min_samples transactions have
+    been seen. A transaction that times out is recorded at the timeout it
+    was given, so a command that genuinely became slower raises its own
+    limit after a few failures instead of failing forever.
+    """
+
+    def __init__(self, percentile: float = 99.0, margin: float = 1.5,
+                 padding: float = 100.0, min_samples: int = 5, window: int = 64,
+                 overrides: Optional[Dict[str, float]] = None):
+        """
+        Initialize the statistics.
+
+        Args:
+            percentile: Latency percentile the timeout is based on (0-100)
+            margin: Multiplier applied to the percentile latency
+            padding: Milliseconds added after the multiplier
+            min_samples: Transactions seen before a header's timeout is learned
+            window: Latest latencies kept per header
+            overrides: Fixed timeouts (milliseconds) per command header
+
+        Raises:
+            ValueError: If percentile, margin or window is out of range
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100]")
+        if margin < 1 or window < 1:
+            raise ValueError("margin must be >= 1 and window >= 1")
+        self.percentile: float = percentile
+        self.margin: float = margin
+        self.padding: float = padding
+        self.min_samples: int = max(1, min(min_samples, window))
+        self.window: int = window
+        self.overrides: Dict[str, float] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+        # Learned timeout per header, dropped when a new sample arrives
+        self._learned: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        for command, timeout in (overrides or {}).items():
+            self.set_override(command, timeout)
+
+    def set_override(self, command: str, timeout: Optional[float]) -> None:
+        """
+        Set a fixed timeout for a known-long command.
+
+        Args:
+            command: Command or header (e.g. '*CAL?')
+            timeout: Timeout in milliseconds, or None to learn it again
+        """
+        header = scpi_header(command)
+        if timeout is None:
+            self.overrides.pop(header, None)
+        else:
+            self.overrides[header] = float(timeout)
+
+    def record(self, command: str, seconds: float) -> None:
+        """
+        Record the latency of one transaction.
+
+        Args:
+            command: Command sent
+            seconds: Time the transaction took
+        """
+        header = scpi_header(command)
+        with self._lock:
+            samples = self._samples.get(header)
+            if samples is None:
+                samples = self._samples[header] = collections.deque(maxlen=self.window)
+            samples.append(seconds * 1000.0)
+            self._learned.pop(header, None)
+
+    def timeout_for(self, command: str, base: Optional[float]) -> Optional[float]:
+        """
+        Get the timeout for one transaction.
+
+        Args:
+            command: Command about to be sent
+            base: Resource timeout in milliseconds (None means infinite)
+
+        Returns:
+            Timeout in milliseconds (base when nothing is learned yet)
+        """
+        header = scpi_header(command)
+        override = self.overrides.get(header)
+        if override is not None:
+            return override
+
+        learned = self._learned.get(header)
+        if learned is None:
+            with self._lock:
+                samples = self._samples.get(header)
+                if samples is None or len(samples) < self.min_samples:
+                    return base
+                ordered = sorted(samples)
+            rank = max(0, math.ceil(self.percentile / 100.0 * len(ordered)) - 1)
+            learned = ordered[rank] * self.margin + self.padding
+            self._learned[header] = learned
+        return learned if base is None else min(base, learned)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the latency statistics of every header seen.
+
+        Returns:
+            Mapping of header to count, median and percentile latency and the
+            learned timeout (milliseconds)
+        """
+        with self._lock:
+            snapshot = {header: sorted(samples) for header, samples in self._samples.items()}
+        stats = {}
+        for header, ordered in snapshot.items():
+            rank = max(0, math.ceil(self.percentile / 100.0 * len(ordered)) - 1)
+            stats[header] = {
+                "count": len(ordered),
+                "median_ms": ordered[len(ordered) // 2],
+                "percentile_ms": ordered[rank],
+                "timeout_ms": self.timeout_for(header, None) or 0.0,
+            }
+        return stats
+
+    def reset(self, command: Optional[str] = None) -> None:
+        """
+        Forget learned latencies.
+
+        Args:
+            command: Command or header to forget (None forgets all)
+        """
+        with self._lock:
+            if command is None:
+                self._samples.clear()
+                self._learned.clear()
+            else:
+                header = scpi_header(command)
+                self._samples.pop(header, None)
+                self._learned.pop(header, None)
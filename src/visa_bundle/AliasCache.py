@@ -0,0 +1,273 @@
+"""
+Alias Cache - Persistent logical-name to VISA address resolution
+
+USB resource strings re-enumerate and LAN addresses change, so instruments
+can be referred to by a logical name or serial number instead. The cache
+stores the last-known-good address and identification string for each
+alias on disk; resolution validates the cached address with a single
+``*IDN?`` and only rescans candidate resources when that check fails.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from . import Setting
+
+# Default on-disk location used when Setting.VISA_Alias_Cache_Path is empty
+DEFAULT_CACHE_PATH: str = os.path.join(
+    os.path.expanduser("~"), ".visa_bundle", "alias_cache.json")
+
+# Interface prefixes that are never probed during a rescan unless the
+# alias was last seen on that interface (serial ports may block on *IDN?)
+_RESCAN_EXCLUDED_PREFIXES = ("ASRL",)
+
+
+def is_resource_address(text: str) -> bool:
+    """
+    Check whether a string is a VISA resource address rather than an alias.
+
+    Args:
+        text: Address or alias string
+
+    Returns:
+        True if the string looks like a VISA resource address
+    """
+    return "::" in text
+
+
+def _interface_type(address: str) -> str:
+    """Return the interface family of a resource address (e.g. 'USB', 'TCPIP')."""
+    board = address.split("::", 1)[0].upper()
+    return board.rstrip("0123456789")
+
+
+def _idn_fields(idn: str) -> List[str]:
+    """Split an *IDN? response into its stripped, upper-cased fields."""
+    return [field.strip().upper() for field in idn.split(",")]
+
+
+def _idn_matches(alias: str, expected_idn: str, idn: str) -> bool:
+    """
+    Check whether an identification string belongs to the aliased instrument.
+
+    A cached identification is matched on manufacturer, model and serial
+    number (firmware revisions are allowed to change). Without a cached
+    identification the alias itself is treated as a serial number.
+    """
+    fields = _idn_fields(idn)
+    if expected_idn:
+        return fields[:3] == _idn_fields(expected_idn)[:3]
+    return len(fields) > 2 and fields[2] == alias.strip().upper()
+
+
+class AliasCache:
+    """
+    Persistent alias-to-address cache.
+
+    Entries are stored as ``{alias: {"address": ..., "idn": ...}}`` in a
+    JSON file. All methods are thread-safe.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the alias cache.
+
+        Args:
+            path: Cache file path (defaults to Setting.VISA_Alias_Cache_Path,
+                  then DEFAULT_CACHE_PATH)
+        """
+        self.path: str = path or Setting.VISA_Alias_Cache_Path or DEFAULT_CACHE_PATH
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._loaded: bool = False
+
+    def _load(self) -> None:
+        """Load entries from disk once; a missing or corrupt file yields an empty cache."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            if isinstance(data, dict):
+                self._entries = {
+                    str(alias): {"address": str(entry.get("address", "")),
+                                 "idn": str(entry.get("idn", ""))}
+                    for alias, entry in data.items() if isinstance(entry, dict)
+                }
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write all entries to disk atomically."""
+        with self._lock:
+            self._load()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self._entries, cache_file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+
+    def get(self, alias: str) -> Optional[Dict[str, str]]:
+        """
+        Get the cached entry for an alias.
+
+        Args:
+            alias: Logical name or serial number
+
+        Returns:
+            Copy of the ``{"address", "idn"}`` entry, or None if not cached
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(alias)
+            return dict(entry) if entry is not None else None
+
+    def set(self, alias: str, address: str, idn: str = "") -> None:
+        """
+        Store the last-known-good address for an alias and persist it.
+
+        Args:
+            alias: Logical name or serial number
+            address: VISA resource address
+            idn: Identification string returned by the instrument
+        """
+        with self._lock:
+            self._load()
+            self._entries[alias] = {"address": address, "idn": idn}
+            self.save()
+
+    def remove(self, alias: str) -> bool:
+        """
+        Remove an alias from the cache.
+
+        Args:
+            alias: Logical name or serial number
+
+        Returns:
+            True if the alias was removed, False if not found
+        """
+        with self._lock:
+            self._load()
+            if alias not in self._entries:
+                return False
+            del self._entries[alias]
+            self.save()
+            return True
+
+    def aliases(self) -> List[str]:
+        """
+        List all cached aliases.
+
+        Returns:
+            List of alias names
+        """
+        with self._lock:
+            self._load()
+            return list(self._entries.keys())
+
+    def resolve(self, alias: str,
+                query_idn: Callable[[str], Optional[str]],
+                list_resources: Callable[[], List[str]]) -> str:
+        """
+        Resolve an alias to a validated VISA resource address.
+
+        The cached address is validated with a single *IDN? query. Only if
+        that fails are candidate resources rescanned, starting with those
+        whose address contains the alias and those on the same interface
+        as the last-known address.
+
+        Args:
+            alias: Logical name or serial number
+            query_idn: Callable returning the *IDN? response for an address,
+                       or None if the address cannot be queried
+            list_resources: Callable returning the available resource addresses
+
+        Returns:
+            Validated VISA resource address
+
+        Raises:
+            Exception: If no available resource matches the alias
+        """
+        entry = self.get(alias)
+        expected_idn = entry["idn"] if entry else ""
+        cached_address = entry["address"] if entry else ""
+
+        # Common path: last-known-good address still answers as expected
+        if cached_address:
+            idn = query_idn(cached_address)
+            if idn is not None and _idn_matches(alias, expected_idn, idn):
+                return cached_address
+
+        # Targeted rescan on mismatch
+        for address in self._rank_candidates(alias, cached_address, list_resources()):
+            idn = query_idn(address)
+            if idn is not None and _idn_matches(alias, expected_idn, idn):
+                self.set(alias, address, idn.strip())
+                return address
+
+        raise Exception(f"VISA Alias Resolve Error: {alias}")
+
+    @staticmethod
+    def _rank_candidates(alias: str, cached_address: str,
+                         resources: List[str]) -> List[str]:
+        """
+        Order rescan candidates from most to least likely.
+
+        Args:
+            alias: Logical name or serial number
+            cached_address: Last-known address ('' if never resolved)
+            resources: Available resource addresses
+
+        Returns:
+            Candidate addresses, excluding the already-checked cached address
+        """
+        cached_type = _interface_type(cached_address) if cached_address else ""
+        alias_upper = alias.upper()
+        by_alias: List[str] = []
+        by_interface: List[str] = []
+        others: List[str] = []
+
+        for address in resources:
+            if address == cached_address:
+                continue
+            address_type = _interface_type(address)
+            if alias_upper in address.upper():
+                by_alias.append(address)
+            elif address_type.startswith(_RESCAN_EXCLUDED_PREFIXES) and \
+                    address_type != cached_type:
+                continue
+            elif cached_type and address_type == cached_type:
+                by_interface.append(address)
+            else:
+                others.append(address)
+
+        return by_alias + by_interface + others
+
+
+# Shared process-wide cache instances by file path (created on first use)
+_caches: Dict[str, AliasCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_alias_cache() -> AliasCache:
+    """
+    Get the shared process-wide alias cache for the configured path.
+
+    One cache is kept per path, so changing Setting.VISA_Alias_Cache_Path
+    takes effect on the next call.
+
+    Returns:
+        AliasCache instance backed by Setting.VISA_Alias_Cache_Path
+    """
+    path = Setting.VISA_Alias_Cache_Path or DEFAULT_CACHE_PATH
+
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = AliasCache(path)
+        return cache
@@ -0,0 +1,120 @@
+"""
+ASCII Values - Bulk parsing of separated ASCII numeric responses
+
+Responses such as 'TRAC:DATA?' return thousands of comma-separated numbers.
+With NumPy installed they are parsed in one C-level pass into an array
+(no per-element Python objects); AsciiValueParser does the same
+incrementally for responses read in chunks. Without NumPy the values are
+returned as a list.
+"""
+
+import warnings
+from typing import Any, List, Union
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+def parse_ascii_values(data: Union[str, bytes, bytearray], dtype: Any = float,
+                       separator: str = ",") -> Any:
+    """
+    Parse separated ASCII numbers.
+
+    Args:
+        data: Response text (surrounding whitespace and terminations are ignored)
+        dtype: Element type (NumPy dtype, or int/float without NumPy)
+        separator: Separator between values
+
+    Returns:
+        NumPy array of values, or a list when NumPy is not installed
+
+    Raises:
+        ValueError: If the data contains something that is not a number
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("ascii")
+    data = data.strip()
+
+    if numpy is None:
+        convert = int if dtype is int else float
+        return [convert(value) for value in data.split(separator)] if data else []
+
+    if not data:
+        return numpy.empty(0, dtype=dtype)
+    with warnings.catch_warnings():
+        # NumPy only warns (and truncates) on unparsable text; make it an error
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return numpy.fromstring(data, dtype=dtype, sep=separator)
+        except DeprecationWarning:
+            raise ValueError(f"Invalid ASCII values: {data[:40]!r}")
+
+
+def concatenate_values(parts: List[Any], dtype: Any = float) -> Any:
+    """
+    Join parsed value batches.
+
+    Args:
+        parts: Arrays (or lists) returned by parse_ascii_values()
+        dtype: Element type of the result when there are no parts
+
+    Returns:
+        One array (or list) with all values
+    """
+    if numpy is None:
+        return [value for part in parts for value in part]
+    if not parts:
+        return numpy.empty(0, dtype=dtype)
+    return numpy.concatenate(parts)
+
+
+class AsciiValueParser:
+    """
+    Incremental parser for separated ASCII numbers arriving in chunks.
+
+    Each chunk is parsed up to its last separator; the incomplete trailing
+    number is carried over to the next chunk.
+    """
+
+    def __init__(self, dtype: Any = float, separator: str = ","):
+        """
+        Initialize the parser.
+
+        Args:
+            dtype: Element type (NumPy dtype, or int/float without NumPy)
+            separator: Separator between values
+        """
+        self.dtype: Any = dtype
+        self.separator: str = separator
+        self._separator = separator.encode("ascii")
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> Any:
+        """
+        Parse the complete values of a chunk.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Values completed by this chunk (possibly empty)
+        """
+        data = self._tail + bytes(chunk) if self._tail else bytes(chunk)
+        cut = data.rfind(self._separator)
+        if cut < 0:
+            self._tail = data
+            return parse_ascii_values(b"", self.dtype, self.separator)
+        self._tail = data[cut + len(self._separator):]
+        return parse_ascii_values(data[:cut], self.dtype, self.separator)
+
+    def finish(self) -> Any:
+        """
+        Parse the value left after the last separator.
+
+        Returns:
+            Remaining values (possibly empty)
+        """
+        tail, self._tail = self._tail, b""
+        return parse_ascii_values(tail, self.dtype, self.separator)
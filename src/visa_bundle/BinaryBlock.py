@@ -0,0 +1,108 @@
+"""
+Binary Block - IEEE 488.2 definite-length block helpers
+
+Builds and strips '#<n><length>' block headers and exposes numeric data
+as flat byte views so binary uploads can be written straight from the
+caller's buffer.
+NumPy is optional: arrays are used in place when they already have the
+requested dtype and byte order; plain sequences go through array.array.
+"""
+
+import array
+import sys
+from typing import Any, Iterator, Optional
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+def block_header(length: int) -> bytes:
+    """
+    Build a definite-length block header.
+
+    Args:
+        length: Number of data bytes in the block
+
+    Returns:
+        Header such as b'#48000' for 8000 bytes
+    """
+    digits = str(length)
+    if len(digits) > 9:
+        raise ValueError(f"Block of {length} bytes exceeds the IEEE 488.2 limit")
+    return f"#{len(digits)}{digits}".encode("ascii")
+
+
+def values_view(values: Any, dtype: str = "f", big_endian: bool = False) -> memoryview:
+    """
+    Get the bytes of numeric values as a flat memoryview.
+
+    NumPy arrays that are already contiguous with the requested dtype and
+    byte order are viewed without copying; anything else is converted once.
+
+    Args:
+        values: NumPy array, bytes-like object or sequence of numbers
+        dtype: Element type as a struct/array format character (e.g. 'f', 'h', 'B')
+        big_endian: Transfer byte order
+
+    Returns:
+        Flat unsigned-byte view of the encoded values
+    """
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        return memoryview(values).cast("B")
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        target = numpy.dtype(dtype).newbyteorder(">" if big_endian else "<")
+        # Only copies when the dtype, byte order or layout differ
+        data = numpy.ascontiguousarray(values, dtype=target)
+        return memoryview(data).cast("B")
+
+    data = array.array(dtype, values)
+    if big_endian != (sys.byteorder == "big") and data.itemsize > 1:
+        data.byteswap()
+    return memoryview(data).cast("B")
+
+
+def iter_chunks(view: memoryview, chunk_size: Optional[int] = None) -> Iterator[memoryview]:
+    """
+    Split a byte view into zero-copy chunks.
+
+    Args:
+        view: Flat byte view
+        chunk_size: Maximum chunk size in bytes (None or 0 for one chunk)
+
+    Yields:
+        Consecutive slices of the view
+    """
+    if not chunk_size or len(view) <= chunk_size:
+        yield view
+        return
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+def block_data(response: bytes) -> memoryview:
+    """
+    Get the data of a block response without copying it.
+
+    Responses that do not start with '#' are returned whole; indefinite
+    blocks ('#0') and trailing termination characters are handled.
+
+    Args:
+        response: Raw response (e.g. from query_binary())
+
+    Returns:
+        View of the block's data bytes
+    """
+    view = memoryview(response).cast("B")
+    if response[:1] != b"#" or len(response) < 2 or not response[1:2].isdigit():
+        return view
+    digits = int(response[1:2])
+    if digits == 0:
+        end = len(response)
+        while end > 2 and response[end - 1:end] in (b"\n", b"\r"):
+            end -= 1
+        return view[2:end]
+    length = int(response[2:2 + digits])
+    return view[2 + digits:2 + digits + length]
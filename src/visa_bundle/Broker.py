@@ -0,0 +1,763 @@
+"""
+Broker - Local connection broker shared by several processes
+
+A broker process owns the real VISA sessions and serves VISA operations to
+client processes on the same host over a Unix domain socket, so parallel
+worker processes share one session per instrument instead of fighting over
+exclusive USB/GPIB sessions or reopening them constantly.
+
+Protocol: every frame is a fixed header followed by a payload.
+
+- Request header ``!IBII``: request id, opcode, session id, payload length
+- Response header ``!IBI``: request id, status (0 ok, 1 error, 2 partial
+  chunk of a streamed response), payload length
+
+Requests for one session are executed in order; requests for different
+sessions on the same connection run concurrently, so threads talking to
+different instruments never queue behind each other. Clients may send many
+requests before reading any response (pipelining); responses carry the
+request id so several threads can share one connection.
+
+A VISA operation that takes several requests (write, delay, read) holds the
+shared session with OP_LEASE ... OP_RELEASE, so another client cannot read
+or flush its response in between. Timeouts set by a client apply to that
+client's requests only; the session keeps the timeout it was opened with.
+
+Run a broker with ``python -m visa_bundle.Broker /tmp/visa_broker.sock`` and
+set ``Setting.VISA_Broker_Path`` in client processes. Requires AF_UNIX.
+"""
+
+import math
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from . import ConnectionRegistry as _registry
+from . import Setting
+
+# Frame headers
+REQUEST_HEADER = struct.Struct("!IBII")
+RESPONSE_HEADER = struct.Struct("!IBI")
+
+# Opcodes
+OP_OPEN = 1
+OP_CLOSE = 2
+OP_WRITE = 3
+OP_QUERY = 4
+OP_READ = 5
+OP_READ_BYTES = 6
+OP_READ_RAW = 7
+OP_WRITE_RAW = 8
+OP_FLUSH = 9
+OP_CLEAR = 10
+OP_SET_TIMEOUT = 11
+OP_GET_TIMEOUT = 12
+OP_LEASE = 13
+OP_RELEASE = 14
+
+# Response status
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_CHUNK = 2
+
+_DOUBLE = struct.Struct("!d")
+_UINT32 = struct.Struct("!I")
+_OPEN_FLAGS = struct.Struct("!B")
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    """
+    Receive exactly ``size`` bytes.
+
+    Args:
+        sock: Connected socket
+        size: Number of bytes to receive
+
+    Returns:
+        Received bytes
+
+    Raises:
+        ConnectionError: If the peer closes the connection first
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("VISA Broker connection closed")
+        received += count
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, header: bytes, payload: bytes) -> None:
+    """
+    Send a header and payload, avoiding a concatenated copy of large payloads.
+
+    Args:
+        sock: Connected socket
+        header: Packed frame header
+        payload: Frame payload
+    """
+    if len(payload) < 65536:
+        sock.sendall(header + payload)
+    else:
+        sock.sendall(header)
+        sock.sendall(payload)
+
+
+def _encode_optional_float(value: Optional[float]) -> bytes:
+    """Encode an optional float (None is sent as NaN)."""
+    return _DOUBLE.pack(math.nan if value is None else float(value))
+
+
+def _decode_optional_float(payload: bytes) -> Optional[float]:
+    """Decode an optional float encoded by _encode_optional_float()."""
+    value = _DOUBLE.unpack_from(payload)[0]
+    return None if math.isnan(value) else value
+
+
+class _BrokerSession:
+    """A real session owned by the broker and shared by its clients."""
+
+    def __init__(self, address: str, handle: Any):
+        self.address: str = address
+        self.handle: Any = handle
+        self.references: int = 0
+        self.lock = threading.Condition()
+        # Connection holding the session across requests (OP_LEASE), and its depth
+        self.leased_by: Optional["_BrokerConnection"] = None
+        self.lease_depth: int = 0
+        # Timeout the session was opened with; client timeouts apply per request
+        self.timeout: Optional[float] = getattr(handle, "timeout", None)
+
+
+class _BrokerConnection:
+    """State of one client connection: its per-session timeouts."""
+
+    def __init__(self):
+        self.timeouts: Dict[int, Optional[float]] = {}
+        self.closed: bool = False
+
+
+class BrokerServer:
+    """
+    Broker that owns real VISA sessions and serves them over a Unix socket.
+
+    Sessions are shared by address: every client opening the same address
+    gets the same session id, and the session is closed when the last
+    reference is closed. Operations on one session are serialized, and a
+    client holding a lease has the session to itself until it releases it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the broker.
+
+        Args:
+            path: Unix domain socket path to listen on
+        """
+        self.path: str = path
+        self._sessions: Dict[int, _BrokerSession] = {}
+        self._by_address: Dict[str, int] = {}
+        self._next_id: int = 1
+        self._lock = threading.Lock()
+        # Opens in progress by address; concurrent opens of one address wait on it
+        self._opening: Dict[str, Future] = {}
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self._handlers: Dict[int, Callable[[_BrokerSession, bytes], bytes]] = {
+            OP_WRITE: lambda session, payload: self._void(
+                session.handle.write(payload.decode("utf-8"))),
+            OP_QUERY: lambda session, payload: session.handle.query(
+                payload[_DOUBLE.size:].decode("utf-8"),
+                _decode_optional_float(payload)).encode("utf-8"),
+            OP_READ: lambda session, payload: session.handle.read().encode("utf-8"),
+            OP_READ_BYTES: self._read_bytes,
+            OP_READ_RAW: lambda session, payload: bytes(session.handle.read_raw()),
+            OP_WRITE_RAW: lambda session, payload: self._void(
+                session.handle.write_raw(payload)),
+            OP_FLUSH: lambda session, payload: self._void(
+                session.handle.flush(_UINT32.unpack_from(payload)[0])),
+            OP_CLEAR: lambda session, payload: self._void(session.handle.clear()),
+        }
+
+    @staticmethod
+    def _void(_: Any) -> bytes:
+        """Discard an operation result."""
+        return b""
+
+    @staticmethod
+    def _read_bytes(session: Any, payload: bytes) -> bytes:
+        """Read bytes; a trailing flag byte requests stopping at the termination."""
+        count = _UINT32.unpack_from(payload)[0]
+        if payload[_UINT32.size:] == b"\x01":
+            return bytes(session.handle.read_bytes(count, break_on_termchar=True))
+        return bytes(session.handle.read_bytes(count))
+
+    def _open(self, payload: bytes) -> bytes:
+        """
+        Open (or share) the session for an address and return its id.
+
+        The broker lock is not held while the session opens, so a slow open
+        never blocks requests for other sessions.
+        """
+        skip_clear = bool(_OPEN_FLAGS.unpack_from(payload)[0])
+        address = payload[_OPEN_FLAGS.size:].decode("utf-8")
+
+        while True:
+            with self._lock:
+                session_id = self._by_address.get(address)
+                if session_id is not None:
+                    self._sessions[session_id].references += 1
+                    return _UINT32.pack(session_id)
+                opening = self._opening.get(address)
+                if opening is None:
+                    opening = self._opening[address] = Future()
+                    break
+            # Another client is opening this address; share its session
+            opening.result()
+
+        try:
+            handle = _registry.open_session(address, skip_clear=skip_clear,
+                                            use_broker=False)
+        except Exception as error:
+            with self._lock:
+                del self._opening[address]
+            opening.set_exception(error)
+            raise
+
+        with self._lock:
+            session_id = self._next_id
+            self._next_id += 1
+            session = _BrokerSession(address, handle)
+            session.references = 1
+            self._sessions[session_id] = session
+            self._by_address[address] = session_id
+            del self._opening[address]
+        opening.set_result(session_id)
+        return _UINT32.pack(session_id)
+
+    def _close(self, session_id: int) -> bytes:
+        """Drop one reference to a session, closing it with the last one."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return b""
+            session.references -= 1
+            if session.references > 0:
+                return b""
+            del self._sessions[session_id]
+            del self._by_address[session.address]
+        with session.lock:
+            try:
+                session.handle.close()
+            except Exception:
+                pass  # Ignore errors during close
+        return b""
+
+    @staticmethod
+    def _release(session: _BrokerSession, connection: "_BrokerConnection",
+                 all_levels: bool = False) -> None:
+        """Drop a connection's lease on a session (with session.lock held)."""
+        if session.leased_by is not connection:
+            return
+        session.lease_depth = 0 if all_levels else session.lease_depth - 1
+        if session.lease_depth <= 0:
+            session.leased_by = None
+            session.lease_depth = 0
+            session.lock.notify_all()
+
+    def _release_leases(self, connection: "_BrokerConnection") -> None:
+        """Drop every lease a connection holds."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            with session.lock:
+                self._release(session, connection, all_levels=True)
+
+    def execute(self, opcode: int, session_id: int, payload: bytes,
+                connection: Optional[_BrokerConnection] = None) -> bytes:
+        """
+        Execute one request.
+
+        Requests wait while another connection holds a lease on the session.
+        A connection's own timeout is applied to the session for each of its
+        requests and the session's timeout restored afterwards.
+
+        Args:
+            opcode: Operation code
+            session_id: Target session (ignored for OP_OPEN)
+            payload: Operation payload
+            connection: Requesting connection (None for a one-off request)
+
+        Returns:
+            Response payload
+
+        Raises:
+            Exception: If the session is unknown or the operation fails
+        """
+        if connection is None:
+            connection = _BrokerConnection()
+        if opcode == OP_OPEN:
+            return self._open(payload)
+
+        session = self._sessions.get(session_id)
+        if opcode == OP_CLOSE:
+            if session is not None:
+                with session.lock:
+                    self._release(session, connection, all_levels=True)
+                connection.timeouts.pop(session_id, None)
+            return self._close(session_id)
+        if session is None:
+            raise Exception(f"VISA Broker Error: unknown session {session_id}")
+        if opcode == OP_SET_TIMEOUT:
+            connection.timeouts[session_id] = _decode_optional_float(payload)
+            return b""
+        if opcode == OP_GET_TIMEOUT:
+            return _encode_optional_float(connection.timeouts.get(session_id, session.timeout))
+
+        handler = self._handlers.get(opcode)
+        if handler is None and opcode not in (OP_LEASE, OP_RELEASE):
+            raise Exception(f"VISA Broker Error: unknown opcode {opcode}")
+        with session.lock:
+            if opcode == OP_RELEASE:
+                self._release(session, connection)
+                return b""
+            while session.leased_by is not None and session.leased_by is not connection:
+                session.lock.wait()
+            if opcode == OP_LEASE:
+                if not connection.closed:
+                    session.leased_by = connection
+                    session.lease_depth += 1
+                return b""
+
+            timeout = connection.timeouts.get(session_id, session.timeout)
+            if timeout == session.timeout:
+                return handler(session, payload)
+            session.handle.timeout = timeout
+            try:
+                return handler(session, payload)
+            finally:
+                session.handle.timeout = session.timeout
+
+    def _serve_connection(self, sock: socket.socket) -> None:
+        """
+        Execute a client's requests until it disconnects.
+
+        Each session gets its own worker, so requests for one session run in
+        order while different sessions (and opens) proceed concurrently.
+        Sessions the client opened but never closed, and leases it still
+        holds, are released when it disconnects, so a crashed client process
+        cannot leak sessions or lock others out.
+        """
+        connection = _BrokerConnection()
+        opened: List[int] = []
+        opened_lock = threading.Lock()
+        send_lock = threading.Lock()
+        lanes: Dict[int, ThreadPoolExecutor] = {}
+        opener = ThreadPoolExecutor(thread_name_prefix="visa-broker-open")
+
+        def run(request_id: int, opcode: int, session_id: int, payload: bytes) -> None:
+            try:
+                result = self.execute(opcode, session_id, payload, connection)
+                status = STATUS_OK
+                with opened_lock:
+                    if opcode == OP_OPEN:
+                        opened.append(_UINT32.unpack(result)[0])
+                    elif opcode == OP_CLOSE and session_id in opened:
+                        opened.remove(session_id)
+            except Exception as error:
+                result = (str(error) or type(error).__name__).encode("utf-8")
+                status = STATUS_ERROR
+            try:
+                with send_lock:
+                    send_frame(sock, RESPONSE_HEADER.pack(request_id, status, len(result)),
+                               result)
+            except OSError:
+                pass  # Client went away; the reader loop notices
+
+        try:
+            while True:
+                header = recv_exact(sock, REQUEST_HEADER.size)
+                request_id, opcode, session_id, length = REQUEST_HEADER.unpack(header)
+                payload = recv_exact(sock, length) if length else b""
+                if opcode == OP_OPEN:
+                    opener.submit(run, request_id, opcode, session_id, payload)
+                    continue
+                lane = lanes.get(session_id)
+                if lane is None:
+                    lane = lanes[session_id] = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="visa-broker-session")
+                lane.submit(run, request_id, opcode, session_id, payload)
+                if opcode == OP_CLOSE:
+                    # Queued requests still run; the next use starts a new lane
+                    lanes.pop(session_id).shutdown(wait=False)
+        except (ConnectionError, OSError):
+            pass  # Client went away
+        finally:
+            # Let other clients in first: a lane may be waiting for their lease
+            connection.closed = True
+            self._release_leases(connection)
+            opener.shutdown(wait=True)
+            for lane in lanes.values():
+                lane.shutdown(wait=True, cancel_futures=True)
+            self._release_leases(connection)
+            for session_id in opened:
+                self._close(session_id)
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        broker = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                broker._serve_connection(self.request)
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="visa-broker", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Start serving and block until stop() is called."""
+        self.start()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stop(self) -> None:
+        """Stop serving and close every session."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._by_address.clear()
+        for session in sessions:
+            try:
+                session.handle.close()
+            except Exception:
+                pass  # Ignore errors during close
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class BrokerClient:
+    """
+    Connection to a broker, shareable by many threads.
+
+    Requests are written as soon as they are submitted and matched to their
+    responses by id on a reader thread, so several requests can be in flight
+    on the one connection. Responses may be streamed as STATUS_CHUNK frames
+    followed by a final frame; chunks are passed to the request's chunk
+    callback or accumulated into the result.
+    """
+
+    def __init__(self, path: str, sock: Optional[socket.socket] = None):
+        """
+        Connect to a broker.
+
+        Args:
+            path: Unix domain socket path of the broker (or a label for sock)
+            sock: Already connected socket to use instead of connecting to path
+        """
+        self.path: str = path
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+        self._sock: socket.socket = sock
+        self._send_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._chunks: Dict[int, Callable[[bytes], None]] = {}
+        self._buffers: Dict[int, bytearray] = {}
+        self._next_id: int = 1
+        self._closed: bool = False
+        self._reader = threading.Thread(target=self._read_loop,
+                                        name="visa-broker-client", daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        """Dispatch responses to their pending futures."""
+        error: Exception = ConnectionError("VISA Broker connection closed")
+        try:
+            while True:
+                header = recv_exact(self._sock, RESPONSE_HEADER.size)
+                request_id, status, length = RESPONSE_HEADER.unpack(header)
+                payload = recv_exact(self._sock, length) if length else b""
+                if status == STATUS_CHUNK:
+                    with self._pending_lock:
+                        on_chunk = self._chunks.get(request_id)
+                        if on_chunk is None:
+                            self._buffers.setdefault(request_id, bytearray()).extend(payload)
+                    if on_chunk is not None:
+                        on_chunk(payload)
+                    continue
+                with self._pending_lock:
+                    future = self._pending.pop(request_id, None)
+                    self._chunks.pop(request_id, None)
+                    streamed = self._buffers.pop(request_id, None)
+                if future is None:
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(bytes(streamed + payload) if streamed else payload)
+                else:
+                    future.set_exception(Exception(payload.decode("utf-8", "replace")))
+        except (ConnectionError, OSError) as read_error:
+            error = ConnectionError(f"VISA Broker connection closed: {read_error}")
+        finally:
+            self._closed = True
+            with self._pending_lock:
+                pending = list(self._pending.values())
+                self._pending.clear()
+            for future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    def submit(self, opcode: int, session_id: int = 0, payload: bytes = b"",
+               on_chunk: Optional[Callable[[bytes], None]] = None) -> Future:
+        """
+        Send a request without waiting for its response.
+
+        Args:
+            opcode: Operation code
+            session_id: Target session
+            payload: Operation payload
+            on_chunk: Called on the reader thread with each streamed chunk
+                      (chunks are then not included in the result)
+
+        Returns:
+            Future resolving to the response payload
+        """
+        future: Future = Future()
+        with self._send_lock:
+            if self._closed:
+                raise ConnectionError("VISA Broker connection closed")
+            request_id = self._next_id
+            self._next_id = (self._next_id + 1) & 0xFFFFFFFF or 1
+            with self._pending_lock:
+                self._pending[request_id] = future
+                if on_chunk is not None:
+                    self._chunks[request_id] = on_chunk
+            try:
+                send_frame(self._sock, REQUEST_HEADER.pack(
+                    request_id, opcode, session_id, len(payload)), payload)
+            except OSError as error:
+                with self._pending_lock:
+                    self._pending.pop(request_id, None)
+                raise ConnectionError(f"VISA Broker connection closed: {error}")
+        return future
+
+    def call(self, opcode: int, session_id: int = 0, payload: bytes = b"",
+             timeout: Optional[float] = None) -> bytes:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            opcode: Operation code
+            session_id: Target session
+            payload: Operation payload
+            timeout: Maximum wait in seconds (None waits indefinitely)
+
+        Returns:
+            Response payload
+
+        Raises:
+            Exception: If the broker reports an error
+        """
+        return self.submit(opcode, session_id, payload).result(timeout)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection to the broker is closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Close the connection to the broker."""
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+# One broker connection per socket path per process
+_clients: Dict[str, BrokerClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(path: str) -> BrokerClient:
+    """
+    Get the shared connection to a broker, reconnecting if it was closed.
+
+    Args:
+        path: Unix domain socket path of the broker
+
+    Returns:
+        BrokerClient instance
+    """
+    with _clients_lock:
+        client = _clients.get(path)
+        if client is None or client.closed:
+            client = BrokerClient(path)
+            _clients[path] = client
+        return client
+
+
+class BrokerHandle:
+    """
+    Proxy for a session owned by the broker.
+
+    Implements the subset of the pyvisa message-based resource API used by
+    VISA, so VISA instances route through the broker transparently. Input
+    buffer flushes are pipelined ahead of the next request, and so are the
+    lease requests of begin_transaction()/end_transaction().
+    """
+
+    def __init__(self, client: BrokerClient, session_id: int, address: str):
+        """
+        Initialize the proxy.
+
+        Args:
+            client: Broker connection
+            session_id: Broker session id
+            address: VISA resource address
+        """
+        self.client: BrokerClient = client
+        self.session_id: int = session_id
+        self.resource_name: str = address
+        # This client's timeout for the session; the broker applies it to
+        # this client's requests only
+        self._timeout: Optional[float] = None
+        self._transaction_lock = threading.Lock()
+        self._transaction_depth: int = 0
+
+    @classmethod
+    def open(cls, path: str, address: str, skip_clear: bool = False) -> "BrokerHandle":
+        """
+        Open (or share) a session in the broker.
+
+        Args:
+            path: Unix domain socket path of the broker
+            address: VISA resource address
+            skip_clear: Skip the device clear performed after opening
+
+        Returns:
+            Proxy handle for the broker session
+        """
+        client = get_client(path)
+        payload = _OPEN_FLAGS.pack(1 if skip_clear else 0) + address.encode("utf-8")
+        session_id = _UINT32.unpack(client.call(OP_OPEN, 0, payload))[0]
+        handle = cls(client, session_id, address)
+        handle._timeout = _decode_optional_float(handle._call(OP_GET_TIMEOUT))
+        return handle
+
+    def _call(self, opcode: int, payload: bytes = b"") -> bytes:
+        """Send a request for this session and wait for the response."""
+        return self.client.call(opcode, self.session_id, payload)
+
+    def begin_transaction(self) -> None:
+        """
+        Hold the shared session until end_transaction().
+
+        Requests of other clients wait until then, so the requests of one
+        VISA operation (e.g. a write and the read of its response) are not
+        interleaved with theirs. Nested calls only count.
+        """
+        with self._transaction_lock:
+            self._transaction_depth += 1
+            if self._transaction_depth == 1:
+                self.client.submit(OP_LEASE, self.session_id)
+
+    def end_transaction(self) -> None:
+        """Let other clients use the session again (see begin_transaction())."""
+        with self._transaction_lock:
+            if self._transaction_depth == 0:
+                return
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                try:
+                    self.client.submit(OP_RELEASE, self.session_id)
+                except ConnectionError:
+                    pass  # The broker drops the lease with the connection
+
+    def write(self, command: str) -> None:
+        """Write a command."""
+        self._call(OP_WRITE, command.encode("utf-8"))
+
+    def query(self, command: str, delay: Optional[float] = None) -> str:
+        """Write a command and read the response."""
+        return self._call(OP_QUERY, _encode_optional_float(delay)
+                          + command.encode("utf-8")).decode("utf-8")
+
+    def read(self) -> str:
+        """Read a response."""
+        return self._call(OP_READ).decode("utf-8")
+
+    def read_bytes(self, count: int, break_on_termchar: bool = False) -> bytes:
+        """Read count bytes (fewer if break_on_termchar and a termination arrives)."""
+        flag = b"\x01" if break_on_termchar else b""
+        return self._call(OP_READ_BYTES, _UINT32.pack(count) + flag)
+
+    def read_raw(self) -> bytes:
+        """Read raw bytes up to the termination."""
+        return self._call(OP_READ_RAW)
+
+    def write_raw(self, message: bytes) -> None:
+        """Write raw bytes."""
+        self._call(OP_WRITE_RAW, bytes(message))
+
+    def flush(self, mask: int) -> None:
+        """Flush buffers; pipelined, errors are ignored like local flushes."""
+        self.client.submit(OP_FLUSH, self.session_id, _UINT32.pack(int(mask)))
+
+    def clear(self) -> None:
+        """Clear the device."""
+        self._call(OP_CLEAR)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """This client's I/O timeout in milliseconds (None for infinite)."""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Optional[float]) -> None:
+        self._call(OP_SET_TIMEOUT, _encode_optional_float(value))
+        self._timeout = value
+
+    def close(self) -> None:
+        """Release this process's reference to the broker session."""
+        try:
+            self._call(OP_CLOSE)
+        except Exception:
+            pass  # Broker already gone
+
+
+_registry.register_message_based_type(BrokerHandle)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a broker on the socket path given on the command line."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m visa_bundle.Broker <socket-path>")
+        sys.exit(2)
+
+    Setting.VISA_Send_Enable = True
+    BrokerServer(args[0]).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
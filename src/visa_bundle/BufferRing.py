@@ -0,0 +1,194 @@
+"""
+Buffer Ring - Reusable capture buffers for repeated acquisition
+
+Every query_binary() returns a new bytes object, so a capture loop running
+for hours hands the allocator and garbage collector a steady stream of
+large, short-lived blocks. A BufferRing holds a fixed set of buffers that
+captures are read into directly. VISA.query_binary_buffered() fills one
+buffer on an I/O thread while the caller works on another; a buffer is
+refilled only after the caller releases it:
+
+    for capture in scope.query_binary_buffered(":WAV:DATA?", count=10000):
+        with capture:
+            process(capture.data)
+
+Buffers are allocated on first use, sized to the capture (or buffer_size),
+and only replaced when a larger capture arrives, so memory stays flat no
+matter how long the run is.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Buffer size for indefinite-length blocks ('#0') when no size is given
+DEFAULT_BUFFER_SIZE: int = 1 << 20
+
+# Buffer states
+_FREE, _FILLING, _READY, _LENT = "free", "filling", "ready", "lent"
+
+
+class CaptureBuffer:
+    """
+    One buffer of a BufferRing holding a single capture.
+
+    data is only valid while the caller holds the buffer; after release()
+    the buffer is refilled with a later capture.
+    """
+
+    def __init__(self, ring: "BufferRing", index: int):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            ring: Ring owning the buffer
+            index: Position of the buffer in the ring
+        """
+        self.ring: "BufferRing" = ring
+        self.index: int = index
+        self.buffer: Optional[bytearray] = None
+        self.size: int = 0
+        self.sequence: int = -1
+        self.timestamp: float = 0.0
+        self._state: str = _FREE
+
+    @property
+    def data(self) -> memoryview:
+        """
+        View of the capture's block data.
+
+        Raises:
+            ValueError: If the buffer has been released
+        """
+        if self._state != _LENT:
+            raise ValueError(f"Capture buffer {self.index} has been released")
+        if self.buffer is None:
+            return memoryview(b"")
+        return memoryview(self.buffer)[:self.size]
+
+    def release(self) -> None:
+        """Hand the buffer back to the ring for refilling (repeat calls are ignored)."""
+        self.ring.release(self)
+
+    def __enter__(self) -> "CaptureBuffer":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        self.release()
+
+
+class BufferRing:
+    """
+    Fixed set of reusable capture buffers.
+
+    A buffer moves free -> filling (acquire) -> ready -> lent (lend) and
+    back to free on release().
+    """
+
+    def __init__(self, count: int = 2, size: Optional[int] = None):
+        """
+        Initialize the ring.
+
+        Args:
+            count: Number of buffers (2 for double buffering)
+            size: Initial buffer size in bytes (None sizes buffers to the
+                  first capture they receive)
+
+        Raises:
+            ValueError: If count is not positive
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        self.size: Optional[int] = size
+        self.buffers: List[CaptureBuffer] = [CaptureBuffer(self, index) for index in range(count)]
+        self._free: List[CaptureBuffer] = list(self.buffers)
+        self._condition = threading.Condition()
+        self._allocations: int = 0
+        self._wait: float = 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[CaptureBuffer]:
+        """
+        Take a free buffer for filling, waiting until one is released.
+
+        Args:
+            timeout: Maximum wait in seconds (None waits indefinitely)
+
+        Returns:
+            The buffer, or None if none became free within the timeout
+        """
+        start = time.perf_counter()
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._free, timeout):
+                self._wait += time.perf_counter() - start
+                return None
+            self._wait += time.perf_counter() - start
+            buffer = self._free.pop(0)
+            buffer._state = _FILLING
+            return buffer
+
+    def reserve(self, buffer: CaptureBuffer, length: Optional[int]) -> memoryview:
+        """
+        Make room for a capture in a buffer being filled.
+
+        The storage is allocated on first use and replaced only when the
+        capture does not fit.
+
+        Args:
+            buffer: Buffer returned by acquire()
+            length: Capture size in bytes (None for an indefinite block)
+
+        Returns:
+            Writable view of the storage (length bytes, or all of it)
+        """
+        required = length if length is not None else (self.size or DEFAULT_BUFFER_SIZE)
+        if buffer.buffer is None or len(buffer.buffer) < required:
+            buffer.buffer = bytearray(max(required, self.size or 0))
+            with self._condition:
+                self._allocations += 1
+        view = memoryview(buffer.buffer)
+        return view if length is None else view[:length]
+
+    def mark_ready(self, buffer: CaptureBuffer) -> None:
+        """Mark a filled buffer as waiting to be handed to the caller."""
+        buffer._state = _READY
+
+    def lend(self, buffer: CaptureBuffer) -> None:
+        """Mark a buffer as held by the caller."""
+        buffer._state = _LENT
+
+    def release(self, buffer: CaptureBuffer) -> None:
+        """
+        Return a buffer to the free list.
+
+        Args:
+            buffer: Buffer of this ring
+        """
+        with self._condition:
+            if buffer._state == _FREE:
+                return
+            buffer._state = _FREE
+            self._free.append(buffer)
+            self._condition.notify()
+
+    def lent_count(self) -> int:
+        """Number of buffers currently held by the caller."""
+        with self._condition:
+            return sum(1 for buffer in self.buffers if buffer._state == _LENT)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the ring statistics.
+
+        Returns:
+            'buffers': buffer count; 'allocated_bytes': current storage size;
+            'allocations': storage allocations so far; 'wait_s': time spent
+            waiting for a free buffer
+        """
+        with self._condition:
+            return {
+                "buffers": len(self.buffers),
+                "allocated_bytes": sum(len(buffer.buffer) for buffer in self.buffers
+                                       if buffer.buffer is not None),
+                "allocations": self._allocations,
+                "wait_s": self._wait,
+            }
@@ -0,0 +1,297 @@
+"""
+Bus Scheduler - Per-bus I/O serialization for shared interfaces
+
+Instruments on the same GPIB/USB/serial board share one physical bus and
+cannot transfer in parallel, while instruments on different boards or on
+LAN can. The scheduler groups sessions by bus (parsed from the resource
+string), serializes transfers on each bus through a priority queue (FIFO
+within a priority) and lets different buses run fully in parallel.
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .Cancellation import SLEEP_SLICE, VISAInterruptError, current_token, is_interrupted
+from .ConnectionRegistry import interface_of
+
+# Interfaces whose instruments each have a dedicated link (one bus per host)
+_NETWORK_INTERFACES = ("TCPIP",)
+
+
+def bus_of(address: str) -> str:
+    """
+    Get the bus an address transfers on.
+
+    GPIB, USB, serial and VXI resources share their board; LAN resources
+    get one bus per host so they never block each other.
+
+    Args:
+        address: VISA resource address
+
+    Returns:
+        Bus name (e.g. 'GPIB0', 'USB0', 'TCPIP0::192.168.1.10')
+    """
+    interface = interface_of(address)
+    if interface.startswith(_NETWORK_INTERFACES):
+        parts = address.split("::")
+        if len(parts) > 1:
+            return f"{interface}::{parts[1].lower()}"
+    return interface
+
+
+class _BusQueue:
+    """Reentrant, priority-ordered exclusive slot for one bus, with metrics."""
+
+    def __init__(self, bus: str):
+        self.bus: str = bus
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[int, int, threading.Event, int]] = []
+        self._sequence = itertools.count()
+        self._owner: Optional[int] = None
+        self._depth: int = 0
+        self._held_since: float = 0.0
+
+        # Metrics
+        self.created_at: float = time.perf_counter()
+        self.transfers: int = 0
+        self.busy_time: float = 0.0
+        self.wait_time: float = 0.0
+        self.max_wait: float = 0.0
+
+    def acquire(self, priority: int, depth: int = 1) -> None:
+        """
+        Block until this thread owns the bus (lower priority value first).
+
+        The wait is sliced so an interrupt or a cancelled CancelToken aborts
+        it; the thread then leaves the queue without taking the bus.
+
+        Raises:
+            VISAInterruptError: If interrupted while waiting for the bus
+        """
+        thread_id = threading.get_ident()
+        requested = time.perf_counter()
+
+        with self._lock:
+            if self._owner == thread_id:
+                self._depth += depth
+                return
+            if self._owner is None and not self._waiters:
+                self._take(thread_id, requested, requested, depth)
+                return
+            event = threading.Event()
+            entry = (priority, next(self._sequence), event, thread_id)
+            heapq.heappush(self._waiters, entry)
+
+        # Ownership is handed over by release()
+        token = current_token()
+        while not event.wait(SLEEP_SLICE):
+            if not is_interrupted(token):
+                continue
+            with self._lock:
+                if event.is_set():
+                    # Handed over just as the wait was aborted: pass the bus on
+                    self._held_since = time.perf_counter()
+                    self._hand_over()
+                else:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            raise VISAInterruptError("VISA Interrupted")
+        with self._lock:
+            self._take(thread_id, requested, time.perf_counter(), depth)
+
+    def _take(self, thread_id: int, requested: float, granted: float, depth: int) -> None:
+        """Record ownership; caller holds _lock."""
+        self._owner = thread_id
+        self._depth = depth
+        self._held_since = granted
+        waited = granted - requested
+        self.wait_time += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.transfers += 1
+
+    def release(self) -> None:
+        """Give up the bus, handing it to the highest-priority waiter."""
+        with self._lock:
+            if self._owner != threading.get_ident():
+                return  # Given up by suspend() and not re-acquired (interrupted)
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            self._hand_over()
+
+    def suspend(self) -> int:
+        """
+        Give up the bus completely, however deeply this thread holds it.
+
+        Returns:
+            Depth to restore with acquire(), or 0 if the thread did not own the bus
+        """
+        with self._lock:
+            if self._owner != threading.get_ident():
+                return 0
+            depth = self._depth
+            self._depth = 0
+            self._hand_over()
+            return depth
+
+    def _hand_over(self) -> None:
+        """Pass ownership to the highest-priority waiter; caller holds _lock."""
+        self.busy_time += time.perf_counter() - self._held_since
+        if self._waiters:
+            _, _, event, thread_id = heapq.heappop(self._waiters)
+            self._owner = thread_id
+            event.set()
+        else:
+            self._owner = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of bus utilization metrics."""
+        with self._lock:
+            elapsed = time.perf_counter() - self.created_at
+            busy = self.busy_time
+            if self._owner is not None:
+                busy += time.perf_counter() - self._held_since
+            return {
+                "transfers": self.transfers,
+                "busy_time": busy,
+                "wait_time": self.wait_time,
+                "max_wait": self.max_wait,
+                "utilization": busy / elapsed if elapsed > 0 else 0.0,
+                "queued": len(self._waiters),
+                "busy": self._owner is not None,
+            }
+
+
+class BusScheduler:
+    """
+    Per-bus transfer scheduler.
+
+    Each bus has its own exclusive slot; threads using different buses never
+    wait on each other. Slots are reentrant per thread so composite
+    operations (e.g. write then read) hold the bus for their whole duration.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler with no buses."""
+        self._buses: Dict[str, _BusQueue] = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, bus: str) -> _BusQueue:
+        """Get or create the queue for a bus."""
+        queue = self._buses.get(bus)
+        if queue is None:
+            with self._lock:
+                queue = self._buses.setdefault(bus, _BusQueue(bus))
+        return queue
+
+    @contextlib.contextmanager
+    def slot(self, address: str, priority: int = 0) -> Iterator[None]:
+        """
+        Hold the bus of an address for the duration of a transfer.
+
+        Args:
+            address: VISA resource address
+            priority: Queue priority (lower values are served first)
+        """
+        queue = self._queue(bus_of(address))
+        queue.acquire(priority)
+        try:
+            yield
+        finally:
+            queue.release()
+
+    @contextlib.contextmanager
+    def released(self, address: str, priority: int = 0) -> Iterator[None]:
+        """
+        Let other transfers use the bus while this thread waits.
+
+        Used for the delay between a command and reading its response: the
+        instrument keeps the response until it is read, so other
+        instruments on the bus can transfer meanwhile. The bus is
+        re-acquired (at the same depth) when the block ends.
+
+        Args:
+            address: VISA resource address
+            priority: Queue priority used to re-acquire the bus
+        """
+        queue = self._queue(bus_of(address))
+        depth = queue.suspend()
+        try:
+            yield
+        finally:
+            if depth:
+                queue.acquire(priority, depth)
+
+    def run_by_bus(self, jobs: List[Tuple[str, int, Callable[[], Any]]]) -> List[Any]:
+        """
+        Run jobs with one worker per bus.
+
+        Jobs on the same bus run one after another in priority order; jobs on
+        different buses run in parallel.
+
+        Args:
+            jobs: List of (address, priority, callable) tuples
+
+        Returns:
+            Results in the order of the jobs
+
+        Raises:
+            Exception: The first exception raised by any job
+        """
+        groups: Dict[str, List[Tuple[int, int, Callable[[], Any]]]] = {}
+        for index, (address, priority, job) in enumerate(jobs):
+            groups.setdefault(bus_of(address), []).append((priority, index, job))
+
+        results: List[Any] = [None] * len(jobs)
+
+        def run_group(group: List[Tuple[int, int, Callable[[], Any]]]) -> None:
+            for _, index, job in sorted(group, key=lambda item: item[:2]):
+                results[index] = job()
+
+        if not groups:
+            return results
+        with ThreadPoolExecutor(max_workers=len(groups),
+                                thread_name_prefix="visa-bus") as executor:
+            # Each worker runs in a copy of the caller's context (cancel tokens)
+            futures = [executor.submit(contextvars.copy_context().run, run_group, group)
+                       for group in groups.values()]
+            for future in futures:
+                future.result()
+        return results
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-bus utilization metrics.
+
+        Returns:
+            Mapping of bus name to transfers, busy/wait time, max wait,
+            utilization (busy fraction since first use) and queue length
+        """
+        with self._lock:
+            queues = list(self._buses.values())
+        return {queue.bus: queue.stats() for queue in queues}
+
+    def reset(self) -> None:
+        """Forget all buses and their metrics."""
+        with self._lock:
+            self._buses.clear()
+
+
+# Shared process-wide scheduler used by VISA when Setting.VISA_Bus_Schedule_Enable
+_default_scheduler = BusScheduler()
+
+
+def get_scheduler() -> BusScheduler:
+    """
+    Get the shared process-wide bus scheduler.
+
+    Returns:
+        BusScheduler instance
+    """
+    return _default_scheduler
@@ -0,0 +1,266 @@
+"""
+Cancellation - Cooperative abort of in-flight VISA I/O
+
+An operator abort sets Setting.IS_INTERRUPT (process-wide); code that needs
+finer control cancels a CancelToken, optionally with a deadline, and makes
+it current for a block with `with cancellation(token):`. VISA checks both
+before every operation, sleeps through interruptible_sleep() and, with
+Setting.VISA_Interrupt_Slice set, polls for responses in bounded slices so
+an abort takes effect within one slice instead of a full I/O timeout.
+"""
+
+import contextlib
+import contextvars
+import socket
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import pyvisa
+
+from . import Setting
+
+# Longest uninterrupted wait inside interruptible_sleep() (seconds)
+SLEEP_SLICE: float = 0.05
+
+
+class VISAInterruptError(Exception):
+    """Raised when an operation is aborted by IS_INTERRUPT or a CancelToken."""
+
+
+class CancelToken:
+    """
+    Cancellation flag with an optional deadline.
+
+    Also reports cancellation while Setting.IS_INTERRUPT is set, so one
+    check covers both the per-call token and the global operator abort.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialize the token.
+
+        Args:
+            timeout: Optional time budget in seconds; the token counts as
+                     cancelled once it has elapsed
+        """
+        self._event = threading.Event()
+        self.deadline: Optional[float] = (
+            None if timeout is None else time.monotonic() + timeout)
+
+    def cancel(self) -> None:
+        """Cancel every operation using this token."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled, its deadline passed or IS_INTERRUPT is set."""
+        return (self._event.is_set() or Setting.IS_INTERRUPT
+                or (self.deadline is not None and time.monotonic() >= self.deadline))
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (None without a deadline)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def wait(self, seconds: float) -> bool:
+        """
+        Wait up to seconds, returning early on cancel().
+
+        Returns:
+            True if the token was cancelled during the wait
+        """
+        return self._event.wait(seconds)
+
+
+_current_token: "contextvars.ContextVar[Optional[CancelToken]]" = contextvars.ContextVar(
+    "visa_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    """
+    Get the token made current by cancellation().
+
+    Returns:
+        Current CancelToken, or None
+    """
+    return _current_token.get()
+
+
+@contextlib.contextmanager
+def cancellation(token: CancelToken) -> Iterator[CancelToken]:
+    """
+    Make a token current for all VISA I/O in this block (and this thread/task).
+
+    Args:
+        token: Token checked by VISA operations inside the block
+    """
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def is_interrupted(token: Optional[CancelToken] = None) -> bool:
+    """
+    Check IS_INTERRUPT and a token (the current one by default).
+
+    Args:
+        token: Token to check instead of the current one
+
+    Returns:
+        True if the operation should be aborted
+    """
+    token = token if token is not None else _current_token.get()
+    if token is not None:
+        return token.cancelled
+    return Setting.IS_INTERRUPT
+
+
+def check_interrupt(token: Optional[CancelToken] = None) -> None:
+    """
+    Raise if the operation should be aborted.
+
+    Args:
+        token: Token to check instead of the current one
+
+    Raises:
+        VISAInterruptError: If IS_INTERRUPT is set or the token is cancelled
+    """
+    if is_interrupted(token):
+        raise VISAInterruptError("VISA Interrupted")
+
+
+def interruptible_sleep(seconds: Optional[float], token: Optional[CancelToken] = None) -> None:
+    """
+    Sleep in short slices, aborting as soon as an interrupt is requested.
+
+    Args:
+        seconds: Sleep duration (None or 0 returns immediately)
+        token: Token to check instead of the current one
+
+    Raises:
+        VISAInterruptError: If interrupted before the sleep completes
+    """
+    if not seconds:
+        return
+    token = token if token is not None else _current_token.get()
+    end = time.monotonic() + seconds
+    while True:
+        check_interrupt(token)
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return
+        if token is not None:
+            token.wait(min(remaining, SLEEP_SLICE))
+        else:
+            time.sleep(min(remaining, SLEEP_SLICE))
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether an I/O error is a timeout (VISA or socket)."""
+    if isinstance(error, (socket.timeout, TimeoutError)):
+        return True
+    return (isinstance(error, pyvisa.errors.VisaIOError)
+            and error.error_code == pyvisa.constants.StatusCode.error_timeout)
+
+
+# IEEE 488.2 status byte bit: message available in the output queue
+STB_MAV: int = 0x10
+
+# Resources whose read_stb() is emulated with a '*STB?' query (its reply
+# would queue behind the response being waited for)
+QUERIED_STB_TYPES = (pyvisa.resources.SerialInstrument, pyvisa.resources.TCPIPSocket,
+                      pyvisa.resources.USBRaw)
+
+
+def _response_check(handle: Any) -> Optional[Callable[[], bool]]:
+    """
+    Get a check that tells, without reading, whether a response is waiting.
+
+    Serial ports and the native socket transport report received bytes
+    (bytes_in_buffer); GPIB, USBTMC and VXI-11/HiSLIP instruments report
+    the MAV bit of the status byte.
+
+    Args:
+        handle: Resource to check
+
+    Returns:
+        Callable returning True once a response is waiting, or None if the
+        handle can tell neither way
+    """
+    try:
+        if isinstance(handle.bytes_in_buffer, int):
+            return lambda: handle.bytes_in_buffer > 0
+    except Exception:
+        pass  # No receive buffer count for this resource type
+    if isinstance(handle, QUERIED_STB_TYPES):
+        return None
+    try:
+        if isinstance(handle.read_stb(), int):
+            return lambda: bool(handle.read_stb() & STB_MAV)
+    except Exception:
+        pass  # Status byte not supported by this resource or backend
+    return None
+
+
+def sliced_wait(handle: Any, operation: Callable[[], Any],
+                token: Optional[CancelToken] = None) -> Any:
+    """
+    Wait for a response in interruptible slices, then read it in one go.
+
+    Only the wait for the response is sliced: the handle is polled (see
+    _response_check()) with growing intervals up to
+    Setting.VISA_Interrupt_Slice, checking the interrupt state in between,
+    and the operation runs once with the rest of the handle's timeout.
+    Retrying a read that timed out would return a truncated response,
+    because VISA reads drop the chunks received before the timeout. Handles
+    that cannot report a waiting response, and all handles without
+    Setting.VISA_Interrupt_Slice, run the operation unchanged.
+
+    Args:
+        handle: Resource whose timeout (milliseconds) bounds the wait
+        operation: Read to run (e.g. handle.read)
+        token: Token to check instead of the current one
+
+    Returns:
+        The operation's result
+
+    Raises:
+        VISAInterruptError: If interrupted while waiting
+    """
+    slice_time = Setting.VISA_Interrupt_Slice
+    if not slice_time:
+        return operation()
+
+    token = token if token is not None else _current_token.get()
+    check_interrupt(token)
+    waiting = _response_check(handle)
+    if waiting is None:
+        return operation()
+
+    timeout = handle.timeout
+    deadline = None if timeout is None else time.monotonic() + timeout / 1000.0
+    interval = 0.001
+    while not waiting():
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            break  # Let the read report the timeout
+        wait = interval if remaining is None else min(interval, remaining)
+        if token is not None:
+            token.wait(wait)
+        else:
+            time.sleep(wait)
+        check_interrupt(token)
+        interval = min(interval * 2, slice_time)
+
+    if deadline is None:
+        return operation()
+    # The response has started arriving: read all of it within the total timeout
+    handle.timeout = max(1.0, (deadline - time.monotonic()) * 1000.0)
+    try:
+        return operation()
+    finally:
+        handle.timeout = timeout
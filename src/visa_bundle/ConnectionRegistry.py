@@ -0,0 +1,905 @@
+"""
+Connection Registry - Shared VISA session pool
+
+Holds the process-wide list of opened sessions that VISA instances reuse by
+address, the retrying open logic shared by all callers, and a warm pool that
+pre-opens a station's sessions in background threads so later VISA
+instances pick up a ready handle from the registry.
+
+Pool policies (Setting.VISA_Pool_*) cap the number of open sessions globally
+and per interface and close idle sessions; evicted sessions are reopened
+transparently by their VISA owners on next use. Owners release their share
+of a session explicitly or through a weakref finalizer when garbage
+collected; the latter is reported by the leak detector.
+"""
+
+import collections
+import contextlib
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import pyvisa
+from am_shared.logger import logger
+
+from . import Setting
+from .AliasCache import get_alias_cache, is_resource_address
+from .Cancellation import (SLEEP_SLICE, VISAInterruptError, check_interrupt,
+                           interruptible_sleep)
+
+# Global connection registry: (address, VISA_resource)
+# Checked before opening new connections, removed on close
+opened_connections: List[Tuple[str,
+                               pyvisa.resources.MessageBasedResource]] = []
+
+# Handle types treated like pyvisa message-based resources; alternative
+# transports (e.g. the broker proxy) add themselves here
+MESSAGE_BASED_TYPES: Tuple[type, ...] = (pyvisa.resources.MessageBasedResource,)
+
+# Guards opened_connections and the warm-up bookkeeping below
+registry_lock = threading.RLock()
+
+# Pool bookkeeping: address -> SessionInfo for each registered session
+_sessions: Dict[str, "SessionInfo"] = {}
+
+# Number of sessions closed by pool policies since process start
+_eviction_count: int = 0
+
+# Background thread enforcing Setting.VISA_Pool_Idle_Timeout
+_idle_reaper: Optional[threading.Thread] = None
+
+# Owners garbage-collected without close/release (Setting.VISA_Leak_Detect)
+_leaked_handles: Deque[Dict[str, Any]] = collections.deque(maxlen=1000)
+
+# Releases queued by finalizers (SimpleQueue.put is safe from any thread/GC)
+_pending_releases: "queue.SimpleQueue[Tuple[SessionInfo, str, str, Optional[str]]]" = \
+    queue.SimpleQueue()
+_releaser: Optional[threading.Thread] = None
+
+# Failed open attempts before the next session of an address opened
+_open_retries: Dict[str, int] = {}
+
+# Timeout of the *IDN? query that validates an address (milliseconds)
+IDN_QUERY_TIMEOUT: int = 2000
+
+# Longest VISA.open() waits for a warm-up of the same resource before opening
+# it itself (seconds): one *IDN? query plus the open and its settle time
+WARM_UP_WAIT_TIMEOUT: float = IDN_QUERY_TIMEOUT / 1000.0 + 3.0
+
+# Warm-up in progress: station key (address or alias) -> completion event
+_warming: Dict[str, threading.Event] = {}
+
+# Warm-up failures: station key -> error message
+_warm_up_errors: Dict[str, str] = {}
+
+
+def register_message_based_type(handle_type: type) -> None:
+    """
+    Accept an alternative transport type wherever message-based I/O is checked.
+
+    Args:
+        handle_type: Handle class implementing the pyvisa message-based API
+                     subset used by VISA (query/write/read/read_raw/...)
+    """
+    global MESSAGE_BASED_TYPES
+
+    if handle_type not in MESSAGE_BASED_TYPES:
+        MESSAGE_BASED_TYPES = MESSAGE_BASED_TYPES + (handle_type,)
+
+
+def interface_of(address: str) -> str:
+    """
+    Get the interface (board) a resource address belongs to.
+
+    Args:
+        address: VISA resource address (e.g. 'GPIB0::5::INSTR')
+
+    Returns:
+        Interface name with board number (e.g. 'GPIB0', 'USB0', 'TCPIP0')
+    """
+    board = address.split("::", 1)[0].upper()
+    return board if board[-1:].isdigit() else f"{board}0"
+
+
+class SessionInfo:
+    """
+    Pool bookkeeping for one registered session.
+
+    Tracks owners (VISA instances sharing the handle), in-flight I/O and
+    last use so that pool policies only ever close idle sessions, plus the
+    per-session I/O statistics reported by get_session_stats().
+    """
+
+    def __init__(self, address: str, handle: Any):
+        """
+        Initialize session bookkeeping.
+
+        Args:
+            address: VISA resource address
+            handle: Registered resource handle
+        """
+        self.address: str = address
+        self.handle: Any = handle
+        self.interface: str = interface_of(address)
+        self.opened_at: float = time.time()
+        self.last_used: float = self.opened_at
+        self.in_use: int = 0
+        self.evicted: bool = False
+        self.owners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self.lock = threading.Lock()
+        # I/O statistics (one operation per outermost VISA call)
+        self.operations: int = 0
+        self.bytes_out: int = 0
+        self.bytes_in: int = 0
+        self.io_seconds: float = 0.0
+        self.errors: int = 0
+        self.retries: int = 0
+        self.flushes: int = 0
+
+    def acquire(self) -> bool:
+        """
+        Mark the session as in use for one I/O operation.
+
+        Returns:
+            False if the session has been evicted and must be reopened
+        """
+        with self.lock:
+            if self.evicted:
+                return False
+            self.in_use += 1
+            self.last_used = time.time()
+            return True
+
+    def release(self, seconds: Optional[float] = None, sent: int = 0, received: int = 0,
+                flushes: int = 0, failed: bool = False) -> None:
+        """
+        Mark one I/O operation on the session as finished.
+
+        Args:
+            seconds: Time spent in the operation; None for a nested operation
+                     that the enclosing one accounts for
+            sent: Bytes written
+            received: Bytes read
+            flushes: Input buffer flushes performed
+            failed: Whether the operation raised a communication error
+        """
+        with self.lock:
+            self.in_use -= 1
+            self.last_used = time.time()
+            if seconds is not None:
+                self.operations += 1
+                self.io_seconds += seconds
+                self.bytes_out += sent
+                self.bytes_in += received
+                self.flushes += flushes
+                if failed:
+                    self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a consistent copy of the session statistics.
+
+        Returns:
+            Dictionary of the counters, times and users of the session
+        """
+        now = time.time()
+        with self.lock:
+            owners = list(self.owners)
+            age = now - self.opened_at
+            return {
+                "address": self.address,
+                "interface": self.interface,
+                "opened_at": self.opened_at,
+                "last_used": self.last_used,
+                "users": len(owners),
+                "owners": sorted(getattr(owner, "name", "?") for owner in owners),
+                "in_use": self.in_use,
+                "operations": self.operations,
+                "bytes_out": self.bytes_out,
+                "bytes_in": self.bytes_in,
+                "io_seconds": self.io_seconds,
+                "mean_ms": (self.io_seconds / self.operations * 1000.0
+                            if self.operations else 0.0),
+                "utilization": self.io_seconds / age if age > 0 else 0.0,
+                "errors": self.errors,
+                "retries": self.retries,
+                "flushes": self.flushes,
+            }
+
+
+def find_session(address: str) -> Optional[pyvisa.resources.MessageBasedResource]:
+    """
+    Find a registered session by address.
+
+    Args:
+        address: VISA resource address
+
+    Returns:
+        Registered handle, or None if the address is not open
+    """
+    with registry_lock:
+        for opened_address, handle in opened_connections:
+            if opened_address == address:
+                return handle
+    return None
+
+
+def register_session(address: str,
+                     handle: pyvisa.resources.MessageBasedResource
+                     ) -> pyvisa.resources.MessageBasedResource:
+    """
+    Add a session to the registry unless the address is already registered.
+
+    Args:
+        address: VISA resource address
+        handle: Newly opened handle
+
+    Returns:
+        The registered handle for the address (an existing one wins)
+    """
+    with registry_lock:
+        existing = find_session(address)
+        if existing is not None:
+            return existing
+        opened_connections.append((address, handle))
+        info = SessionInfo(address, handle)
+        info.retries = _open_retries.pop(address, 0)
+        _sessions[address] = info
+    _start_idle_reaper()
+    return handle
+
+
+def attach_session(address: str, owner: Any) -> Optional[SessionInfo]:
+    """
+    Record a VISA instance as an owner of the registered session.
+
+    Owners are held weakly and are notified through
+    ``owner._release_evicted_session()`` when a pool policy closes the session.
+
+    Args:
+        address: VISA resource address
+        owner: VISA instance using the session
+
+    Returns:
+        Session bookkeeping, or None if the address is not registered
+    """
+    with registry_lock:
+        handle = find_session(address)
+        info = _sessions.get(address)
+        if handle is None:
+            return None
+        if info is None or info.handle is not handle:
+            # Registered directly through opened_connections; adopt it
+            info = SessionInfo(address, handle)
+            _sessions[address] = info
+        info.owners.add(owner)
+        return info
+
+
+def unregister_session(handle: pyvisa.resources.MessageBasedResource) -> None:
+    """
+    Remove a session from the registry.
+
+    Args:
+        handle: Handle to remove
+    """
+    with registry_lock:
+        opened_connections[:] = [
+            (addr, registered) for addr, registered in opened_connections
+            if registered != handle
+        ]
+        for address, info in list(_sessions.items()):
+            if info.handle is handle:
+                del _sessions[address]
+
+
+def close_all() -> None:
+    """Close every registered session and empty the registry."""
+    with registry_lock:
+        handles = [handle for _, handle in opened_connections]
+        opened_connections.clear()
+        _sessions.clear()
+
+    # Close outside the lock: closing may block on I/O
+    for handle in handles:
+        try:
+            if isinstance(handle, MESSAGE_BASED_TYPES):
+                handle.close()
+        except Exception:
+            pass  # Ignore errors during close
+
+
+def _evict(info: SessionInfo, count: bool = True,
+           idle_since: Optional[float] = None, unowned: bool = False) -> bool:
+    """
+    Close an idle session and tell its owners to reopen on next use.
+
+    The session is re-checked under the registry lock, so one picked by a
+    pool policy is left open if another thread started using it since.
+
+    Args:
+        info: Session to evict
+        count: Count the closure as a pool eviction in the statistics
+        idle_since: last_used seen when the session was selected; the
+                    session is kept if it has been used since
+        unowned: Only close the session if no owner has attached since
+
+    Returns:
+        False if the session is in use and was left open
+    """
+    global _eviction_count
+
+    with registry_lock:
+        with info.lock:
+            if info.in_use or info.evicted:
+                return False
+            if idle_since is not None and info.last_used != idle_since:
+                return False
+            if unowned and any(True for _ in info.owners):
+                return False
+            info.evicted = True
+        unregister_session(info.handle)
+        if count:
+            _eviction_count += 1
+
+    try:
+        info.handle.close()
+    except Exception:
+        pass  # Ignore errors during close
+    for owner in list(info.owners):
+        owner._release_evicted_session(info)
+    return True
+
+
+def release_owner(info: SessionInfo) -> None:
+    """
+    Release a session after one of its owners is done with it.
+
+    When no live owners remain the session is closed, or left idle in the
+    pool for reuse if an idle timeout is configured.
+
+    Args:
+        info: Session the owner was using
+    """
+    with registry_lock:
+        if any(True for _ in info.owners) or info.evicted:
+            return
+        if find_session(info.address) is not info.handle:
+            return  # Already closed or replaced
+    if Setting.VISA_Pool_Idle_Timeout <= 0:
+        _evict(info, count=False, unowned=True)
+
+
+def _finalize_owner(info: SessionInfo, name: str, address: str,
+                    created_stack: Optional[str]) -> None:
+    """
+    Finalizer callback for a VISA instance garbage-collected without closing.
+
+    Garbage collection can run on any thread, including one that holds the
+    registry lock or services a transport, so the release is handed to the
+    releaser thread instead of running here.
+    """
+    global _releaser
+
+    _pending_releases.put((info, name, address, created_stack))
+    if _releaser is None:
+        _releaser = threading.Thread(target=_releaser_loop,
+                                     name="visa-releaser", daemon=True)
+        _releaser.start()
+
+
+def _releaser_loop() -> None:
+    """Release sessions of garbage-collected owners queued by finalizers."""
+    while True:
+        info, name, address, created_stack = _pending_releases.get()
+        try:
+            _release_collected_owner(info, name, address, created_stack)
+        except Exception:
+            pass  # Never let the releaser die
+
+
+def _release_collected_owner(info: SessionInfo, name: str, address: str,
+                             created_stack: Optional[str]) -> None:
+    """
+    Record a leak when Setting.VISA_Leak_Detect is enabled, then release the
+    garbage-collected owner's share of the session.
+    """
+    if Setting.VISA_Leak_Detect:
+        _leaked_handles.append({
+            "name": name,
+            "address": address,
+            "opened_at": info.opened_at,
+            "collected_at": time.time(),
+            "created_stack": created_stack,
+        })
+        logger.warning(f"VISA handle leak: {name}, address: {address} "
+                       f"was garbage-collected without close()")
+    release_owner(info)
+
+
+def get_leaked_handles() -> List[Dict[str, Any]]:
+    """
+    Get owners that were garbage-collected without close() or release().
+
+    Only populated while Setting.VISA_Leak_Detect is enabled.
+
+    Returns:
+        List of leak records (name, address, opened_at, collected_at,
+        created_stack)
+    """
+    with registry_lock:
+        return list(_leaked_handles)
+
+
+def clear_leaked_handles() -> None:
+    """Forget all recorded leaks."""
+    with registry_lock:
+        _leaked_handles.clear()
+
+
+def _live_sessions() -> List[SessionInfo]:
+    """Return bookkeeping for sessions still present in opened_connections."""
+    registered = {id(handle) for _, handle in opened_connections}
+    return [info for info in _sessions.values() if id(info.handle) in registered]
+
+
+def make_room(address: str) -> int:
+    """
+    Evict least-recently-used idle sessions so one more session fits.
+
+    Limits come from Setting.VISA_Pool_Max_Sessions (global) and
+    Setting.VISA_Pool_Max_Per_Interface (per interface); 0 disables a limit.
+    Sessions with I/O in flight are never evicted, so the limits are soft
+    when every session is busy.
+
+    Args:
+        address: Address about to be opened
+
+    Returns:
+        Number of sessions evicted
+    """
+    max_total = Setting.VISA_Pool_Max_Sessions
+    max_interface = Setting.VISA_Pool_Max_Per_Interface
+    if max_total <= 0 and max_interface <= 0:
+        return 0
+
+    interface = interface_of(address)
+    evicted = 0
+
+    with registry_lock:
+        candidates = sorted(((info, info.last_used) for info in _live_sessions()),
+                            key=lambda candidate: candidate[1])
+    sessions = [info for info, _ in candidates]
+
+    for info, idle_since in candidates:
+        live = [session for session in sessions if not session.evicted]
+        total_over = 0 < max_total <= len(live)
+        interface_over = 0 < max_interface <= sum(
+            1 for session in live if session.interface == interface)
+        if not (total_over or interface_over):
+            break
+        if total_over or info.interface == interface:
+            if _evict(info, idle_since=idle_since):
+                evicted += 1
+    return evicted
+
+
+def evict_idle_sessions(idle_timeout: Optional[float] = None) -> int:
+    """
+    Close sessions that have been idle longer than the timeout.
+
+    Args:
+        idle_timeout: Idle time in seconds (defaults to
+                      Setting.VISA_Pool_Idle_Timeout; 0 disables)
+
+    Returns:
+        Number of sessions evicted
+    """
+    if idle_timeout is None:
+        idle_timeout = Setting.VISA_Pool_Idle_Timeout
+    if idle_timeout <= 0:
+        return 0
+
+    cutoff = time.time() - idle_timeout
+    with registry_lock:
+        stale = [(info, info.last_used) for info in _live_sessions()
+                 if info.last_used < cutoff]
+    return sum(1 for info, idle_since in stale if _evict(info, idle_since=idle_since))
+
+
+def _idle_reaper_loop() -> None:
+    """Periodically evict idle sessions while an idle timeout is configured."""
+    while True:
+        idle_timeout = Setting.VISA_Pool_Idle_Timeout
+        time.sleep(min(max(idle_timeout / 4, 1.0), 30.0) if idle_timeout > 0 else 5.0)
+        try:
+            evict_idle_sessions()
+        except Exception:
+            pass  # Never let the reaper die
+
+
+def _start_idle_reaper() -> None:
+    """Start the idle reaper thread once an idle timeout is configured."""
+    global _idle_reaper
+
+    if Setting.VISA_Pool_Idle_Timeout <= 0 or _idle_reaper is not None:
+        return
+    with registry_lock:
+        if _idle_reaper is None:
+            _idle_reaper = threading.Thread(
+                target=_idle_reaper_loop, name="visa-idle-reaper", daemon=True)
+            _idle_reaper.start()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get a snapshot of pool occupancy.
+
+    Returns:
+        Dictionary with open/in-use/idle session counts, per-interface
+        counts, configured limits and the number of evictions so far
+    """
+    with registry_lock:
+        sessions = _live_sessions()
+        per_interface: Dict[str, int] = {}
+        for info in sessions:
+            per_interface[info.interface] = per_interface.get(info.interface, 0) + 1
+        in_use = sum(1 for info in sessions if info.in_use)
+        return {
+            "open_sessions": len(opened_connections),
+            "in_use": in_use,
+            "idle": len(sessions) - in_use,
+            "per_interface": per_interface,
+            "max_sessions": Setting.VISA_Pool_Max_Sessions,
+            "max_per_interface": Setting.VISA_Pool_Max_Per_Interface,
+            "idle_timeout": Setting.VISA_Pool_Idle_Timeout,
+            "evictions": _eviction_count,
+        }
+
+
+def get_session_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get a snapshot of the I/O statistics of every registered session.
+
+    Only counters are copied (no I/O), so a monitoring thread can poll this
+    frequently.
+
+    Returns:
+        Dictionary mapping address to SessionInfo.snapshot()
+    """
+    with registry_lock:
+        sessions = list(_sessions.values())
+    return {info.address: info.snapshot() for info in sessions}
+
+
+def open_session(address: str, skip_clear: bool = False,
+                 retry_max: int = 2, use_broker: bool = True,
+                 transport: str = "visa") -> Any:
+    """
+    Open a VISA session with retries and an optional device clear.
+
+    Idle sessions are evicted first if pool limits would be exceeded. When
+    Setting.VISA_Broker_Path is set the session is opened in the local
+    broker process and a proxy handle is returned; the socket transport
+    connects directly without the VISA library. The session is not
+    registered; callers decide whether to register it.
+
+    Args:
+        address: VISA resource address
+        skip_clear: Skip the device clear performed after opening
+        retry_max: Number of open attempts
+        use_broker: Route through the broker if one is configured (the
+                    broker itself opens real sessions with False)
+        transport: "visa" for the VISA library or "socket" for the native
+                   raw TCP transport of TCPIP::host::port::SOCKET resources
+
+    Returns:
+        Opened resource handle
+
+    Raises:
+        Exception: If unable to open the session after retries
+    """
+    # Free a slot first so the driver never holds more than the pool allows
+    make_room(address)
+
+    broker_path = Setting.VISA_Broker_Path if use_broker else ""
+
+    for attempt in range(retry_max):
+        check_interrupt()
+        try:
+            if transport == "socket":
+                # Imported here: SocketTransport builds on this module
+                from .SocketTransport import SocketResource
+                return SocketResource.open(address)
+
+            if broker_path:
+                # Imported here: Broker builds on this module
+                from .Broker import BrokerHandle
+                return BrokerHandle.open(broker_path, address, skip_clear=skip_clear)
+
+            resource_manager = pyvisa.ResourceManager()
+            handle = resource_manager.open_resource(address)
+            try:
+                if hasattr(handle, 'clear') and not skip_clear:
+                    handle.clear()
+            except Exception:
+                pass  # Ignore clear errors
+            if handle is not None:
+                break
+        except Exception:
+            interruptible_sleep(1)
+        with registry_lock:
+            _open_retries[address] = _open_retries.get(address, 0) + 1
+    else:
+        with registry_lock:
+            _open_retries.pop(address, None)
+        raise Exception(f"VISA Open Error: address: {address}")
+
+    # Let the device settle after the clear; an abort closes the new handle
+    try:
+        interruptible_sleep(0.5)
+    except VISAInterruptError:
+        handle.close()
+        raise
+    return handle
+
+
+def list_resources() -> List[str]:
+    """
+    List all available VISA resources.
+
+    Returns:
+        List of VISA resource addresses (empty on error)
+    """
+    try:
+        resource_manager = pyvisa.ResourceManager()
+        return list(resource_manager.list_resources())
+    except Exception:
+        return []
+
+
+def _query_shared_idn(address: str, handle: Any) -> Optional[str]:
+    """Query *IDN? on a registered session like any other pooled operation."""
+    info = _sessions.get(address)
+    if info is not None and not info.acquire():
+        return None  # Evicted under us; the caller opens a fresh session
+    start = time.perf_counter()
+    failed = False
+    try:
+        if Setting.VISA_Bus_Schedule_Enable:
+            # Imported here: BusScheduler builds on this module
+            from .BusScheduler import get_scheduler
+            slot = get_scheduler().slot(address, 0)
+        else:
+            slot = contextlib.nullcontext()
+        with slot:
+            try:
+                handle.flush(pyvisa.constants.BufferOperation.discard_receive_buffer)
+            except Exception:
+                pass  # Flush not supported by this backend/instrument; ignore
+            return handle.query("*IDN?").strip()
+    except Exception:
+        failed = True
+        return None
+    finally:
+        if info is not None:
+            info.release(time.perf_counter() - start, failed=failed)
+
+
+def query_idn(address: str, keep: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Query *IDN? on an address, reusing a registered session if available.
+
+    A registered session is used under its pool bookkeeping and bus slot,
+    with the input buffer flushed first.
+
+    Args:
+        address: VISA resource address
+        keep: If given, a session opened for the query is stored here by
+              address instead of being closed, so it can be reused
+
+    Returns:
+        Identification string, or None if the address cannot be queried
+    """
+    handle = find_session(address)
+    if handle is not None:
+        idn = _query_shared_idn(address, handle)
+        if idn is not None or find_session(address) is not None:
+            return idn
+
+    try:
+        resource_manager = pyvisa.ResourceManager()
+        handle = resource_manager.open_resource(address)
+    except Exception:
+        return None
+    kept = False
+    try:
+        timeout = handle.timeout
+        handle.timeout = IDN_QUERY_TIMEOUT
+        idn = handle.query("*IDN?").strip()
+        handle.timeout = timeout
+        if keep is not None:
+            keep[address] = handle
+            kept = True
+        return idn
+    except Exception:
+        return None
+    finally:
+        if not kept:
+            handle.close()
+
+
+def resolve_address(address: str, skip_clear: bool = False,
+                    transport: str = "visa") -> str:
+    """
+    Resolve an alias through the alias cache; resource addresses pass through.
+
+    The session opened to validate the resolved address is registered
+    rather than closed, so opening the instrument right after resolution
+    does not cost a second open. Sessions of rejected candidates are closed.
+
+    Args:
+        address: VISA resource address, logical name or serial number
+        skip_clear: Skip the device clear of a kept validation session
+        transport: Transport the caller opens with; validation sessions are
+                   only kept for the VISA library without a broker
+
+    Returns:
+        VISA resource address
+
+    Raises:
+        Exception: If an alias cannot be resolved
+    """
+    if is_resource_address(address):
+        return address
+    if transport != "visa" or Setting.VISA_Broker_Path:
+        return get_alias_cache().resolve(address, query_idn, list_resources)
+
+    opened: Dict[str, Any] = {}
+    try:
+        resolved = get_alias_cache().resolve(
+            address, lambda candidate: query_idn(candidate, opened), list_resources)
+        handle = opened.pop(resolved, None)
+        if handle is not None:
+            if not skip_clear:
+                try:
+                    handle.clear()
+                except Exception:
+                    pass  # Device clear not supported; the session is still usable
+            make_room(resolved)
+            if register_session(resolved, handle) is not handle:
+                handle.close()  # Lost a race with another open; share that one
+        return resolved
+    finally:
+        for handle in opened.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+
+def _warm_one(key: str, skip_clear: bool, event: threading.Event) -> None:
+    """Resolve, open and register one station entry, then signal completion."""
+    address = key
+    try:
+        address = resolve_address(key, skip_clear=skip_clear)
+        if address != key:
+            with registry_lock:
+                _warming.setdefault(address, event)
+
+        if find_session(address) is None:
+            handle = open_session(address, skip_clear=skip_clear)
+            if isinstance(handle, MESSAGE_BASED_TYPES):
+                if register_session(address, handle) is not handle:
+                    handle.close()  # Lost a race with a foreground open
+    except Exception as error:
+        with registry_lock:
+            _warm_up_errors[key] = str(error)
+    finally:
+        with registry_lock:
+            for warm_key in (key, address):
+                if _warming.get(warm_key) is event:
+                    del _warming[warm_key]
+        event.set()
+
+
+def warm_up(station: Union[Dict[str, str], Iterable[str]],
+            skip_clear: bool = False) -> List[str]:
+    """
+    Pre-open a station's sessions in background threads.
+
+    Each entry is resolved (aliases included), opened and registered in its
+    own daemon thread. VISA.open() waits for an in-flight warm-up of the same
+    resource instead of opening a duplicate session, for at most
+    WARM_UP_WAIT_TIMEOUT seconds before opening the resource itself.
+
+    Args:
+        station: Mapping of instrument name to address, or iterable of
+                 addresses (aliases and serial numbers are accepted)
+        skip_clear: Skip the device clear performed after opening
+
+    Returns:
+        Station keys whose warm-up was started
+    """
+    addresses = station.values() if isinstance(station, dict) else station
+    started: List[str] = []
+
+    with registry_lock:
+        for key in addresses:
+            if key in _warming or find_session(key) is not None:
+                continue
+            event = threading.Event()
+            _warming[key] = event
+            _warm_up_errors.pop(key, None)
+            started.append(key)
+            threading.Thread(target=_warm_one, args=(key, skip_clear, event),
+                             name=f"visa-warm-{key}", daemon=True).start()
+
+    return started
+
+
+def wait_for_warm_up(key: Optional[str] = None,
+                     timeout: Optional[float] = None) -> bool:
+    """
+    Wait for a background warm-up to finish.
+
+    The wait runs in short slices that check the interrupt state, so a
+    warm-up hung on another thread can still be cancelled.
+
+    Args:
+        key: Station key (address or alias) to wait for; None waits for all
+        timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+    Returns:
+        True if nothing matching the key is still warming
+
+    Raises:
+        VISAInterruptError: If interrupted while waiting
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+        with registry_lock:
+            if key is None:
+                events = list(_warming.values())
+            else:
+                event = _warming.get(key)
+                events = [event] if event is not None else []
+        if not events:
+            return True
+        for event in events:
+            while True:
+                check_interrupt()
+                if deadline is None:
+                    slice_time = SLEEP_SLICE
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    slice_time = min(remaining, SLEEP_SLICE)
+                if event.wait(slice_time):
+                    break
+
+
+def get_warming_connections() -> List[str]:
+    """
+    Get the station keys that are still warming up.
+
+    Returns:
+        List of addresses or aliases whose sessions are still being opened
+    """
+    with registry_lock:
+        return list(_warming.keys())
+
+
+def get_warm_up_errors() -> Dict[str, str]:
+    """
+    Get warm-up failures.
+
+    Returns:
+        Mapping of station key to error message
+    """
+    with registry_lock:
+        return dict(_warm_up_errors)
@@ -0,0 +1,215 @@
+"""
+Error Queue - Deferred, batched SCPI error-queue checking
+
+Following every write with query("SYST:ERR?") doubles the round trips;
+skipping it lets errors surface far from the command that caused them.
+ErrorCheck lets VISA probe the error state only when it is worth it:
+
+- "call":     every write() carries the probe in the same message
+              ('VOLT 5;*ESR?'), one round trip instead of two
+- "batch":    commands inside a VISA.error_batch() block are checked with a
+              single probe when the block ends
+- "periodic": the probe rides along every N writes and/or every T seconds
+
+Queries sent with write() never carry the probe (the caller reads their
+reply); they are checked with the next one.
+
+The probe is '*ESR?' by default (one short reply when all is well); only
+when it reports an error is the queue drained with 'SYST:ERR?'. Drained
+errors are attributed back to the commands sent since the previous check.
+"""
+
+import collections
+import time
+from typing import Deque, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Error checking modes
+ERROR_CHECK_MODES = ("call", "batch", "periodic")
+
+# Standard event status bits set by errors: query (QYE), device-dependent
+# (DDE), execution (EXE) and command (CME) errors
+ESR_ERROR_MASK: int = 0x3C
+
+
+class ErrorEntry(NamedTuple):
+    """One error read from an instrument's error queue."""
+
+    code: int
+    message: str
+    command: Optional[str]
+    batch: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        text = f'{self.code},"{self.message}"'
+        return text if self.command is None else f"{text} <- {self.command}"
+
+
+class InstrumentError(Exception):
+    """Errors reported by an instrument's SCPI error queue."""
+
+    def __init__(self, name: str, errors: Sequence[ErrorEntry]):
+        """
+        Initialize the error.
+
+        Args:
+            name: Instrument name
+            errors: Errors drained from the queue
+        """
+        self.name: str = name
+        self.errors: List[ErrorEntry] = list(errors)
+        super().__init__(f"VISA Instrument Error: {name}: "
+                         + "; ".join(str(error) for error in self.errors))
+
+
+def parse_error(response: str) -> Tuple[int, str]:
+    """
+    Parse a 'SYST:ERR?' reply.
+
+    Args:
+        response: Reply such as '-113,"Undefined header"' or '+0,"No error"'
+
+    Returns:
+        (code, message) tuple; code 0 means the queue is empty
+    """
+    code, _, message = response.strip().partition(",")
+    try:
+        return int(code), message.strip().strip('"')
+    except ValueError:
+        return -1, response.strip()
+
+
+def attribute_error(message: str, commands: Sequence[str]) -> Optional[str]:
+    """
+    Find the command an error most likely belongs to.
+
+    Args:
+        message: Error message (instruments often quote the offending header)
+        commands: Commands sent since the previous check, oldest first
+
+    Returns:
+        The only command checked, else the last one whose SCPI header appears
+        in the message, else None
+    """
+    if len(commands) == 1:
+        return commands[0]
+    text = message.upper()
+    for command in reversed(commands):
+        header = command.split(None, 1)[0].lstrip(":").upper() if command.strip() else ""
+        if header and header.rstrip("?") in text:
+            return command
+    return None
+
+
+class ErrorCheck:
+    """
+    Error checking policy and state of one instrument.
+
+    Records the commands sent since the previous check, decides when a
+    write should carry the probe and turns drained errors into attributed
+    ErrorEntry records.
+    """
+
+    def __init__(self, mode: str = "batch", probe: str = "*ESR?",
+                 error_command: str = "SYST:ERR?", every: Optional[int] = None,
+                 interval: Optional[float] = None, max_errors: int = 32,
+                 raise_errors: bool = True, history: int = 1000):
+        """
+        Initialize the policy.
+
+        Args:
+            mode: 'call', 'batch' or 'periodic'
+            probe: Cheap status query ('*ESR?', or error_command itself)
+            error_command: Query reading one entry of the error queue
+            every: Periodic mode: probe with every Nth write
+            interval: Periodic mode: probe with the first write after this
+                      many seconds
+            max_errors: Maximum entries read when draining the queue
+            raise_errors: Raise InstrumentError (otherwise only log and keep
+                          the errors in history)
+            history: Number of errors (and unchecked commands) kept
+
+        Raises:
+            ValueError: If the mode is unknown or periodic without every/interval
+        """
+        if mode not in ERROR_CHECK_MODES:
+            raise ValueError(f"Unknown error check mode '{mode}'")
+        if mode == "periodic" and not every and not interval:
+            raise ValueError("Periodic error checking needs every or interval")
+        self.mode: str = mode
+        self.probe: str = probe
+        self.error_command: str = error_command
+        self.every: Optional[int] = every
+        self.interval: Optional[float] = interval
+        self.max_errors: int = max_errors
+        self.raise_errors: bool = raise_errors
+        self.errors: Deque[ErrorEntry] = collections.deque(maxlen=history)
+        # Commands sent since the previous check (the most recent ones when unchecked)
+        self.pending: Deque[str] = collections.deque(maxlen=history)
+        self.batch_depth: int = 0
+        self.checks: int = 0
+        self._writes: int = 0
+        self._last_check: float = time.monotonic()
+
+    @property
+    def probe_suffix(self) -> str:
+        """Probe appended to a command in the same message."""
+        probe = self.probe.strip()
+        return f";{probe}" if probe.startswith("*") else f";:{probe.lstrip(':')}"
+
+    def record(self, command: str) -> None:
+        """Remember a command for attribution at the next check."""
+        self.pending.append(command)
+
+    def probe_due(self) -> bool:
+        """
+        Whether the write being sent should carry the probe.
+
+        Inside an error_batch() block writes never carry it; the block's end
+        checks once.
+        """
+        if self.batch_depth or self.mode == "batch":
+            return False
+        if self.mode == "call":
+            return True
+        self._writes += 1
+        if self.every and self._writes >= self.every:
+            return True
+        return bool(self.interval) and time.monotonic() - self._last_check >= self.interval
+
+    def probe_result(self, response: str) -> Tuple[bool, List[Tuple[int, str]]]:
+        """
+        Interpret the probe reply.
+
+        Args:
+            response: Reply to the probe
+
+        Returns:
+            (errors pending, errors already read by the probe)
+        """
+        if self.probe.strip().upper().lstrip(":") == self.error_command.upper().lstrip(":"):
+            code, message = parse_error(response)
+            return code != 0, [(code, message)] if code != 0 else []
+        try:
+            return bool(int(response.strip()) & ESR_ERROR_MASK), []
+        except ValueError:
+            return True, []
+
+    def finish(self, raw: Iterable[Tuple[int, str]]) -> List[ErrorEntry]:
+        """
+        Attribute drained errors to the pending commands and reset the check.
+
+        Args:
+            raw: (code, message) pairs drained from the queue
+
+        Returns:
+            Attributed errors (also appended to self.errors)
+        """
+        batch = tuple(self.pending)
+        entries = [ErrorEntry(code, message, attribute_error(message, batch), batch)
+                   for code, message in raw]
+        self.errors.extend(entries)
+        self.pending.clear()
+        self.checks += 1
+        self._writes = 0
+        self._last_check = time.monotonic()
+        return entries
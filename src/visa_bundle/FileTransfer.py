@@ -0,0 +1,71 @@
+"""
+File Transfer - Streaming IEEE 488.2 block transfers to and from disk
+
+Instrument mass storage is read with 'MMEM:DATA? "<file>"' and written with
+'MMEM:DATA "<file>",#<block>'. VISA.download_file() and upload_file() move
+the block between the instrument and a local file in fixed-size chunks, so
+multi-hundred-MB screenshots, setups and traces never sit in memory whole.
+"""
+
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional
+
+# Bytes moved per read/write call
+FILE_CHUNK_SIZE: int = 1 << 20
+
+
+class TransferResult(NamedTuple):
+    """Outcome of one file transfer."""
+
+    path: str
+    size: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate in bytes per second."""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+def read_block_length(read: Callable[[int], bytes]) -> Optional[int]:
+    """
+    Read a block header from a response.
+
+    Args:
+        read: Function reading exactly the given number of bytes
+
+    Returns:
+        Data length of a definite-length block, None for an indefinite one
+        ('#0', ending at the message termination)
+
+    Raises:
+        ValueError: If the response does not start with a block header
+    """
+    start = read(2)
+    if len(start) < 2 or start[:1] != b"#" or not start[1:2].isdigit():
+        raise ValueError(f"Response is not an IEEE 488.2 block: {start!r}")
+    digits = int(start[1:2])
+    if digits == 0:
+        return None
+    return int(read(digits))
+
+
+def iter_file_chunks(file: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Read a file in chunks through one reused buffer.
+
+    Each chunk is only valid until the next one is requested.
+
+    Args:
+        file: File opened in binary mode
+        chunk_size: Bytes per chunk
+
+    Yields:
+        Views of the chunks read
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        count = file.readinto(buffer)
+        if not count:
+            return
+        yield view[:count]
@@ -0,0 +1,240 @@
+"""
+Pipeline - Overlapped acquisition and post-processing
+
+A capture loop that alternates query_binary() with CPU-heavy decoding or
+FFTs leaves the instrument idle while computing and the CPU idle while
+transferring. AcquisitionPipeline runs acquisition on an I/O thread and
+hands each capture to a process pool (or thread pool) running the
+processing stages, so the next transfer overlaps the previous capture's
+processing:
+
+    I/O thread:  wait for a free slot -> acquire -> submit to the pool
+    pool:        stage 1 -> stage 2 -> ...
+    caller:      results in acquisition order, freeing their slots
+
+The slots provide backpressure: acquisition pauses once max_pending
+captures are being processed or waiting to be consumed. Stages run in worker
+processes by default, so they must be picklable (module-level functions).
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .VISA import VISA
+
+# Marks the end of acquisition in the queue
+_DONE = object()
+
+
+def _run_stages(stages: Sequence[Callable[[Any], Any]], data: Any) -> Tuple[Any, List[float]]:
+    """Run the stages on one capture in a worker, timing each one."""
+    timings = []
+    for stage in stages:
+        start = time.perf_counter()
+        data = stage(data)
+        timings.append(time.perf_counter() - start)
+    return data, timings
+
+
+class AcquisitionPipeline:
+    """
+    Acquisition on an I/O thread feeding pooled processing stages.
+
+    Results are returned in acquisition order. stats() reports the time
+    spent per stage, in acquisition, blocked on backpressure and waiting
+    for results.
+    """
+
+    def __init__(self, instrument: VISA, command: str,
+                 stages: Sequence[Callable[[Any], Any]],
+                 max_pending: int = 4, workers: Optional[int] = None,
+                 executor: Union[str, Executor] = "process", delay_time: float = 0.0,
+                 acquire: Optional[Callable[[VISA], Any]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            instrument: Instrument to acquire from
+            command: Binary query fetching one capture (e.g. ':WAV:DATA?')
+            stages: Processing functions applied in order to each capture
+            max_pending: Captures acquired but not yet returned before
+                         acquisition pauses (backpressure)
+            workers: Pool size (None uses the executor default)
+            executor: 'process', 'thread' or an Executor to reuse
+            delay_time: Delay between write and read of each query_binary()
+            acquire: Optional function fetching one capture from the
+                     instrument instead of query_binary(command)
+
+        Raises:
+            ValueError: If max_pending is not positive or executor is unknown
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if isinstance(executor, str) and executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor '{executor}'")
+        self.instrument: VISA = instrument
+        self.command: str = command
+        self.stages: List[Callable[[Any], Any]] = list(stages)
+        self.max_pending: int = max_pending
+        self.workers: Optional[int] = workers
+        self.executor: Union[str, Executor] = executor
+        self.delay_time: float = delay_time
+        self._acquire: Callable[[VISA], Any] = acquire or (
+            lambda instrument: instrument.query_binary(command, delay_time))
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Clear the timing statistics."""
+        with self._stats_lock:
+            names = ["acquire"]
+            for index, stage in enumerate(self.stages):
+                name = getattr(stage, "__name__", "stage")
+                names.append(name if name not in names else f"{name}_{index}")
+            self._times: Dict[str, List[float]] = {name: [0, 0.0] for name in names}
+            self._backpressure: float = 0.0
+            self._result_wait: float = 0.0
+            self._elapsed: float = 0.0
+
+    def _record(self, name: str, seconds: float) -> None:
+        """Add one timing sample."""
+        with self._stats_lock:
+            entry = self._times[name]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def _create_executor(self) -> Tuple[Executor, bool]:
+        """Get the executor and whether this pipeline owns it."""
+        if not isinstance(self.executor, str):
+            return self.executor, False
+        if self.executor == "thread":
+            return ThreadPoolExecutor(self.workers, thread_name_prefix="visa-pipeline"), True
+        return ProcessPoolExecutor(self.workers), True
+
+    def results(self, count: Optional[int] = None) -> Iterator[Any]:
+        """
+        Acquire and process captures, yielding results in order.
+
+        Stopping the iteration early (break or close()) stops acquisition
+        and cancels pending processing.
+
+        Args:
+            count: Number of captures (None runs until the iteration stops)
+
+        Yields:
+            Output of the last stage for each capture
+
+        Raises:
+            Exception: The first acquisition or stage error
+        """
+        executor, owned = self._create_executor()
+        # Futures (or the acquisition error / _DONE) in acquisition order
+        pending: "queue.Queue[Any]" = queue.Queue()
+        slots = threading.Semaphore(self.max_pending)
+        stop = threading.Event()
+        stage_names = list(self._times)[1:]
+
+        def acquire_loop() -> None:
+            index = 0
+            try:
+                while count is None or index < count:
+                    # Backpressure: wait until a capture has been consumed
+                    blocked = time.perf_counter()
+                    while not slots.acquire(timeout=0.05):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    start = time.perf_counter()
+                    with self._stats_lock:
+                        self._backpressure += start - blocked
+
+                    data = self._acquire(self.instrument)
+                    self._record("acquire", time.perf_counter() - start)
+                    pending.put(executor.submit(_run_stages, self.stages, data))
+                    index += 1
+            except BaseException as error:  # Delivered to the consumer in order
+                pending.put(error)
+                return
+            pending.put(_DONE)
+
+        # The I/O thread runs in a copy of the caller's context (cancel tokens)
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(acquire_loop,),
+                                  name=f"visa-pipeline-{self.instrument.name}", daemon=True)
+        started = time.perf_counter()
+        thread.start()
+        try:
+            while True:
+                waiting = time.perf_counter()
+                item = pending.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                result, timings = item.result()
+                slots.release()
+                with self._stats_lock:
+                    self._result_wait += time.perf_counter() - waiting
+                for name, seconds in zip(stage_names, timings):
+                    self._record(name, seconds)
+                yield result
+        finally:
+            stop.set()
+            # Drop queued work so the I/O thread and the pool can finish
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, Future):
+                    item.cancel()
+            thread.join()
+            if owned:
+                executor.shutdown(wait=True, cancel_futures=True)
+            with self._stats_lock:
+                self._elapsed += time.perf_counter() - started
+
+    def run(self, count: int, on_result: Optional[Callable[[Any], None]] = None) -> List[Any]:
+        """
+        Acquire and process a number of captures.
+
+        Args:
+            count: Number of captures
+            on_result: Optional callback receiving each result in order; the
+                       results are then not collected
+
+        Returns:
+            Results in acquisition order (empty when on_result is given)
+        """
+        collected: List[Any] = []
+        deliver = on_result if on_result is not None else collected.append
+        for result in self.results(count):
+            deliver(result)
+        return collected
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pipeline timing statistics.
+
+        Returns:
+            'stages': per stage ('acquire' first) count, total seconds and mean
+            milliseconds; 'backpressure_s': time acquisition waited for queue
+            space; 'result_wait_s': time the caller waited for results;
+            'elapsed_s' and 'throughput' (captures per second)
+        """
+        with self._stats_lock:
+            stages = {name: {"count": count, "total_s": total,
+                             "mean_ms": total / count * 1000.0 if count else 0.0}
+                      for name, (count, total) in self._times.items()}
+            finished = self._times[list(self._times)[-1]][0]
+            return {
+                "stages": stages,
+                "backpressure_s": self._backpressure,
+                "result_wait_s": self._result_wait,
+                "elapsed_s": self._elapsed,
+                "throughput": finished / self._elapsed if self._elapsed else 0.0,
+            }
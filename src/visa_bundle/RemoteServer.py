@@ -0,0 +1,699 @@
+"""
+Remote Server - Expose a station's instruments to remote test controllers
+
+With Setting.IS_SERVER enabled, InstrumentServer serves the instruments of a
+VISAManager over TCP so that several test controllers can drive one rack PC.
+RemoteVISA is the client and offers the same API as VISA.
+
+The wire format is the broker protocol (see Broker) with instruments
+addressed by name:
+
+- Clients lease an instrument before using it. A lease is exclusive to one
+  client connection, is renewed by every operation and expires after its
+  lease time; leases are released when the client disconnects.
+- OP_BATCH carries several operations in one round trip and returns all of
+  their results.
+- The server listens on the loopback interface by default. Listening on a
+  network interface requires a shared token, which clients present with
+  OP_AUTH before any other request.
+- Binary query responses are streamed as STATUS_CHUNK frames while they
+  are read from the instrument, so large blocks are never buffered whole.
+"""
+
+import hmac
+import ipaddress
+import itertools
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from am_shared.logger import logger
+
+from . import Setting
+from .Broker import (OP_QUERY, OP_READ, OP_READ_RAW, OP_WRITE, OP_WRITE_RAW,
+                     REQUEST_HEADER, RESPONSE_HEADER, STATUS_CHUNK, STATUS_ERROR,
+                     STATUS_OK, BrokerClient, recv_exact, send_frame)
+from .VISA import VISA, VISAManager
+
+# Default TCP port of the instrument server
+DEFAULT_PORT: int = 5050
+
+# Remote-only opcodes
+OP_LEASE = 20
+OP_RELEASE = 21
+OP_BATCH = 22
+OP_QUERY_BINARY = 23
+OP_LIST = 24
+OP_QUERY_BYTES = 25
+OP_AUTH = 26
+
+# Size of streamed binary chunks
+STREAM_CHUNK_SIZE: int = 1 << 20
+
+_DOUBLE = struct.Struct("!d")
+_INT32 = struct.Struct("!i")
+_UINT32 = struct.Struct("!I")
+_BATCH_ITEM = struct.Struct("!BI")
+
+
+def encode_batch(items: List[Tuple[int, bytes]]) -> bytes:
+    """
+    Encode batch items as consecutive ``!BI`` headers and payloads.
+
+    Args:
+        items: List of (opcode or status, payload) pairs
+
+    Returns:
+        Encoded batch
+    """
+    return b"".join(_BATCH_ITEM.pack(code, len(payload)) + payload
+                    for code, payload in items)
+
+
+def decode_batch(data: bytes) -> List[Tuple[int, bytes]]:
+    """
+    Decode a batch encoded by encode_batch().
+
+    Args:
+        data: Encoded batch
+
+    Returns:
+        List of (opcode or status, payload) pairs
+    """
+    items: List[Tuple[int, bytes]] = []
+    offset = 0
+    while offset < len(data):
+        code, length = _BATCH_ITEM.unpack_from(data, offset)
+        offset += _BATCH_ITEM.size
+        items.append((code, data[offset:offset + length]))
+        offset += length
+    return items
+
+
+def is_loopback(host: str) -> bool:
+    """
+    Check whether a listen address only accepts local connections.
+
+    Args:
+        host: Host name or IP address
+
+    Returns:
+        True for loopback addresses and 'localhost'
+    """
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host.lower() == "localhost"
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    """Threading TCP server that can rebind its port right after a restart."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _Lease:
+    """Exclusive use of one instrument by one client connection."""
+
+    def __init__(self, lease_id: int, name: str, client: int, duration: float):
+        self.lease_id: int = lease_id
+        self.name: str = name
+        self.client: int = client
+        self.duration: float = duration
+        self.expires: float = time.monotonic() + duration
+        self.lock = threading.Lock()
+
+    def renew(self) -> None:
+        self.expires = time.monotonic() + self.duration
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() > self.expires
+
+
+class InstrumentServer:
+    """
+    TCP server exposing a VISAManager's instruments to remote clients.
+
+    Only runs with Setting.IS_SERVER enabled.
+    """
+
+    def __init__(self, manager: VISAManager, host: str = "127.0.0.1",
+                 port: int = DEFAULT_PORT, token: Optional[str] = None):
+        """
+        Initialize the server.
+
+        Args:
+            manager: Manager whose instruments are exposed by name
+            host: Interface to listen on (loopback only by default)
+            port: TCP port to listen on (0 picks a free port)
+            token: Shared secret clients must present; required to listen
+                   on a non-loopback interface
+        """
+        self.manager: VISAManager = manager
+        self.host: str = host
+        self.port: int = port
+        self.token: Optional[str] = token
+        self._leases: Dict[int, _Lease] = {}
+        self._by_name: Dict[str, _Lease] = {}
+        self._next_lease: int = 1
+        self._next_client = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server: Optional[_TCPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self._operations: Dict[int, Callable[[VISA, bytes], bytes]] = {
+            OP_WRITE: lambda instrument, payload: self._void(
+                instrument.write(payload.decode("utf-8"))),
+            OP_QUERY: lambda instrument, payload: instrument.query(
+                payload[_DOUBLE.size:].decode("utf-8"),
+                self._optional_float(payload)).encode("utf-8"),
+            OP_READ: lambda instrument, payload: instrument.read(
+                self._optional_count(payload)).encode("utf-8"),
+            OP_READ_RAW: lambda instrument, payload: instrument.read_binary(),
+            OP_WRITE_RAW: lambda instrument, payload: self._void(
+                instrument.write_binary(payload)),
+            OP_QUERY_BINARY: lambda instrument, payload: instrument.query_binary(
+                payload[_DOUBLE.size:].decode("utf-8"), _DOUBLE.unpack_from(payload)[0]),
+            OP_QUERY_BYTES: lambda instrument, payload: instrument.query_bytes(
+                payload[_DOUBLE.size:].decode("utf-8"), self._optional_float(payload)),
+        }
+
+    @staticmethod
+    def _void(_: Any) -> bytes:
+        """Discard an operation result."""
+        return b""
+
+    @staticmethod
+    def _optional_float(payload: bytes) -> Optional[float]:
+        """Decode a leading float where negative means None."""
+        value = _DOUBLE.unpack_from(payload)[0]
+        return None if value < 0 else value
+
+    @staticmethod
+    def _optional_count(payload: bytes) -> Optional[int]:
+        """Decode an optional byte count where negative means None."""
+        count = _INT32.unpack_from(payload)[0] if payload else -1
+        return None if count < 0 else count
+
+    def _lease(self, client: int, payload: bytes) -> bytes:
+        """Grant (or re-grant) a lease on an instrument to a client."""
+        duration = _DOUBLE.unpack_from(payload)[0]
+        name = payload[_DOUBLE.size:].decode("utf-8")
+        if self.manager.get_instrument(name) is None:
+            raise Exception(f"VISA Remote Error: unknown instrument '{name}'")
+
+        with self._lock:
+            lease = self._by_name.get(name)
+            if lease is not None and lease.client != client and not lease.expired:
+                raise Exception(f"VISA Remote Error: instrument '{name}' is leased")
+            if lease is not None:
+                self._leases.pop(lease.lease_id, None)
+            lease = _Lease(self._next_lease, name, client, duration)
+            self._next_lease += 1
+            self._leases[lease.lease_id] = lease
+            self._by_name[name] = lease
+        return _UINT32.pack(lease.lease_id)
+
+    def _release(self, lease_id: int) -> bytes:
+        """Release a lease."""
+        with self._lock:
+            lease = self._leases.pop(lease_id, None)
+            if lease is not None and self._by_name.get(lease.name) is lease:
+                del self._by_name[lease.name]
+        return b""
+
+    def _checked_lease(self, client: int, lease_id: int) -> _Lease:
+        """Get a client's valid lease and renew it."""
+        with self._lock:
+            lease = self._leases.get(lease_id)
+        if lease is None or lease.client != client:
+            raise Exception(f"VISA Remote Error: invalid lease {lease_id}")
+        if lease.expired and self._by_name.get(lease.name) is not lease:
+            raise Exception(f"VISA Remote Error: lease {lease_id} expired")
+        lease.renew()
+        return lease
+
+    def _instrument(self, lease: _Lease) -> VISA:
+        """Get the instrument a lease refers to."""
+        instrument = self.manager.get_instrument(lease.name)
+        if instrument is None:
+            raise Exception(f"VISA Remote Error: unknown instrument '{lease.name}'")
+        return instrument
+
+    def _operate(self, lease: _Lease, opcode: int, payload: bytes) -> bytes:
+        """Run one instrument operation under a lease."""
+        operation = self._operations.get(opcode)
+        if operation is None:
+            raise Exception(f"VISA Remote Error: unknown opcode {opcode}")
+        return operation(self._instrument(lease), payload)
+
+    def _stream_binary(self, sock: socket.socket, request_id: int, lease: _Lease,
+                       payload: bytes) -> bytes:
+        """
+        Run a binary query, sending STATUS_CHUNK frames while it is read.
+
+        Returns:
+            The last, partial chunk (sent as the final frame)
+        """
+        pending = bytearray()
+
+        def on_chunk(chunk: bytes) -> None:
+            pending.extend(chunk)
+            if len(pending) >= STREAM_CHUNK_SIZE:
+                send_frame(sock, RESPONSE_HEADER.pack(request_id, STATUS_CHUNK, len(pending)),
+                           pending)
+                pending.clear()
+
+        self._instrument(lease).query_binary_chunks(
+            payload[_DOUBLE.size:].decode("utf-8"), on_chunk,
+            _DOUBLE.unpack_from(payload)[0], STREAM_CHUNK_SIZE)
+        return bytes(pending)
+
+    def _batch(self, lease: _Lease, payload: bytes) -> bytes:
+        """Run a batch of operations; later items still run if one fails."""
+        results: List[Tuple[int, bytes]] = []
+        for opcode, item in decode_batch(payload):
+            try:
+                results.append((STATUS_OK, self._operate(lease, opcode, item)))
+            except Exception as error:
+                results.append((STATUS_ERROR, str(error).encode("utf-8")))
+        return encode_batch(results)
+
+    def _serve_connection(self, sock: socket.socket) -> None:
+        """Execute a client's requests in order until it disconnects."""
+        with self._lock:
+            client = next(self._next_client)
+        authenticated = self.token is None
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                header = recv_exact(sock, REQUEST_HEADER.size)
+                request_id, opcode, lease_id, length = REQUEST_HEADER.unpack(header)
+                payload = recv_exact(sock, length) if length else b""
+                try:
+                    if opcode == OP_AUTH:
+                        if self.token is not None and not hmac.compare_digest(
+                                payload, self.token.encode("utf-8")):
+                            raise Exception("VISA Remote Error: invalid token")
+                        authenticated = True
+                        result = b""
+                    elif not authenticated:
+                        raise Exception("VISA Remote Error: authentication required")
+                    elif opcode == OP_LEASE:
+                        result = self._lease(client, payload)
+                    elif opcode == OP_RELEASE:
+                        self._checked_lease(client, lease_id)
+                        result = self._release(lease_id)
+                    elif opcode == OP_LIST:
+                        result = "\n".join(self.manager.list_instruments()).encode("utf-8")
+                    elif opcode == OP_QUERY_BINARY:
+                        lease = self._checked_lease(client, lease_id)
+                        with lease.lock:
+                            result = self._stream_binary(sock, request_id, lease, payload)
+                    else:
+                        lease = self._checked_lease(client, lease_id)
+                        with lease.lock:
+                            result = (self._batch(lease, payload) if opcode == OP_BATCH
+                                      else self._operate(lease, opcode, payload))
+                    status = STATUS_OK
+                except Exception as error:
+                    result = (str(error) or type(error).__name__).encode("utf-8")
+                    status = STATUS_ERROR
+
+                # Stream other large responses in chunks (no copies: memoryview)
+                view = memoryview(result)
+                while status == STATUS_OK and len(view) > STREAM_CHUNK_SIZE:
+                    chunk = view[:STREAM_CHUNK_SIZE]
+                    sock.sendall(RESPONSE_HEADER.pack(request_id, STATUS_CHUNK, len(chunk)))
+                    sock.sendall(chunk)
+                    view = view[STREAM_CHUNK_SIZE:]
+                send_frame(sock, RESPONSE_HEADER.pack(request_id, status, len(view)), view)
+        except (ConnectionError, OSError):
+            pass  # Client went away
+        finally:
+            with self._lock:
+                owned = [lease.lease_id for lease in self._leases.values()
+                         if lease.client == client]
+            for lease_id in owned:
+                self._release(lease_id)
+
+    def start(self) -> None:
+        """
+        Start serving in a background thread.
+
+        Raises:
+            Exception: If Setting.IS_SERVER is not enabled, or if listening
+                       on a network interface without a token
+        """
+        if not Setting.IS_SERVER:
+            raise Exception("VISA Remote Error: Setting.IS_SERVER is not enabled")
+        if self.token is None and not is_loopback(self.host):
+            raise Exception(f"VISA Remote Error: listening on {self.host} requires a token")
+
+        server = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                server._serve_connection(self.request)
+
+        self._server = _TCPServer((self.host, self.port), _Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="visa-remote-server", daemon=True)
+        self._thread.start()
+        logger.info(f"VISA Remote Server listening on {self.host}:{self.port}")
+
+    def serve_forever(self) -> None:
+        """Start serving and block until stop() is called."""
+        self.start()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stop(self) -> None:
+        """Stop serving and drop all leases."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            self._leases.clear()
+            self._by_name.clear()
+
+
+class RemoteVISA:
+    """
+    Client for an instrument exposed by an InstrumentServer.
+
+    Offers the message-based subset of the VISA API: open/ensure_open,
+    close/release, query, query_bytes, write, read, read_binary,
+    write_binary and query_binary, plus execute_batch(). The instrument is
+    leased on open() and the lease is released on close().
+    """
+
+    def __init__(self, name: str, host: str, port: int = DEFAULT_PORT,
+                 lease_time: float = 60.0, token: Optional[str] = None):
+        """
+        Connect to a remote instrument and lease it.
+
+        Args:
+            name: Instrument name on the server
+            host: Server host
+            port: Server TCP port
+            lease_time: Lease duration in seconds (renewed by every operation)
+            token: Shared secret of a server started with a token
+        """
+        self.name: str = name
+        self.address: str = f"{host}:{port}/{name}"
+        self.host: str = host
+        self.port: int = port
+        self.lease_time: float = lease_time
+        self.token: Optional[str] = token
+        self.client: Optional[BrokerClient] = None
+        self.lease_id: int = 0
+
+        self.open()
+
+    def open(self) -> None:
+        """
+        Connect to the server and lease the instrument.
+
+        Raises:
+            Exception: If the server is unreachable or the instrument is leased
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"Open Remote VISA: {self.name}")
+
+        if not Setting.VISA_Send_Enable or self.lease_id:
+            return
+
+        try:
+            sock = socket.create_connection((self.host, self.port))
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.client = BrokerClient(f"{self.host}:{self.port}", sock)
+            if self.token is not None:
+                self.client.call(OP_AUTH, 0, self.token.encode("utf-8"))
+            payload = _DOUBLE.pack(self.lease_time) + self.name.encode("utf-8")
+            self.lease_id = _UINT32.unpack(self.client.call(OP_LEASE, 0, payload))[0]
+        except Exception as error:
+            if self.client is not None:
+                self.client.close()
+                self.client = None
+            raise Exception(f"VISA Open Error: {self.name}, address: {self.address}, {error}")
+
+    def ensure_open(self) -> None:
+        """
+        Lease the instrument if it is not leased yet.
+
+        Raises:
+            Exception: If the server is unreachable or the instrument is leased
+        """
+        self.open()
+
+    def close(self) -> None:
+        """Release the lease and disconnect."""
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"Close Remote VISA: {self.name}")
+
+        if self.client is not None:
+            try:
+                self.client.call(OP_RELEASE, self.lease_id)
+            except Exception:
+                pass  # Ignore errors during close
+            self.client.close()
+        self.client = None
+        self.lease_id = 0
+
+    def release(self) -> None:
+        """
+        Give up this client's use of the instrument.
+
+        The remote session stays owned by the server; releasing the lease
+        lets other clients use the instrument.
+        """
+        self.close()
+
+    def __enter__(self) -> "RemoteVISA":
+        """Return the instance for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        """Close the remote instrument when leaving the context."""
+        self.close()
+
+    def _call(self, opcode: int, payload: bytes, error: str) -> bytes:
+        """Run one leased operation, mapping failures to VISA-style errors."""
+        if self.client is None:
+            raise Exception("not MessageBasedResource")
+        try:
+            return self.client.call(opcode, self.lease_id, payload)
+        except Exception as remote_error:
+            logger.error(f"{error}: {self.name}, address: {self.address}, {remote_error}",
+                         raise_error=False)
+            raise Exception(error)
+
+    def query(self, command: str, delay_time: Optional[float] = None) -> str:
+        """
+        Send a command and read the response.
+
+        Args:
+            command: SCPI command string to send
+            delay_time: Optional delay before reading response (seconds)
+
+        Returns:
+            Response string from the instrument
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+        if not Setting.VISA_Send_Enable:
+            return "0"
+        payload = _DOUBLE.pack(-1.0 if delay_time is None else delay_time)
+        response = self._call(OP_QUERY, payload + command.encode("utf-8"),
+                              "VISA Query Error").decode("utf-8")
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI RX: {response}")
+        return response
+
+    def query_bytes(self, command: str, delay_time: Optional[float] = None) -> bytes:
+        """
+        Send a command and read the raw response bytes.
+
+        Args:
+            command: SCPI command string to send
+            delay_time: Optional delay before reading response (seconds)
+
+        Returns:
+            Response bytes without the termination
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+        if not Setting.VISA_Send_Enable:
+            return b"0"
+        payload = _DOUBLE.pack(-1.0 if delay_time is None else delay_time)
+        return self._call(OP_QUERY_BYTES, payload + command.encode("utf-8"),
+                          "VISA Query Error")
+
+    def write(self, command: str) -> None:
+        """
+        Send a command to the instrument.
+
+        Args:
+            command: SCPI command string to send
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+        if not Setting.VISA_Send_Enable:
+            return
+        self._call(OP_WRITE, command.encode("utf-8"), "VISA Write Error")
+
+    def read(self, count: Optional[int] = None) -> str:
+        """
+        Read data from the instrument.
+
+        Args:
+            count: Number of bytes to read
+
+        Returns:
+            Response string from the instrument
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Read")
+        if not Setting.VISA_Send_Enable:
+            return "0"
+        payload = _INT32.pack(-1 if count is None else count)
+        return self._call(OP_READ, payload, "VISA Read Error").decode("utf-8")
+
+    def read_binary(self) -> bytes:
+        """
+        Read binary data from the instrument.
+
+        Returns:
+            Binary response data from the instrument
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Read Binary")
+        if not Setting.VISA_Send_Enable:
+            return b""
+        return self._call(OP_READ_RAW, b"", "VISA Read Binary Error")
+
+    def write_binary(self, command: bytes) -> None:
+        """
+        Send binary data to the instrument.
+
+        Args:
+            command: Binary command data to send
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Binary TX: {len(command)} bytes")
+        if not Setting.VISA_Send_Enable:
+            return
+        self._call(OP_WRITE_RAW, bytes(command), "VISA Write Binary Error")
+
+    def query_binary(self, command: str, delay_time: float = 0.1,
+                     on_chunk: Optional[Callable[[bytes], None]] = None) -> Union[bytes, int]:
+        """
+        Send a text command and read the binary response, streamed in chunks.
+
+        Args:
+            command: Text command to send
+            delay_time: Delay between write and read operations (seconds)
+            on_chunk: Optional callback receiving every chunk of the response
+                      as it arrives, the last one included (the response is
+                      then not returned)
+
+        Returns:
+            Binary response data, or the total number of bytes passed to
+            on_chunk when it is given
+        """
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+        if not Setting.VISA_Send_Enable:
+            if on_chunk is None:
+                return b"0"
+            on_chunk(b"0")
+            return 1
+        if self.client is None:
+            raise Exception("not MessageBasedResource")
+        payload = _DOUBLE.pack(delay_time) + command.encode("utf-8")
+        total = 0
+
+        def deliver(chunk: bytes) -> None:
+            nonlocal total
+            total += len(chunk)
+            on_chunk(chunk)
+
+        try:
+            if on_chunk is None:
+                return self.client.submit(OP_QUERY_BINARY, self.lease_id, payload).result()
+            # Streamed chunks arrive on the reader thread, the final frame here
+            rest = self.client.submit(OP_QUERY_BINARY, self.lease_id, payload,
+                                      on_chunk=deliver).result()
+            if rest:
+                deliver(rest)
+            return total
+        except Exception as error:
+            logger.error(f"VISA Query Binary Error: {self.name}, {error}", raise_error=False)
+            raise Exception("VISA Query Binary Error")
+
+    def execute_batch(self, operations: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Run several text operations in one round trip.
+
+        Args:
+            operations: List of ("write" | "query", command) pairs
+
+        Returns:
+            Query responses (None for writes), in order
+
+        Raises:
+            Exception: If any operation in the batch failed
+        """
+        if not Setting.VISA_Send_Enable:
+            return [None if kind == "write" else "0" for kind, _ in operations]
+
+        items: List[Tuple[int, bytes]] = []
+        for kind, command in operations:
+            if kind == "write":
+                items.append((OP_WRITE, command.encode("utf-8")))
+            elif kind == "query":
+                items.append((OP_QUERY, _DOUBLE.pack(-1.0) + command.encode("utf-8")))
+            else:
+                raise ValueError(f"Unknown batch operation '{kind}'")
+
+        results: List[Optional[str]] = []
+        response = self._call(OP_BATCH, encode_batch(items), "VISA Batch Error")
+        for (kind, command), (status, payload) in zip(operations, decode_batch(response)):
+            if status != STATUS_OK:
+                logger.error(f"VISA Batch Error: {self.name}, command: {command}, "
+                             f"{payload.decode('utf-8', 'replace')}", raise_error=False)
+                raise Exception("VISA Batch Error")
+            results.append(None if kind == "write" else payload.decode("utf-8"))
+        return results
+
+    @staticmethod
+    def list_remote_instruments(host: str, port: int = DEFAULT_PORT,
+                                token: Optional[str] = None) -> List[str]:
+        """
+        List the instrument names exposed by a server.
+
+        Args:
+            host: Server host
+            port: Server TCP port
+            token: Shared secret of a server started with a token
+
+        Returns:
+            List of instrument names
+        """
+        sock = socket.create_connection((host, port))
+        client = BrokerClient(f"{host}:{port}", sock)
+        try:
+            if token is not None:
+                client.call(OP_AUTH, 0, token.encode("utf-8"))
+            names = client.call(OP_LIST).decode("utf-8")
+        finally:
+            client.close()
+        return [name for name in names.split("\n") if name]
@@ -0,0 +1,183 @@
+"""
+Service Request - Event-driven completion waits on the status byte
+
+Instead of sleep-and-poll loops around '*OPC?' or '*STB?', an instrument
+is set up to assert SRQ when an operation completes (e.g.
+'*ESE 1;*SRE 32;INIT;*OPC') and VISA.wait_for_srq() blocks until its status
+byte matches a mask. Backends with VISA events (GPIB, USBTMC, VXI-11)
+wait on the service request event queue, so the wait wakes as soon as SRQ
+is asserted; other transports poll the status byte at a short interval.
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+import pyvisa
+from am_shared.logger import logger
+
+from .Cancellation import QUERIED_STB_TYPES, VISAInterruptError
+
+# Status byte bits (IEEE 488.2)
+STB_MAV: int = 0x10  # Message available
+STB_ESB: int = 0x20  # Event status bit (a bit enabled by *ESE is set)
+STB_RQS: int = 0x40  # Request service / master summary status
+
+# Longest single wait on the event queue, so interrupts are seen (seconds)
+SRQ_WAIT_SLICE: float = 0.1
+
+# Status byte polling interval when the backend has no SRQ events (seconds)
+SRQ_POLL_INTERVAL: float = 0.005
+
+_SERVICE_REQUEST = pyvisa.constants.EventType.service_request
+
+
+class SRQTimeoutError(Exception):
+    """Raised when the status byte does not match within the timeout."""
+
+
+def enable_srq_events(handle: Any) -> bool:
+    """
+    Enable queueing of service request events on a resource.
+
+    Args:
+        handle: Open resource
+
+    Returns:
+        True if the backend queues SRQ events, False if it has to be polled
+    """
+    if not hasattr(handle, "enable_event") or not hasattr(handle, "wait_on_event"):
+        return False
+    try:
+        handle.enable_event(_SERVICE_REQUEST, pyvisa.constants.EventMechanism.queue)
+        return True
+    except Exception:
+        return False  # No SRQ events on this interface (e.g. raw sockets)
+
+
+def has_serial_poll(handle: Any) -> bool:
+    """
+    Whether the status byte can be read without a query.
+
+    GPIB, USBTMC and VXI-11/HiSLIP instruments report it out of band (serial
+    poll). Raw sockets, serial ports, the native socket transport and broker
+    sessions can only send '*STB?', whose reply mixes with the responses of
+    other operations on the session.
+
+    Args:
+        handle: Open resource
+
+    Returns:
+        True if read_status_byte() does not go through the message stream
+    """
+    return hasattr(handle, "read_stb") and not isinstance(handle, QUERIED_STB_TYPES)
+
+
+def read_status_byte(handle: Any) -> int:
+    """
+    Read the status byte (serial poll, or '*STB?' without one).
+
+    Args:
+        handle: Open resource
+
+    Returns:
+        Status byte
+    """
+    read_stb = getattr(handle, "read_stb", None)
+    if read_stb is not None:
+        return int(read_stb())
+    return int(handle.query("*STB?"))
+
+
+def wait_srq_event(handle: Any, seconds: float) -> bool:
+    """
+    Wait for one queued service request event.
+
+    Args:
+        handle: Resource with SRQ events enabled
+        seconds: Maximum wait
+
+    Returns:
+        True if an event arrived, False on timeout
+    """
+    try:
+        handle.wait_on_event(_SERVICE_REQUEST, max(1, int(seconds * 1000)))
+        return True
+    except pyvisa.errors.VisaIOError as error:
+        if error.error_code == pyvisa.constants.StatusCode.error_timeout:
+            return False
+        raise
+
+
+class SRQListener:
+    """
+    Background thread invoking a callback on every matching service request.
+
+    Created by VISA.on_srq(); stop() ends it. The callback receives the
+    status byte and runs on the listener thread.
+    """
+
+    def __init__(self, instrument: Any, callback: Callable[[int], None], mask: int,
+                 poll_interval: float):
+        """
+        Initialize and start the listener.
+
+        Args:
+            instrument: VISA instance to watch
+            callback: Called with the status byte of each service request
+            mask: Status byte bits that count as a service request
+            poll_interval: Polling interval without SRQ events (seconds)
+        """
+        self.instrument = instrument
+        self.callback: Callable[[int], None] = callback
+        self.mask: int = mask
+        self.poll_interval: float = poll_interval
+        # Error that stopped the listener, if any
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"srq-{instrument.name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        """Whether the listener thread is still running."""
+        return self._thread.is_alive()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the listener.
+
+        Args:
+            timeout: Maximum wait for the thread to finish (seconds)
+        """
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Wait for service requests until stopped."""
+        while not self._stop.is_set():
+            try:
+                status = self.instrument.wait_for_srq(
+                    self.mask, SRQ_WAIT_SLICE * 2, self.poll_interval)
+            except SRQTimeoutError:
+                continue
+            except VISAInterruptError:
+                # Operator abort: keep listening once it is cleared
+                self._stop.wait(SRQ_WAIT_SLICE)
+                continue
+            except Exception as error:
+                if self._stop.is_set():
+                    return  # Instrument closed while stopping
+                self.error = error
+                logger.error(f"VISA SRQ Listener Error: {self.instrument.name}",
+                             raise_error=False)
+                return
+
+            if self._stop.is_set():
+                return
+            try:
+                self.callback(status)
+            except Exception:
+                logger.error(f"VISA SRQ Callback Error: {self.instrument.name}",
+                             raise_error=False)
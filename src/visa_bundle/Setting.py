@@ -11,3 +11,59 @@ if "VISA_Send_Enable" not in locals():
     IS_SERVER: bool = False
     
     IS_INTERRUPT: bool = False
+
+    # 別名快取檔案路徑（空字串表示使用預設位置 ~/.visa_bundle/alias_cache.json）
+    VISA_Alias_Cache_Path: str = ""
+
+    # 連線池最大 session 數（0 表示不限制）
+    VISA_Pool_Max_Sessions: int = 0
+
+    # 每個介面（例如 GPIB0、USB0）最大 session 數（0 表示不限制）
+    VISA_Pool_Max_Per_Interface: int = 0
+
+    # 閒置多久（秒）自動關閉 session，下次使用時透明重新開啟（0 表示停用）
+    VISA_Pool_Idle_Timeout: float = 0.0
+
+    # 偵錯用：記錄未 close() 即被回收的 VISA 物件（含建立時的呼叫堆疊）
+    VISA_Leak_Detect: bool = False
+
+    # 依匯流排（GPIB0、USB0…）序列化傳輸，不同匯流排與 LAN 儀器可平行傳輸
+    VISA_Bus_Schedule_Enable: bool = False
+
+    # 本機連線代理（broker）的 Unix domain socket 路徑；設定後所有 VISA 操作經由代理程序
+    VISA_Broker_Path: str = ""
+
+    # 等待回應時以此秒數為上限分段輪詢，使 IS_INTERRUPT 能在一段內中止（0 表示停用）
+    VISA_Interrupt_Slice: float = 0.0
+
+    # 設定變更通知的回呼函式 listener(name, value)
+    _listeners: list = []
+
+
+import sys as _sys
+import types as _types
+
+
+def add_listener(listener) -> None:
+    """註冊設定變更通知：之後每次 Setting.xxx = value 都會呼叫 listener(name, value)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener) -> None:
+    """取消設定變更通知"""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class _NotifyingModule(_types.ModuleType):
+    """模組屬性被指定時通知所有 listener（取代直接改寫模組屬性）"""
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            for listener in list(_listeners):
+                listener(name, value)
+
+
+_sys.modules[__name__].__class__ = _NotifyingModule
@@ -0,0 +1,277 @@
+"""
+Socket Transport - Native raw TCP transport for TCPIP::host::port::SOCKET
+
+LAN instruments listening on a raw SCPI port (usually 5025) do not need the
+VISA library: SocketResource talks to them over a plain TCP socket with
+TCP_NODELAY, a reusable receive buffer, termination-character scanning and
+IEEE 488.2 definite-length block framing. It implements the subset of the
+pyvisa message-based resource API used by VISA and is selected per instance
+with VISA(name, address, transport="socket").
+"""
+
+import select
+import socket
+import time
+from typing import Optional, Tuple
+
+from . import ConnectionRegistry as _registry
+
+# Size of the reusable receive scratch buffer
+RECEIVE_CHUNK_SIZE: int = 65536
+
+# Default raw SCPI port when the address omits it
+DEFAULT_SOCKET_PORT: int = 5025
+
+
+def parse_socket_address(address: str) -> Tuple[str, int]:
+    """
+    Parse a raw socket resource address.
+
+    Args:
+        address: Resource address such as 'TCPIP0::192.168.1.10::5025::SOCKET'
+
+    Returns:
+        (host, port) tuple
+
+    Raises:
+        ValueError: If the address is not a TCPIP SOCKET resource
+    """
+    parts = address.split("::")
+    if (len(parts) not in (3, 4) or not parts[0].upper().startswith("TCPIP")
+            or parts[-1].upper() != "SOCKET"):
+        raise ValueError(f"Not a TCPIP SOCKET resource: {address}")
+    port = int(parts[2]) if len(parts) == 4 else DEFAULT_SOCKET_PORT
+    return parts[1], port
+
+
+class SocketResource:
+    """
+    Message-based resource over a raw TCP socket.
+
+    Received data accumulates in one bytearray that is scanned for the read
+    termination; complete messages are sliced off the front so no per-read
+    buffers are allocated. Binary responses starting with an IEEE 488.2
+    definite-length block header ('#<n><length>') are framed by length, so
+    termination characters inside the block are not mistaken for the end.
+    """
+
+    # write_raw() sends memoryviews without converting them to bytes
+    accepts_buffers: bool = True
+
+    def __init__(self, sock: socket.socket, address: str):
+        """
+        Initialize the resource on a connected socket.
+
+        Args:
+            sock: Connected TCP socket
+            address: VISA resource address
+        """
+        self.sock: socket.socket = sock
+        self.resource_name: str = address
+        self.read_termination: str = "\n"
+        self.write_termination: str = "\n"
+        self._timeout: Optional[float] = None
+        self._rx = bytearray()
+        self._scratch = bytearray(RECEIVE_CHUNK_SIZE)
+        self._scratch_view = memoryview(self._scratch)
+        self.timeout = 2000
+
+    @classmethod
+    def open(cls, address: str, timeout: Optional[float] = 2000) -> "SocketResource":
+        """
+        Connect to a raw socket resource.
+
+        Args:
+            address: Resource address such as 'TCPIP0::host::5025::SOCKET'
+            timeout: Connect and I/O timeout in milliseconds (None for infinite)
+
+        Returns:
+            Connected resource
+        """
+        host, port = parse_socket_address(address)
+        sock = socket.create_connection(
+            (host, port), timeout=None if timeout is None else timeout / 1000.0)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        resource = cls(sock, address)
+        resource.timeout = timeout
+        return resource
+
+    def _fill(self) -> None:
+        """Receive more data into the buffer."""
+        received = self.sock.recv_into(self._scratch_view)
+        if not received:
+            raise ConnectionError(f"Connection closed by {self.resource_name}")
+        self._rx += self._scratch_view[:received]
+
+    def _fill_available(self) -> bool:
+        """Receive more data only if some has already arrived; never waits."""
+        if not select.select([self.sock], [], [], 0)[0]:
+            return False
+        self._fill()
+        return True
+
+    def _take(self, count: int) -> bytes:
+        """Remove and return the first count buffered bytes."""
+        data = bytes(self._rx[:count])
+        del self._rx[:count]
+        return data
+
+    def _read_until_termination(self) -> bytes:
+        """Read one message including its termination."""
+        termination = self.read_termination.encode("ascii")
+        if not termination:
+            # No termination configured: return whatever arrives next
+            if not self._rx:
+                self._fill()
+            return self._take(len(self._rx))
+
+        start = 0
+        while True:
+            index = self._rx.find(termination, start)
+            if index >= 0:
+                return self._take(index + len(termination))
+            # Rescan only the tail that could hold a split termination
+            start = max(0, len(self._rx) - len(termination) + 1)
+            self._fill()
+
+    def _block_length(self) -> Optional[int]:
+        """
+        Total length of a definite-length block at the buffer front.
+
+        Returns:
+            Header plus data length, or None if the buffer does not start
+            with a definite-length block header
+        """
+        if not self._rx:
+            self._fill()
+        if self._rx[0:1] != b"#":
+            return None
+        while len(self._rx) < 2:
+            self._fill()
+        if not chr(self._rx[1]).isdigit():
+            return None
+        digits = self._rx[1] - ord("0")
+        if digits == 0:
+            return None  # Indefinite-length block ends at the termination
+        while len(self._rx) < 2 + digits:
+            self._fill()
+        return 2 + digits + int(self._rx[2:2 + digits])
+
+    def read_raw(self) -> bytes:
+        """
+        Read one raw message including its termination.
+
+        Returns:
+            Message bytes (a full IEEE block and its termination, if any)
+        """
+        length = self._block_length()
+        if length is None:
+            return self._read_until_termination()
+
+        while len(self._rx) < length:
+            self._fill()
+        # A termination after the block is optional; only take one already received
+        termination = self.read_termination.encode("ascii")
+        while len(self._rx) < length + len(termination) and self._fill_available():
+            pass
+        if termination and self._rx[length:length + len(termination)] == termination:
+            length += len(termination)
+        return self._take(length)
+
+    def read(self) -> str:
+        """Read one message and strip its termination."""
+        message = self._read_until_termination().decode("utf-8")
+        if self.read_termination and message.endswith(self.read_termination):
+            message = message[:-len(self.read_termination)]
+        return message
+
+    def read_bytes(self, count: int, break_on_termchar: bool = False) -> bytes:
+        """Read count bytes (fewer if break_on_termchar and a termination arrives)."""
+        termination = self.read_termination.encode("ascii") if break_on_termchar else b""
+        while True:
+            if termination:
+                index = self._rx.find(termination, 0, count)
+                if index >= 0:
+                    return self._take(index + len(termination))
+            if len(self._rx) >= count:
+                return self._take(count)
+            self._fill()
+
+    def read_pending(self, count: int) -> bytes:
+        """Read up to count bytes that have already arrived, without waiting."""
+        while len(self._rx) < count and self._fill_available():
+            pass
+        return self._take(min(count, len(self._rx)))
+
+    @property
+    def bytes_in_buffer(self) -> int:
+        """Number of received bytes waiting to be read, without waiting."""
+        self._fill_available()
+        return len(self._rx)
+
+    def read_into(self, view: memoryview) -> int:
+        """
+        Read up to len(view) bytes straight into a caller's buffer.
+
+        Buffered data is copied first; otherwise the socket receives into
+        view directly, without an intermediate bytes object.
+
+        Returns:
+            Number of bytes read (at least one)
+        """
+        if self._rx:
+            count = min(len(view), len(self._rx))
+            with memoryview(self._rx) as received:
+                view[:count] = received[:count]
+            del self._rx[:count]
+            return count
+        received = self.sock.recv_into(view)
+        if not received:
+            raise ConnectionError(f"Connection closed by {self.resource_name}")
+        return received
+
+    def write(self, command: str) -> None:
+        """Write a command followed by the write termination."""
+        self.sock.sendall((command + self.write_termination).encode("utf-8"))
+
+    def write_raw(self, message: bytes) -> None:
+        """Write raw bytes."""
+        self.sock.sendall(message)
+
+    def query(self, command: str, delay: Optional[float] = None) -> str:
+        """Write a command and read the response."""
+        self.write(command)
+        if delay:
+            time.sleep(delay)
+        return self.read()
+
+    def flush(self, mask: int) -> None:
+        """Discard buffered and pending received data (all masks)."""
+        self._rx.clear()
+        while select.select([self.sock], [], [], 0)[0]:
+            if not self.sock.recv_into(self._scratch_view):
+                break
+
+    def clear(self) -> None:
+        """Raw sockets have no device clear; discard received data instead."""
+        self.flush(0)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """I/O timeout in milliseconds (None for infinite)."""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Optional[float]) -> None:
+        self.sock.settimeout(None if value is None else value / 1000.0)
+        self._timeout = value
+
+    def close(self) -> None:
+        """Close the socket."""
+        try:
+            self.sock.close()
+        except OSError:
+            pass  # Already closed
+
+
+_registry.register_message_based_type(SocketResource)
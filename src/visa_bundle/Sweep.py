@@ -0,0 +1,254 @@
+"""
+Sweep - Declarative set/measure sweeps over a VISAManager's instruments
+
+A sweep is described by axes (setpoints written to source instruments) and
+measurements (queries on any instrument) instead of nested write/sleep/query
+loops. Per sweep point the engine:
+
+1. writes only the axes whose value changed, back to back, so their settling
+   times overlap (one wait for the slowest instead of the sum);
+2. triggers each measured instrument's query as soon as the axes it waits
+   for have settled, and reads settled instruments while other axes are
+   still settling, so measurements overlap with settling and with each other;
+3. collects each point into a row of a NumPy structured array.
+
+Axes with a list command load their whole value list once (again whenever
+the axis wraps around) and then only send a short step command (e.g. '*TRG')
+per point.
+"""
+
+import collections
+import itertools
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .Cancellation import interruptible_sleep
+from .VISA import VISA, VISAManager
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+def _infer_dtype(values: Sequence[Any]) -> str:
+    """NumPy dtype of a result column holding the given values."""
+    if numpy is None or not values:
+        return "f8"
+    try:
+        inferred = numpy.asarray(values)
+    except ValueError:  # Ragged sequences (e.g. ranges of different lengths)
+        return "O"
+    # Tuples and other sequences stay whole: one object per setpoint
+    return inferred.dtype.str if inferred.ndim == 1 else "O"
+
+
+class SweepAxis:
+    """One swept setpoint on a source instrument."""
+
+    def __init__(self, name: str, instrument: str, command: str, values: Sequence[Any],
+                 settle: float = 0.0, list_command: Optional[str] = None,
+                 step_command: Optional[str] = None, dtype: Optional[str] = None):
+        """
+        Initialize the axis.
+
+        Args:
+            name: Result column name
+            instrument: Instrument name in the manager
+            command: Setpoint command with a '{value}' placeholder (e.g. 'VOLT {value}')
+            values: Setpoints in sweep order
+            settle: Settling time after a change (seconds)
+            list_command: Optional command loading all setpoints at once, with a
+                          '{values}' placeholder (e.g. 'LIST:VOLT {values}')
+            step_command: Command advancing to the next list entry (e.g. '*TRG');
+                          used instead of command when list_command is set
+            dtype: NumPy dtype of the result column (None infers it from the
+                   values, e.g. integers, strings such as channel names, or
+                   objects for tuples and enums)
+        """
+        self.name: str = name
+        self.instrument: str = instrument
+        self.command: str = command
+        self.values: List[Any] = list(values)
+        self.settle: float = settle
+        self.list_command: Optional[str] = list_command
+        self.step_command: Optional[str] = step_command
+        self.dtype: str = dtype if dtype is not None else _infer_dtype(self.values)
+
+
+class Measurement:
+    """One query taken at every sweep point."""
+
+    def __init__(self, name: str, instrument: str, command: str, dtype: str = "f8",
+                 parse: Callable[[str], Any] = float,
+                 settle_on: Optional[Sequence[str]] = None):
+        """
+        Initialize the measurement.
+
+        Args:
+            name: Result column name
+            instrument: Instrument name in the manager
+            command: Query command (e.g. 'MEAS:CURR?')
+            dtype: NumPy dtype of the result column
+            parse: Conversion of the response text to a value
+            settle_on: Names of the axes whose settling this measurement waits
+                       for (None waits for all axes)
+        """
+        self.name: str = name
+        self.instrument: str = instrument
+        self.command: str = command
+        self.dtype: str = dtype
+        self.parse: Callable[[str], Any] = parse
+        self.settle_on: Optional[List[str]] = None if settle_on is None else list(settle_on)
+
+
+class Sweep:
+    """
+    Set/measure sweep engine.
+
+    Axes are nested in the given order (the last axis changes fastest).
+    """
+
+    def __init__(self, manager: VISAManager, axes: List[SweepAxis],
+                 measurements: List[Measurement]):
+        """
+        Initialize the sweep.
+
+        Args:
+            manager: Manager holding the instruments
+            axes: Swept setpoints, outermost first
+            measurements: Queries taken at every point
+
+        Raises:
+            KeyError: If an axis or measurement names an unknown instrument,
+                      or a measurement waits for an unknown axis
+        """
+        self.manager: VISAManager = manager
+        self.axes: List[SweepAxis] = axes
+        self.measurements: List[Measurement] = measurements
+        for item in [*axes, *measurements]:
+            if manager.get_instrument(item.instrument) is None:
+                raise KeyError(f"Instrument '{item.instrument}' is not managed")
+        axis_names = {axis.name for axis in axes}
+        for measurement in measurements:
+            for name in measurement.settle_on or ():
+                if name not in axis_names:
+                    raise KeyError(f"Measurement '{measurement.name}' waits for "
+                                   f"unknown axis '{name}'")
+
+        # Measurements grouped per instrument, in the order they are queried
+        grouped: Dict[str, List[Measurement]] = {}
+        for measurement in measurements:
+            grouped.setdefault(measurement.instrument, []).append(measurement)
+        self._groups: List[Tuple[VISA, List[Measurement]]] = [
+            (self._instrument(name), group) for name, group in grouped.items()]
+
+    def _instrument(self, name: str) -> VISA:
+        """Get a managed instrument."""
+        return self.manager.instruments[name]
+
+    @property
+    def dtype(self) -> List[Tuple[str, str]]:
+        """Structured dtype of the result rows."""
+        return ([(axis.name, axis.dtype) for axis in self.axes]
+                + [(measurement.name, measurement.dtype) for measurement in self.measurements])
+
+    def _set_point(self, indices: Tuple[int, ...], previous: Optional[Tuple[int, ...]],
+                   settled: Dict[str, float]) -> None:
+        """Write the axes whose setpoint index changed and update their settle deadlines."""
+        for position, axis in enumerate(self.axes):
+            index = indices[position]
+            if previous is not None and previous[position] == index:
+                continue
+            instrument = self._instrument(axis.instrument)
+            if axis.list_command is not None and axis.step_command is not None:
+                if index == 0:
+                    # (Re)load the list; the instrument starts at its first entry
+                    instrument.write(axis.list_command.format(
+                        values=",".join(str(value) for value in axis.values)))
+                else:
+                    instrument.write(axis.step_command)
+            else:
+                instrument.write(axis.command.format(value=axis.values[index]))
+            settled[axis.name] = time.perf_counter() + axis.settle
+
+    @staticmethod
+    def _ready_at(measurement: Measurement, settled: Dict[str, float]) -> float:
+        """Time at which the axes a measurement waits for have settled."""
+        names = settled if measurement.settle_on is None else measurement.settle_on
+        return max((settled.get(name, 0.0) for name in names), default=0.0)
+
+    def _measure_pipelined(self, settled: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Trigger queries as their axes settle and read them while others settle.
+
+        Each instrument has at most one query outstanding. Ready instruments
+        are triggered before the oldest outstanding response is read; the
+        engine only sleeps when nothing is outstanding and no query is ready.
+        """
+        results: Dict[str, Any] = {}
+        queues: List[Tuple[VISA, Deque[Tuple[float, Measurement]]]] = []
+        for instrument, group in self._groups:
+            queues.append((instrument, collections.deque(
+                (self._ready_at(measurement, settled), measurement) for measurement in group)))
+        busy = [False] * len(queues)
+        outstanding: Deque[Tuple[int, Measurement]] = collections.deque()
+        while outstanding or any(queue for _, queue in queues):
+            now = time.perf_counter()
+            for position, (instrument, queue) in enumerate(queues):
+                if queue and not busy[position] and queue[0][0] <= now:
+                    _, measurement = queue.popleft()
+                    instrument.write(measurement.command)
+                    outstanding.append((position, measurement))
+                    busy[position] = True
+            if outstanding:
+                position, measurement = outstanding.popleft()
+                results[measurement.name] = measurement.parse(queues[position][0].read())
+                busy[position] = False
+            else:
+                interruptible_sleep(min(queue[0][0] for _, queue in queues if queue) - now)
+        return results
+
+    def _measure_sequential(self, settled: Dict[str, float]) -> Dict[str, Any]:
+        """Wait for every axis to settle, then query every measurement in turn."""
+        remaining = max(settled.values(), default=0.0) - time.perf_counter()
+        if remaining > 0:
+            interruptible_sleep(remaining)
+        return {measurement.name: measurement.parse(
+                    self._instrument(measurement.instrument).query(measurement.command))
+                for measurement in self.measurements}
+
+    def run(self, pipelined: bool = True,
+            on_point: Optional[Callable[[Tuple[Any, ...]], None]] = None) -> Any:
+        """
+        Run the sweep.
+
+        Args:
+            pipelined: Overlap measurements with settling and across
+                       instruments (False waits for all axes, then queries
+                       each measurement in turn, like a plain loop)
+            on_point: Optional callback receiving each result row
+
+        Returns:
+            NumPy structured array with one row per point and one field per
+            axis and measurement (a list of row tuples without NumPy)
+        """
+        measure = self._measure_pipelined if pipelined else self._measure_sequential
+        rows: List[Tuple[Any, ...]] = []
+        previous: Optional[Tuple[int, ...]] = None
+        # Axis name -> time its last setpoint change has settled
+        settled: Dict[str, float] = {}
+        for indices in itertools.product(*(range(len(axis.values)) for axis in self.axes)):
+            self._set_point(indices, previous, settled)
+            previous = indices
+
+            results = measure(settled)
+            row = (*(axis.values[index] for axis, index in zip(self.axes, indices)),
+                   *(results[measurement.name] for measurement in self.measurements))
+            rows.append(row)
+            if on_point is not None:
+                on_point(row)
+
+        if numpy is None:
+            return rows
+        return numpy.array(rows, dtype=self.dtype)
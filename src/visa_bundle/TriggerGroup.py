@@ -0,0 +1,161 @@
+"""
+Trigger Group - Synchronized arm/trigger/fetch across several instruments
+
+Coordinates a group of instruments (e.g. four scopes) sharing one trigger:
+arm all of them, fire a software trigger (or let an external source fire),
+wait for completion with '*OPC?' on every instrument, then fetch all
+results concurrently. Waiting and fetching run through
+VISAManager.run_parallel(), so instruments on different buses or LAN hosts
+transfer in parallel and instruments sharing a bus take turns.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from .Cancellation import interruptible_sleep
+from .VISA import VISA, VISAManager
+
+
+class Acquisition(NamedTuple):
+    """Data fetched from one instrument with its timing."""
+
+    name: str
+    data: Any
+    triggered_at: float
+    completed_at: float
+    fetched_at: float
+
+
+class TriggerGroup:
+    """
+    Group of instruments armed, triggered and fetched together.
+
+    Commands may be one string for every instrument or a mapping of
+    instrument name to its own command. Timestamps are time.time() values.
+    """
+
+    def __init__(self, manager: VISAManager, names: List[str]):
+        """
+        Initialize the group.
+
+        Args:
+            manager: Manager holding the instruments
+            names: Instrument names in the group
+
+        Raises:
+            KeyError: If a name is not managed
+        """
+        for name in names:
+            if manager.get_instrument(name) is None:
+                raise KeyError(f"Instrument '{name}' is not managed")
+        self.manager: VISAManager = manager
+        self.names: List[str] = list(names)
+        self.triggered_at: float = 0.0
+        self.completed_at: Dict[str, float] = {}
+
+    def _command(self, commands: Union[str, Dict[str, str]], name: str) -> str:
+        """Get an instrument's command from a shared string or a mapping."""
+        return commands if isinstance(commands, str) else commands[name]
+
+    def _run(self, operation: Callable[[str, VISA], Any]) -> Dict[str, Any]:
+        """Run an operation on every instrument, parallel across buses."""
+        return self.manager.run_parallel({
+            name: (lambda instrument, name=name: operation(name, instrument))
+            for name in self.names})
+
+    def arm(self, commands: Union[str, Dict[str, str]] = ":SING") -> None:
+        """
+        Arm every instrument for a single acquisition.
+
+        Args:
+            commands: Arm command (e.g. ':SING', 'INIT') or per-instrument mapping
+        """
+        self.completed_at = {}
+        for name in self.names:
+            self.manager.instruments[name].write(self._command(commands, name))
+
+    def fire(self, trigger: Union[str, Callable[[], None], None] = "*TRG") -> float:
+        """
+        Fire the shared trigger.
+
+        Args:
+            trigger: Software trigger command sent to every instrument back to
+                     back, a callable firing an external trigger source, or
+                     None when the trigger comes from elsewhere
+
+        Returns:
+            Trigger timestamp
+        """
+        self.triggered_at = time.time()
+        if callable(trigger):
+            trigger()
+        elif trigger is not None:
+            for name in self.names:
+                self.manager.instruments[name].write(trigger)
+        return self.triggered_at
+
+    def wait_complete(self, command: str = "*OPC?") -> Dict[str, float]:
+        """
+        Wait until every instrument has finished its acquisition.
+
+        Args:
+            command: Completion query answering once the acquisition is done
+
+        Returns:
+            Mapping of instrument name to completion timestamp
+
+        Raises:
+            Exception: If an instrument does not answer (e.g. I/O timeout)
+        """
+        def wait(name: str, instrument: VISA) -> float:
+            instrument.query(command)
+            return time.time()
+
+        self.completed_at = self._run(wait)
+        return self.completed_at
+
+    def fetch(self, commands: Union[str, Dict[str, str]] = ":WAV:DATA?",
+              binary: bool = True, delay_time: float = 0.0) -> Dict[str, Acquisition]:
+        """
+        Fetch every instrument's data concurrently.
+
+        Args:
+            commands: Fetch query or per-instrument mapping
+            binary: Fetch with query_binary() (False uses query())
+            delay_time: Delay between write and read of binary fetches (seconds)
+
+        Returns:
+            Mapping of instrument name to Acquisition
+        """
+        def fetch_one(name: str, instrument: VISA) -> Acquisition:
+            command = self._command(commands, name)
+            data = (instrument.query_binary(command, delay_time) if binary
+                    else instrument.query(command))
+            return Acquisition(name, data, self.triggered_at,
+                               self.completed_at.get(name, 0.0), time.time())
+
+        return self._run(fetch_one)
+
+    def acquire(self, arm: Union[str, Dict[str, str]] = ":SING",
+                fetch: Union[str, Dict[str, str]] = ":WAV:DATA?",
+                trigger: Union[str, Callable[[], None], None] = "*TRG",
+                binary: bool = True, settle: Optional[float] = None) -> Dict[str, Acquisition]:
+        """
+        Arm, trigger, wait for completion and fetch in one call.
+
+        Args:
+            arm: Arm command or per-instrument mapping
+            fetch: Fetch query or per-instrument mapping
+            trigger: Trigger passed to fire()
+            binary: Fetch binary data
+            settle: Optional delay between arming and firing (seconds)
+
+        Returns:
+            Mapping of instrument name to Acquisition
+        """
+        self.arm(arm)
+        if settle:
+            interruptible_sleep(settle)
+        self.fire(trigger)
+        self.wait_complete()
+        return self.fetch(fetch, binary=binary)
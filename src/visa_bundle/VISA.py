@@ -6,10 +6,31 @@ for unified management, enabling/printing control, and connection pooling.
 """
 
 from . import Setting
+from . import ConnectionRegistry as _registry
+from .AdaptiveTimeout import AdaptiveTimeout
+from .AliasCache import get_alias_cache, is_resource_address
+from .AsciiValues import AsciiValueParser, concatenate_values, parse_ascii_values
+from .BinaryBlock import block_header, iter_chunks, values_view
+from .BufferRing import BufferRing, CaptureBuffer
+from .Cancellation import (VISAInterruptError, check_interrupt, current_token,
+                           interruptible_sleep, is_timeout, sliced_wait)
+from .BusScheduler import get_scheduler
+from .ServiceRequest import (SRQ_POLL_INTERVAL, SRQ_WAIT_SLICE, STB_RQS, SRQListener,
+                             SRQTimeoutError, enable_srq_events, has_serial_poll,
+                             read_status_byte, wait_srq_event)
+from .ConnectionRegistry import opened_connections
+from .ErrorQueue import ErrorCheck, ErrorEntry, InstrumentError, parse_error
+from .FileTransfer import FILE_CHUNK_SIZE, TransferResult, iter_file_chunks, read_block_length
 import os as _os
 import pyvisa
-from typing import List, Tuple, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+import contextlib
+import contextvars
+import queue
+import threading
 import time
+import traceback
+import weakref
 import subprocess as _subprocess
 from am_shared.logger import logger
 
@@ -52,14 +73,33 @@ Operating Principles:
 3. Comprehensive error reporting
 """
 
-# Global connection registry: (address, VISA_resource)
-# Checked before opening new connections, removed on close
-opened_connections: List[Tuple[str,
-                               pyvisa.resources.MessageBasedResource]] = []
+# Global connection registry (opened_connections) lives in ConnectionRegistry:
+# (address, VISA_resource) pairs checked before opening, removed on close
 
 # Legacy alias for backward compatibility
 Opened_List = opened_connections
 
+# Supported transports: the VISA library, or native raw TCP for SOCKET resources
+TRANSPORTS = ("visa", "socket")
+
+# Set while a command runs under its adaptive timeout on this thread
+_timed_commands = threading.local()
+
+# Marks the end of a buffered acquisition in its queue
+_DONE = object()
+
+
+class _IOState(threading.local):
+    """Per-thread accounting of the outermost VISA operation in progress."""
+
+    depth: int = 0
+    sent: int = 0
+    received: int = 0
+    flushes: int = 0
+
+
+_io_state = _IOState()
+
 
 class VISA:
     """
@@ -69,21 +109,357 @@ class VISA:
     connection management, error handling, and debug capabilities.
     """
 
-    def __init__(self, name: str, address: str, skip_clear: bool = False):
+    def __init__(self, name: str, address: str, skip_clear: bool = False,
+                 lazy: bool = False, transport: str = "visa", encoding: str = "utf-8",
+                 fast_path: bool = False):
         """
         Initialize VISA instrument instance.
 
         Args:
             name: Instrument identifier for logging and debugging
-            address: VISA resource address (e.g., 'USB0::0x1234::0x5678::INSTR')
+            address: VISA resource address (e.g., 'USB0::0x1234::0x5678::INSTR'),
+                     or a logical name / serial number resolved through the
+                     persistent alias cache
+            skip_clear: Skip the device clear performed after opening
+            lazy: Defer opening the connection until the first I/O call
+            transport: "visa" (VISA library) or "socket" (native raw TCP
+                       transport for TCPIP::host::port::SOCKET addresses)
+            encoding: Text encoding used to decode read(count) responses
+                      ('ascii' is the fastest for plain SCPI instruments)
+            fast_path: Bind specialized I/O methods for the current Setting
+                       values (see enable_fast_path())
+
+        Raises:
+            ValueError: If the transport is unknown
         """
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{transport}'")
+
         self.name = name
         self.address = address
+        # Alias (logical name or serial number) used instead of a resource address
+        self.alias: Optional[str] = None if is_resource_address(address) else address
         self.handle: Optional[Union[pyvisa.resources.MessageBasedResource,
                                     pyvisa.resources.Resource]] = None
+        self.skip_clear = skip_clear
+        self.transport: str = transport
+        self.encoding: str = encoding
+
+        # Deferred connection state for lazy mode (opened once on first use)
+        self._open_lock = threading.Lock()
+        self._pending_open: bool = lazy
+
+        # Pool bookkeeping of the registered session this instance uses
+        self._session: Optional[_registry.SessionInfo] = None
+        # Bus scheduler queue priority (lower values are served first)
+        self.priority: int = 0
+        # Class to restore when the fast path is disabled
+        self._fast_path_base: type = type(self)
+        # Per-command timeouts learned from latency history (see enable_adaptive_timeout())
+        self.adaptive_timeout: Optional[AdaptiveTimeout] = None
+        # Deferred SCPI error-queue checking (see enable_error_check())
+        self.error_check: Optional[ErrorCheck] = None
+        # Handle whose SRQ event support was checked, and the result
+        self._srq_events: Optional[Tuple[Any, bool]] = None
+        self._srq_listener: Optional[SRQListener] = None
+
+        # Releases the session into the registry if dropped without close()
+        self._finalizer: Optional[weakref.finalize] = None
+        self._created_stack: Optional[str] = (
+            "".join(traceback.format_stack(limit=8)) if Setting.VISA_Leak_Detect else None)
+
+        # Automatically open connection on initialization unless lazy
+        if not lazy:
+            self.open(skip_clear=skip_clear)
+
+        if fast_path:
+            self.enable_fast_path()
+
+    def enable_fast_path(self, enabled: bool = True) -> None:
+        """
+        Bind I/O methods specialized for the current Setting values.
+
+        With the fast path enabled the instance switches to a specialized
+        class whenever VISA_Send_Enable, VISA_Print_Enable or
+        VISA_Bus_Schedule_Enable change (Setting notifies on assignment), so
+        the per-call Setting lookups and handle type checks disappear from
+        query()/write()/read() in high-rate polling loops. Behaviour is
+        unchanged; uncommon states (lazy or evicted sessions) fall back to
+        the generic implementation.
+
+        Args:
+            enabled: False restores the generic implementation
+        """
+        base = self._fast_path_base
+        if enabled:
+            _fast_path_instances.add(self)
+            self.__class__ = _fast_path_class(base)
+        else:
+            _fast_path_instances.discard(self)
+            self.__class__ = base
+
+    def enable_adaptive_timeout(self, enabled: bool = True,
+                                overrides: Optional[Dict[str, float]] = None,
+                                **options: Any) -> Optional[AdaptiveTimeout]:
+        """
+        Learn per-command timeouts from this instrument's latency history.
+
+        Each write/query then runs with a timeout derived from the recent
+        latencies of its SCPI header (a high percentile times a margin,
+        capped at the resource timeout), so a dead instrument fails fast on
+        ordinary commands while known-long commands keep their overrides.
+
+        Args:
+            enabled: False restores the fixed resource timeout
+            overrides: Fixed timeouts in milliseconds per command header
+                       (e.g. {'*CAL?': 120000})
+            **options: AdaptiveTimeout options (percentile, margin, padding,
+                       min_samples, window)
+
+        Returns:
+            The latency statistics in use, or None when disabled
+        """
+        if not enabled:
+            self.adaptive_timeout = None
+        elif self.adaptive_timeout is None or options:
+            self.adaptive_timeout = AdaptiveTimeout(overrides=overrides, **options)
+        else:
+            for command, timeout in (overrides or {}).items():
+                self.adaptive_timeout.set_override(command, timeout)
+        return self.adaptive_timeout
+
+    def enable_error_check(self, enabled: bool = True, mode: str = "batch",
+                           clear: bool = True, **options: Any) -> Optional[ErrorCheck]:
+        """
+        Check the instrument's SCPI error queue without a query per write.
+
+        Instead of query("SYST:ERR?") after every write, a cheap probe
+        ('*ESR?' by default) is sent only when a check is due, and the queue
+        is drained only when the probe reports an error. Errors are
+        attributed to the write()/query() commands sent since the previous
+        check and raised as InstrumentError.
+
+        Modes:
+            'call': every write() carries the probe in the same message
+            'batch': one check at the end of each error_batch() block
+            'periodic': the probe rides along every N writes (every=N)
+                        and/or every T seconds (interval=T)
+
+        Queries sent with write() (commands containing '?') never carry the
+        probe, since the caller reads their reply; they are checked with the
+        next probe.
+
+        Args:
+            enabled: False stops error checking
+            mode: 'call', 'batch' or 'periodic'
+            clear: Send '*CLS' first so stale errors are not attributed to
+                   the next commands
+            **options: ErrorCheck options (probe, error_command, every,
+                       interval, max_errors, raise_errors, history)
+
+        Returns:
+            The error checking state in use, or None when disabled
+
+        Raises:
+            ValueError: If the mode or options are invalid
+        """
+        if not enabled:
+            self.error_check = None
+            return None
+        checker = ErrorCheck(mode, **options)
+        self.error_check = None
+        if clear:
+            self.write("*CLS")
+        self.error_check = checker
+        return checker
+
+    @contextlib.contextmanager
+    def error_batch(self) -> Iterator[ErrorCheck]:
+        """
+        Check the error queue once for all commands in a block.
+
+        Writes inside the block never carry the probe; when the outermost
+        block ends, one check attributes any errors to the block's commands.
+        If no mode is enabled, a 'batch' check is used for the block only;
+        '*CLS' is not sent, so errors queued before the block are reported
+        with it. If the block raises, the queue is still drained but the
+        original error propagates.
+
+        Yields:
+            The error checking state
+
+        Raises:
+            InstrumentError: If the instrument reported errors
+        """
+        checker = self.error_check
+        temporary = checker is None
+        if temporary:
+            checker = self.error_check = ErrorCheck(mode="batch")
+        checker.batch_depth += 1
+        try:
+            try:
+                yield checker
+            except BaseException:
+                checker.batch_depth -= 1
+                if not checker.batch_depth:
+                    try:
+                        self.check_errors(raise_errors=False)
+                    except Exception:
+                        pass  # Keep the block's own error
+                raise
+            checker.batch_depth -= 1
+            if not checker.batch_depth:
+                self.check_errors()
+        finally:
+            if temporary and self.error_check is checker:
+                self.error_check = None
+
+    def _read_error_queue(self, checker: ErrorCheck) -> List[Tuple[int, str]]:
+        """
+        Drain the error queue on the open handle (inside an I/O scope).
+
+        Args:
+            checker: Policy providing the error command and entry limit
+
+        Returns:
+            (code, message) pairs, oldest first
+        """
+        handle = self.handle
+        command = checker.error_command
+        errors = []
+        for _ in range(checker.max_errors):
+            handle.write(command)
+            response = sliced_wait(handle, handle.read)
+            self._count_io(len(command), len(response))
+            code, message = parse_error(response)
+            if code == 0:
+                break
+            errors.append((code, message))
+        return errors
+
+    def _report_errors(self, checker: ErrorCheck, raw: List[Tuple[int, str]],
+                       raise_errors: Optional[bool] = None) -> List[ErrorEntry]:
+        """Attribute drained errors, log them and raise if configured."""
+        entries = checker.finish(raw)
+        if entries:
+            logger.error(f"VISA Instrument Error: {self.name}, address: {self.address}, "
+                         + "; ".join(str(entry) for entry in entries), raise_error=False)
+            if checker.raise_errors if raise_errors is None else raise_errors:
+                raise InstrumentError(self.name, entries)
+        return entries
+
+    def check_errors(self, raise_errors: Optional[bool] = None) -> List[ErrorEntry]:
+        """
+        Probe the error state now and drain the queue if errors are pending.
+
+        Args:
+            raise_errors: Override the configured raise_errors
+
+        Returns:
+            Errors found, attributed to the commands since the previous check
+
+        Raises:
+            InstrumentError: If errors were found and raising is enabled
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        checker = self.error_check if self.error_check is not None else ErrorCheck()
+
+        # Nothing to check if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            checker.finish([])
+            return []
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    handle.write(checker.probe)
+                    status = sliced_wait(handle, handle.read)
+                    self._count_io(len(checker.probe), len(status))
+                    pending, raw = checker.probe_result(status)
+                    if pending:
+                        raw += self._read_error_queue(checker)
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Error Check Error: {self.name}, address: {self.address}",
+                                 raise_error=False)
+                    raise Exception("VISA Error Check Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+        return self._report_errors(checker, raw, raise_errors)
+
+    def drain_errors(self) -> List[Tuple[int, str]]:
+        """
+        Read the whole SCPI error queue in one call.
+
+        The entries are returned as read, without attribution or raising.
+
+        Returns:
+            (code, message) pairs, oldest first (empty when the queue is empty)
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        checker = self.error_check if self.error_check is not None else ErrorCheck()
+
+        # Nothing to read if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return []
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    return self._read_error_queue(checker)
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Error Check Error: {self.name}, address: {self.address}",
+                                 raise_error=False)
+                    raise Exception("VISA Error Check Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def ensure_open(self) -> None:
+        """
+        Open the connection if it has not been opened yet.
+
+        Thread-safe: concurrent callers block until a single open completes.
+        Called automatically before I/O on lazy instances.
+
+        Raises:
+            Exception: If unable to open VISA connection after retries
+        """
+        if self.handle is not None and not self._pending_open:
+            return
 
-        # Automatically open connection on initialization
-        self.open(skip_clear=skip_clear)
+        with self._open_lock:
+            if self.handle is None:
+                self.open(skip_clear=self.skip_clear)
+            self._pending_open = False
 
     def open(self, skip_clear: bool = False) -> None:
         """
@@ -95,8 +471,6 @@ class VISA:
         Raises:
             Exception: If unable to open VISA connection after retries
         """
-        global opened_connections
-
         # Debug output if enabled
         if Setting.VISA_Print_Enable:
             logger.debug(f"Open VISA: {self.name}")
@@ -105,39 +479,43 @@ class VISA:
         if not Setting.VISA_Send_Enable:
             return
 
+        # Let an in-flight background warm-up of this resource finish first;
+        # past the bound the resource is opened here (a late warm-up that
+        # loses the registration race closes its own handle)
+        _registry.wait_for_warm_up(self.alias or self.address,
+                                   timeout=_registry.WARM_UP_WAIT_TIMEOUT)
+
+        # Resolve alias to its last-known-good address (rescans on mismatch)
+        if self.alias is not None:
+            self.address = _registry.resolve_address(
+                self.alias, skip_clear=skip_clear, transport=self.transport)
+            _registry.wait_for_warm_up(self.address,
+                                       timeout=_registry.WARM_UP_WAIT_TIMEOUT)
+
         # Check if connection already exists for this address
-        for address, handle in opened_connections:
-            if address == self.address:
-                self.handle = handle
-                return
+        handle = _registry.find_session(self.address)
+        if handle is not None:
+            self.handle = handle
+            self._attach_session()
+            return
 
         try:
             # Attempt to open communication with retry logic
-            retry_max = 2
             self.handle = None
-
-            for attempt in range(retry_max):
-                try:
-                    resource_manager = pyvisa.ResourceManager()
-                    self.handle = resource_manager.open_resource(self.address)
-                    try:
-                        if hasattr(self.handle, 'clear') and not skip_clear:
-                            self.handle.clear()
-                        time.sleep(0.5)
-                    except Exception:
-                        pass  # Ignore clear errors
-                    break  # Success, exit retry loop
-                except Exception:
-                    time.sleep(1)
-
-            if self.handle is None:
-                raise Exception(
-                    f"VISA Open Error: {self.name}, address: {self.address}")
+            self.handle = _registry.open_session(self.address, skip_clear=skip_clear,
+                                                 transport=self.transport)
 
             # Add to connection registry if it's a message-based resource
-            if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-                opened_connections.append((self.address, self.handle))
-
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                registered = _registry.register_session(self.address, self.handle)
+                if registered is not self.handle:
+                    # Another thread registered this address first; share it
+                    self.handle.close()
+                    self.handle = registered
+                self._attach_session()
+
+        except VISAInterruptError:
+            raise
         except Exception:
             # Fatal error - unable to open instrument communication
             raise Exception(
@@ -147,31 +525,269 @@ class VISA:
         """
         Close VISA connection and remove from connection registry.
         """
-        global opened_connections
-
         # Debug output if enabled
         if Setting.VISA_Print_Enable:
             logger.debug(f"Close VISA: {self.name}")
 
+        # A lazy instance closed before first use stays closed
+        self._pending_open = False
+        self.on_srq(None)
+
         # Skip actual closure if VISA is disabled
         if not Setting.VISA_Send_Enable:
             return
 
         # Close handle if it's a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
+        if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
             try:
                 self.handle.close()
             except Exception:
                 pass  # Ignore errors during close
 
             # Remove from connection registry
-            opened_connections[:] = [
-                (addr, handle) for addr, handle in opened_connections
-                if handle != self.handle
-            ]
+            _registry.unregister_session(self.handle)
 
             # Clear the handle reference
             self.handle = None
+            self._detach_session()
+
+    def release(self) -> None:
+        """
+        Release this instance's share of the pooled session.
+
+        Unlike close(), the session stays open while other VISA instances use
+        it; the last owner to release it closes it (or leaves it idle in the
+        pool when Setting.VISA_Pool_Idle_Timeout is set).
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"Release VISA: {self.name}")
+
+        self._pending_open = False
+        self.on_srq(None)
+        session = self._session
+        self.handle = None
+        self._detach_session()
+        if session is not None:
+            _registry.release_owner(session)
+
+    def __enter__(self) -> "VISA":
+        """Open the connection if needed and return the instance."""
+        self.ensure_open()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        """Release the pooled session when leaving the context."""
+        self.release()
+
+    def _attach_session(self) -> None:
+        """Register as an owner of the session and arm the leak finalizer."""
+        self._detach_session()
+        self._session = _registry.attach_session(self.address, self)
+        if self._session is not None:
+            self._finalizer = weakref.finalize(
+                self, _registry._finalize_owner, self._session,
+                self.name, self.address, self._created_stack)
+            self._finalizer.atexit = False
+
+    def _detach_session(self) -> None:
+        """Stop owning the current session without closing it."""
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        if self._session is not None:
+            self._session.owners.discard(self)
+            self._session = None
+
+    def _release_evicted_session(self, session: "_registry.SessionInfo") -> None:
+        """
+        Drop a session closed by a pool policy; reopen it on next use.
+
+        Called by ConnectionRegistry when an idle session is evicted.
+
+        Args:
+            session: Evicted session bookkeeping
+        """
+        if self._session is session:
+            self.handle = None
+            self._detach_session()
+            self._pending_open = True
+
+    @contextlib.contextmanager
+    def _io_scope(self) -> Iterator[None]:
+        """
+        Mark the pooled session as in use for the duration of one operation.
+
+        Pool policies never evict a session while it is in use. If the
+        session was evicted just before this operation, it is reopened
+        transparently. With Setting.VISA_Bus_Schedule_Enable the operation
+        also holds this instrument's bus exclusively, and a session shared
+        through a broker is leased for the operation (see _transaction()).
+
+        The outermost scope on a thread counts as one operation in the
+        session statistics: its I/O time (excluding the bus wait), the bytes
+        reported through _count_io(), flushes and whether it failed.
+
+        Raises:
+            VISAInterruptError: If IS_INTERRUPT is set or the current
+                                CancelToken is cancelled
+        """
+        check_interrupt()
+        session = self._session
+        while session is not None and not session.acquire():
+            self.ensure_open()
+            session = self._session
+        state = _io_state
+        outermost = state.depth == 0
+        if outermost:
+            state.sent = state.received = state.flushes = 0
+        state.depth += 1
+        start = None
+        failed = False
+        try:
+            if Setting.VISA_Bus_Schedule_Enable:
+                with get_scheduler().slot(self.address, self.priority), self._transaction():
+                    start = time.perf_counter()
+                    yield
+            else:
+                with self._transaction():
+                    start = time.perf_counter()
+                    yield
+        except VISAInterruptError:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            state.depth -= 1
+            if session is not None:
+                if outermost:
+                    session.release(0.0 if start is None else time.perf_counter() - start,
+                                    state.sent, state.received, state.flushes, failed)
+                else:
+                    session.release()
+
+    @contextlib.contextmanager
+    def _session_held(self) -> Iterator[None]:
+        """
+        Keep the pooled session from being evicted without starting an operation.
+
+        Unlike _io_scope(), neither the bus nor a broker lease is taken and
+        nothing is counted in the session statistics; used for waits.
+        """
+        session = self._session
+        while session is not None and not session.acquire():
+            self.ensure_open()
+            session = self._session
+        try:
+            yield
+        finally:
+            if session is not None:
+                session.release()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Hold a session shared with other processes for one operation.
+
+        Broker sessions (see Broker.BrokerHandle.begin_transaction()) are
+        leased so other clients cannot run requests between this
+        operation's requests; other handles need nothing.
+        """
+        handle = self.handle
+        begin = getattr(handle, "begin_transaction", None)
+        if begin is None:
+            yield
+            return
+        begin()
+        try:
+            yield
+        finally:
+            handle.end_transaction()
+
+    @staticmethod
+    def _count_io(sent: int = 0, received: int = 0) -> None:
+        """Add transferred bytes to the operation in progress on this thread."""
+        state = _io_state
+        state.sent += sent
+        state.received += received
+
+    @contextlib.contextmanager
+    def _command_timeout(self, command: str) -> Iterator[None]:
+        """
+        Apply the adaptive timeout of a command and record its latency.
+
+        Without adaptive timeouts, or when nested in another timed command
+        (query_binary() writing through write()), nothing is changed.
+
+        Args:
+            command: Command being sent
+        """
+        timeouts = self.adaptive_timeout
+        if timeouts is None or getattr(_timed_commands, "active", False):
+            yield
+            return
+
+        handle = self.handle
+        base = handle.timeout
+        limit = timeouts.timeout_for(command, base)
+        if limit != base:
+            handle.timeout = limit
+        _timed_commands.active = True
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as error:
+            # Timeouts may arrive wrapped in a "VISA ... Error" by a nested call
+            cause: Optional[BaseException] = error
+            while cause is not None and not is_timeout(cause):
+                cause = cause.__context__
+            if cause is not None and limit is not None:
+                timeouts.record(command, limit / 1000.0)
+            raise
+        else:
+            timeouts.record(command, time.perf_counter() - start)
+        finally:
+            _timed_commands.active = False
+            if limit != base:
+                handle.timeout = base
+
+    def _abort_transaction(self) -> None:
+        """
+        Bring the session back to a clean state after an interrupted operation.
+
+        Clears the device (aborting a pending response) and discards any
+        partially received data; failures are ignored like in open().
+        """
+        handle = self.handle
+        if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+            try:
+                handle.clear()
+            except Exception:
+                pass  # Clear not supported by this backend/instrument; ignore
+        self._flush_input_buffer()
+
+    def _bus_delay(self, seconds: Optional[float]) -> None:
+        """
+        Wait between sending a command and reading its response.
+
+        With Setting.VISA_Bus_Schedule_Enable the bus is given up for the
+        wait: the instrument holds its response until it is read, so other
+        instruments on the same bus can transfer meanwhile.
+
+        Args:
+            seconds: Delay (None or 0 returns immediately)
+
+        Raises:
+            VISAInterruptError: If interrupted during the delay
+        """
+        if not seconds:
+            return
+        if Setting.VISA_Bus_Schedule_Enable:
+            with get_scheduler().released(self.address, self.priority):
+                interruptible_sleep(seconds)
+        else:
+            interruptible_sleep(seconds)
 
     def _flush_input_buffer(self) -> None:
         """
@@ -182,9 +798,10 @@ class VISA:
         communication.
         """
         handle = self.handle
-        if isinstance(handle, pyvisa.resources.MessageBasedResource):
+        if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
             try:
                 handle.flush(pyvisa.constants.BufferOperation.discard_receive_buffer)
+                _io_state.flushes += 1
             except Exception:
                 pass  # Flush not supported by this backend/instrument; ignore
 
@@ -211,31 +828,53 @@ class VISA:
         if not Setting.VISA_Send_Enable:
             return "0"
 
-        # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-            try:
-                # Discard stale data from a previous transaction before sending
-                self._flush_input_buffer()
-
-                # Send command and read response
-                response = self.handle.query(command, delay_time)
-
-                # Debug output if enabled
-                if Setting.VISA_Print_Enable:
-                    logger.debug(f"SCPI RX: {response}")
-
-                return response
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
 
-            except Exception:
-                # Communication error occurred
-                logger.error(
-                    f"VISA Query Error: {self.name}, address: {self.address}, command: {command}",
-                    raise_error=False,
-                )
-                raise Exception("VISA Query Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    # Send command and read response (in interruptible slices if enabled)
+                    with self._command_timeout(command):
+                        if Setting.VISA_Interrupt_Slice or (
+                                delay_time and Setting.VISA_Bus_Schedule_Enable):
+                            # Separate write and read so the delay can free the bus
+                            handle = self.handle
+                            handle.write(command)
+                            self._bus_delay(delay_time)
+                            response = (sliced_wait(handle, handle.read)
+                                        if Setting.VISA_Interrupt_Slice else handle.read())
+                        else:
+                            response = self.handle.query(command, delay_time)
+                    self._count_io(len(command), len(response))
+                    if self.error_check is not None:
+                        self.error_check.record(command)
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"SCPI RX: {response}")
+
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Query Error: {self.name}, address: {self.address}, command: {command}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Query Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
 
     def write(self, command: str) -> None:
         """
@@ -256,32 +895,66 @@ class VISA:
         if not Setting.VISA_Send_Enable:
             return
 
-        # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-            try:
-                # Discard stale data from a previous transaction before sending
-                self._flush_input_buffer()
-
-                # Send command
-                self.handle.write(command)
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
 
-            except Exception:
-                # Communication error occurred
-                logger.error(
-                    f"VISA Write Error: {self.name}, address: {self.address}, command: {command}",
-                    raise_error=False,
-                )
-                raise Exception("VISA Write Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                checker = self.error_check
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    if checker is None:
+                        # Send command
+                        with self._command_timeout(command):
+                            self.handle.write(command)
+                        self._count_io(sent=len(command))
+                    else:
+                        checker.record(command)
+                        # A query's reply is read by the caller; it is only recorded
+                        if "?" not in command and checker.probe_due():
+                            # Send command and error probe in one message
+                            handle = self.handle
+                            with self._command_timeout(command):
+                                handle.write(command + checker.probe_suffix)
+                                status = sliced_wait(handle, handle.read)
+                            self._count_io(len(command), len(status))
+                            pending, raw = checker.probe_result(status)
+                            if pending:
+                                raw += self._read_error_queue(checker)
+                            self._report_errors(checker, raw)
+                        else:
+                            with self._command_timeout(command):
+                                self.handle.write(command)
+                            self._count_io(sent=len(command))
+
+                except InstrumentError:
+                    raise
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Write Error: {self.name}, address: {self.address}, command: {command}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Write Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
 
     def read(self, count: Optional[int] = None) -> str:
         """
         Read data from the instrument.
 
         Args:
-            count: Number of bytes to read (if specified, reads binary and decodes to UTF-8)
+            count: Number of bytes to read (if specified, reads binary and decodes
+                   with the instance encoding)
 
         Returns:
             Response string from the instrument
@@ -298,35 +971,61 @@ class VISA:
         if not Setting.VISA_Send_Enable:
             return "0"
 
-        # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-            try:
-                # Read data (binary or text mode)
-                if isinstance(count, int):
-                    response = self.handle.read_bytes(count).decode("utf-8")
-                else:
-                    response = self.handle.read()
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
 
-                # Debug output if enabled
-                if Setting.VISA_Print_Enable:
-                    logger.debug(f"SCPI RX: {response}")
-
-                return response
-
-            except Exception:
-                # Communication error occurred
-                logger.error(f"VISA Read Error: {self.name}", raise_error=False)
-                raise Exception("VISA Read Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Read data (binary or text mode)
+                    if isinstance(count, int):
+                        response = sliced_wait(
+                            self.handle, lambda: self.handle.read_bytes(count)).decode(self.encoding)
+                    else:
+                        response = sliced_wait(self.handle, self.handle.read)
+                    self._count_io(received=len(response))
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"SCPI RX: {response}")
+
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Read Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Read Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
 
-    def read_binary(self) -> bytes:
+    @staticmethod
+    def _strip_termination(handle: Any, response: bytes) -> bytes:
+        """Remove the read termination (or a trailing newline) from a raw response."""
+        termination = getattr(handle, "read_termination", None)
+        if isinstance(termination, str) and termination:
+            suffix = termination.encode("ascii")
+            if response.endswith(suffix):
+                return response[:-len(suffix)]
+            return response
+        return response.rstrip(b"\r\n")
+
+    def read_bytes(self, count: Optional[int] = None) -> bytes:
         """
-        Read binary data from the instrument.
+        Read a response as bytes without decoding it.
+
+        Args:
+            count: Number of bytes to read (None reads one message and strips
+                   its termination)
 
         Returns:
-            Binary response data from the instrument
+            Raw response bytes
 
         Raises:
             Exception: If handle is not a valid MessageBasedResource
@@ -334,35 +1033,59 @@ class VISA:
         """
         # Debug output if enabled
         if Setting.VISA_Print_Enable:
-            logger.debug(f"[{self.name}] Read Binary")
+            logger.debug(f"[{self.name}] Read Bytes")
 
-        # Return empty bytes if VISA is disabled
+        # Return dummy response if VISA is disabled
         if not Setting.VISA_Send_Enable:
-            return b""
-
-        # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-            try:
-                # Read binary data
-                response = self.handle.read_raw()
-                if Setting.VISA_Print_Enable:
-                    logger.debug(f"[{self.name}] Binary RX: {len(response)} bytes")
-                return response
+            return b"0"
 
-            except Exception:
-                # Communication error occurred
-                logger.error(f"VISA Read Binary Error: {self.name}", raise_error=False)
-                raise Exception("VISA Read Binary Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
 
-    def write_binary(self, command: bytes) -> None:
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    if isinstance(count, int):
+                        response = sliced_wait(handle, lambda: handle.read_bytes(count))
+                    else:
+                        response = self._strip_termination(
+                            handle, sliced_wait(handle, handle.read_raw))
+                    self._count_io(received=len(response))
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"SCPI RX: {response!r}")
+
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Read Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Read Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def query_bytes(self, command: str, delay_time: Optional[float] = None) -> bytes:
         """
-        Send binary data to the instrument.
+        Send a command and read the response as bytes without decoding it.
+
+        Intended for high-rate polling loops that parse the raw response
+        (e.g. with int() or float(), which accept bytes) and never need a str.
 
         Args:
-            command: Binary command data to send
+            command: SCPI command string to send
+            delay_time: Optional delay before reading response (seconds)
+
+        Returns:
+            Raw response bytes with the termination stripped
 
         Raises:
             Exception: If handle is not a valid MessageBasedResource
@@ -370,28 +1093,343 @@ class VISA:
         """
         # Debug output if enabled
         if Setting.VISA_Print_Enable:
-            logger.debug(f"[{self.name}] Binary TX: {len(command)} bytes")
+            logger.debug(f"SCPI TX: {command}")
 
-        # Skip if VISA is disabled
+        # Return dummy response if VISA is disabled
         if not Setting.VISA_Send_Enable:
-            return
+            return b"0"
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
 
         # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
-            try:
-                # Discard stale data from a previous transaction before sending
-                self._flush_input_buffer()
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    with self._command_timeout(command):
+                        handle.write(command)
+                        self._bus_delay(delay_time)
+                        response = self._strip_termination(
+                            handle, sliced_wait(handle, handle.read_raw))
+                    self._count_io(len(command), len(response))
+                    if self.error_check is not None:
+                        self.error_check.record(command)
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"SCPI RX: {response!r}")
+
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Query Error: {self.name}, address: {self.address}, command: {command}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Query Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
 
-                # Send binary command
-                self.handle.write_raw(command)
+    def read_binary(self) -> bytes:
+        """
+        Read binary data from the instrument.
 
-            except Exception:
-                # Communication error occurred
-                logger.error(f"VISA Write Binary Error: {self.name}", raise_error=False)
-                raise Exception("VISA Write Binary Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        Returns:
+            Binary response data from the instrument
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Read Binary")
+
+        # Return empty bytes if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return b""
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Read binary data
+                    response = sliced_wait(self.handle, self.handle.read_raw)
+                    self._count_io(received=len(response))
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"[{self.name}] Binary RX: {len(response)} bytes")
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Read Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Read Binary Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def write_binary(self, command: bytes) -> None:
+        """
+        Send binary data to the instrument.
+
+        Args:
+            command: Binary command data to send
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Binary TX: {len(command)} bytes")
+
+        # Skip if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    # Send binary command
+                    self.handle.write_raw(command)
+                    self._count_io(sent=len(command))
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Write Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Write Binary Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def write_binary_values(self, command: str, values: Any, dtype: str = "f",
+                            big_endian: bool = False,
+                            chunk_size: Optional[int] = None) -> None:
+        """
+        Send a command followed by numeric values as an IEEE 488.2 block.
+
+        The header and the data are written separately, in chunks of the
+        values' buffer, so no concatenated copy of large uploads is ever
+        built. VISA library handles get each chunk as bytes (the ctypes
+        backends do not accept buffers), so at most one chunk is copied at a
+        time; handles with accepts_buffers (the native socket transport) are
+        sent the views directly. END is only asserted on the final write of
+        the message.
+
+        Args:
+            command: Command prefix (e.g. 'DATA:DAC VOLATILE,')
+            values: NumPy array, bytes-like object or sequence of numbers
+            dtype: Element type as a struct/array format character (e.g. 'f', 'h')
+            big_endian: Transfer byte order
+            chunk_size: Maximum bytes per write for instruments with small
+                        input buffers (None sends the data in one write to
+                        handles with accepts_buffers and in FILE_CHUNK_SIZE
+                        chunks to others)
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Binary TX: {command} <{len(values)} values>")
+
+        # Skip if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return
+
+        data = values_view(values, dtype, big_endian)
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                send_end = getattr(handle, "send_end", None)
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    accepts_buffers = getattr(handle, "accepts_buffers", False)
+                    if chunk_size is None and not accepts_buffers:
+                        # Bound the bytes copy each write_raw() needs
+                        chunk_size = FILE_CHUNK_SIZE
+
+                    termination = getattr(handle, "write_termination", "\n") or ""
+                    pieces = [command.encode("utf-8") + block_header(len(data))]
+                    pieces.extend(iter_chunks(data, chunk_size))
+                    if termination:
+                        pieces.append(termination.encode("ascii"))
+
+                    for index, piece in enumerate(pieces):
+                        check_interrupt()
+                        if send_end is not None:
+                            # Assert END only with the last piece of the message
+                            handle.send_end = send_end and index == len(pieces) - 1
+                        handle.write_raw(piece if accepts_buffers else bytes(piece))
+                        self._count_io(sent=len(piece))
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Write Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Write Binary Error")
+                finally:
+                    if send_end is not None:
+                        handle.send_end = send_end
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def query_ascii_values(self, command: str, dtype: Any = float, separator: str = ",",
+                           delay_time: Optional[float] = None) -> Any:
+        """
+        Send a command and parse the separated ASCII numbers it returns.
+
+        The whole response is parsed in one pass (NumPy array without
+        per-element Python objects; a list when NumPy is not installed).
+
+        Args:
+            command: SCPI command string to send (e.g. 'TRAC:DATA?')
+            dtype: Element type (NumPy dtype, or int/float without NumPy)
+            separator: Separator between values
+            delay_time: Optional delay before reading response (seconds)
+
+        Returns:
+            Parsed values
+
+        Raises:
+            Exception: If communication error occurs
+            ValueError: If the response is not a list of numbers
+        """
+        return parse_ascii_values(self.query(command, delay_time), dtype, separator)
+
+    def query_ascii_values_stream(self, command: str, dtype: Any = float,
+                                  separator: str = ",", chunk_size: int = 65536,
+                                  on_values: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Send a command and parse its ASCII numbers while the response arrives.
+
+        The response is read in chunks of chunk_size bytes and each chunk is
+        parsed as soon as it is received, so parsing overlaps the transfer.
+
+        Args:
+            command: SCPI command string to send (e.g. 'TRAC:DATA?')
+            dtype: Element type (NumPy dtype, or int/float without NumPy)
+            separator: Separator between values
+            chunk_size: Bytes requested per read
+            on_values: Optional callback receiving each parsed batch; the
+                       batches are then not collected
+
+        Returns:
+            All parsed values, or None when on_values is given
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+
+        # Parse a dummy response if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            values = parse_ascii_values("0", dtype, separator)
+            if on_values is None:
+                return values
+            on_values(values)
+            return None
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        parser = AsciiValueParser(dtype, separator)
+        parts: List[Any] = []
+        deliver = on_values if on_values is not None else parts.append
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+                    termination = (getattr(handle, "read_termination", None) or "\n").encode("ascii")
+
+                    with self._command_timeout(command):
+                        handle.write(command)
+                        self._count_io(sent=len(command))
+                        while True:
+                            check_interrupt()
+                            chunk = sliced_wait(handle, lambda: handle.read_bytes(
+                                chunk_size, break_on_termchar=True))
+                            self._count_io(received=len(chunk))
+                            deliver(parser.feed(chunk))
+                            # A short read means END or the termination was reached
+                            if len(chunk) < chunk_size or chunk.endswith(termination):
+                                break
+                    if self.error_check is not None:
+                        self.error_check.record(command)
+                    deliver(parser.finish())
+
+                except ValueError:
+                    raise
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Query Error: {self.name}, address: {self.address}, command: {command}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Query Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+        if on_values is not None:
+            return None
+        return concatenate_values(parts, dtype)
 
     def query_binary(self, command: str, delay_time: float = 0.1) -> bytes:
         """
@@ -418,27 +1456,754 @@ class VISA:
         if not Setting.VISA_Send_Enable:
             return b"0"
 
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
         # Ensure we have a valid message-based resource
-        if isinstance(self.handle, pyvisa.resources.MessageBasedResource):
+        with self._io_scope():
+            if isinstance(self.handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Send command and read binary response
+                    with self._command_timeout(command):
+                        self.write(command)
+                        self._bus_delay(delay_time)
+                        response = self.read_binary()
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"[{self.name}] Binary RX: {len(response)} bytes")
+
+                    return response
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Query Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Query Binary Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def query_binary_chunks(self, command: str, on_chunk: Callable[[bytes], None],
+                            delay_time: float = 0.1,
+                            chunk_size: int = FILE_CHUNK_SIZE) -> int:
+        """
+        Send a text command and pass its binary response on piece by piece.
+
+        The response is read in chunks and each one is handed to on_chunk as
+        soon as it arrives, so a large block is never held in memory. The
+        pieces joined together equal what query_binary() returns (block
+        header, data and termination); responses that are not IEEE 488.2
+        blocks are passed on up to their termination.
+
+        Args:
+            command: Text command to send
+            on_chunk: Callback receiving each piece of the response
+            delay_time: Delay between write and read operations (seconds)
+            chunk_size: Bytes read per call
+
+        Returns:
+            Total number of bytes passed to on_chunk
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+
+        # Return dummy response if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            on_chunk(b"0")
+            return 1
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                header = bytearray()
+                total = 0
+
+                def read(count: int, break_on_termchar: bool = False) -> bytes:
+                    return sliced_wait(handle, lambda: handle.read_bytes(
+                        count, break_on_termchar=break_on_termchar))
+
+                def read_header(count: int) -> bytes:
+                    data = read(count, True)
+                    header.extend(data)
+                    return data
+
+                def deliver(chunk: bytes) -> None:
+                    nonlocal total
+                    if chunk:
+                        self._count_io(received=len(chunk))
+                        on_chunk(chunk)
+                        total += len(chunk)
+
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+                    termination = (getattr(handle, "read_termination", None) or "\n").encode("ascii")
+
+                    with self._command_timeout(command):
+                        handle.write(command)
+                        self._count_io(sent=len(command))
+                        self._bus_delay(delay_time)
+                        try:
+                            length = read_block_length(read_header)
+                            more = True
+                        except ValueError:
+                            # Not a block: the rest of the message up to its
+                            # termination (a short read means END)
+                            length = None
+                            more = len(header) >= 2 and not header.endswith(termination)
+                        deliver(bytes(header))
+
+                        if length is None:
+                            while more:
+                                check_interrupt()
+                                chunk = read(chunk_size, True)
+                                deliver(chunk)
+                                more = len(chunk) == chunk_size and not chunk.endswith(termination)
+                        else:
+                            done = 0
+                            while done < length:
+                                check_interrupt()
+                                chunk = read(min(chunk_size, length - done))
+                                deliver(chunk)
+                                done += len(chunk)
+                            deliver(self._read_optional_termination(handle, termination))
+                    if self.error_check is not None:
+                        self.error_check.record(command)
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"[{self.name}] Binary RX: {total} bytes")
+
+                    return total
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Query Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Query Binary Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    @staticmethod
+    def _read_optional_termination(handle: Any, termination: bytes) -> bytes:
+        """
+        Consume the termination after a definite-length block if it is there.
+
+        Instruments may end a block without a termination, so it is only
+        read if it has already arrived: the socket transport takes what is
+        buffered, other handles read with an immediate timeout. A blocking
+        read would otherwise wait for the full I/O timeout.
+
+        Args:
+            handle: Message-based resource that just delivered a block
+            termination: Read termination
+
+        Returns:
+            The bytes consumed (empty if nothing was pending)
+        """
+        read_pending = getattr(handle, "read_pending", None)
+        if read_pending is not None:
+            return read_pending(len(termination))
+        timeout = handle.timeout
+        try:
+            handle.timeout = 0
+            return handle.read_bytes(len(termination), break_on_termchar=True)
+        except Exception:
+            return b""  # Nothing pending: the block had no termination
+        finally:
+            handle.timeout = timeout
+
+    @staticmethod
+    def _read_block_into(handle: Any, view_for: Callable[[Optional[int]], memoryview],
+                         chunk_size: int = FILE_CHUNK_SIZE) -> int:
+        """
+        Read an IEEE 488.2 block response straight into a buffer.
+
+        Handles with read_into() (the native socket transport) receive into
+        the buffer directly; others are read in chunks and copied.
+
+        Args:
+            handle: Message-based resource with the response pending
+            view_for: Function receiving the data length (None for an
+                      indefinite block) and returning the buffer to fill
+            chunk_size: Bytes read per call
+
+        Returns:
+            Number of data bytes written to the buffer
+
+        Raises:
+            ValueError: If the response is not a block or does not fit
+        """
+        def read(count: int, break_on_termchar: bool = False) -> bytes:
+            return sliced_wait(handle, lambda: handle.read_bytes(
+                count, break_on_termchar=break_on_termchar))
+
+        termination = (getattr(handle, "read_termination", None) or "\n").encode("ascii")
+        length = read_block_length(read)
+        view = view_for(length)
+
+        if length is None:
+            # Indefinite block: ends with the termination and END
+            done = 0
+            while True:
+                check_interrupt()
+                if done == len(view):
+                    raise ValueError(f"Block does not fit in a {len(view)} byte buffer")
+                wanted = min(chunk_size, len(view) - done)
+                chunk = read(wanted, True)
+                view[done:done + len(chunk)] = chunk
+                done += len(chunk)
+                if len(chunk) < wanted or chunk.endswith(termination):
+                    break
+            if view[max(0, done - len(termination)):done] == termination:
+                done -= len(termination)
+            return done
+
+        read_into = getattr(handle, "read_into", None)
+        done = 0
+        while done < length:
+            check_interrupt()
+            target = view[done:min(length, done + chunk_size)]
+            if read_into is not None:
+                done += sliced_wait(handle, lambda: read_into(target))
+            else:
+                chunk = read(len(target))
+                target[:len(chunk)] = chunk
+                done += len(chunk)
+        VISA._read_optional_termination(handle, termination)
+        return length
+
+    def _query_block_into(self, command: str, view_for: Callable[[Optional[int]], memoryview],
+                          delay_time: float = 0.0) -> int:
+        """
+        Send a text command and read its block response into a buffer.
+
+        Args:
+            command: Text command returning a block
+            view_for: Buffer provider passed to _read_block_into()
+            delay_time: Delay between write and read operations (seconds)
+
+        Returns:
+            Number of data bytes written to the buffer
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"SCPI TX: {command}")
+
+        # Read nothing if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return 0
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    with self._command_timeout(command):
+                        handle.write(command)
+                        self._bus_delay(delay_time)
+                        size = self._read_block_into(handle, view_for)
+                    self._count_io(len(command), size)
+                    if self.error_check is not None:
+                        self.error_check.record(command)
+
+                    # Debug output if enabled
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"[{self.name}] Binary RX: {size} bytes")
+
+                    return size
+
+                except (VISAInterruptError, ValueError):
+                    # Aborted or unusable response: leave the session clean
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA Query Binary Error: {self.name}", raise_error=False)
+                    raise Exception("VISA Query Binary Error")
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+    def query_binary_into(self, command: str, buffer: Union[bytearray, memoryview],
+                          delay_time: float = 0.0) -> int:
+        """
+        Send a text command and read its block data into a caller's buffer.
+
+        The IEEE 488.2 header and termination are stripped, so repeated
+        captures reuse one allocation instead of creating bytes objects.
+
+        Args:
+            command: Text command returning a block (e.g. ':WAV:DATA?')
+            buffer: Writable buffer at least as large as the block data
+            delay_time: Delay between write and read operations (seconds)
+
+        Returns:
+            Number of data bytes written to the start of buffer
+
+        Raises:
+            ValueError: If the response is not a block or does not fit in buffer
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        view = memoryview(buffer).cast("B")
+
+        def view_for(length: Optional[int]) -> memoryview:
+            if length is not None and length > len(view):
+                raise ValueError(f"Block of {length} bytes does not fit in a "
+                                 f"{len(view)} byte buffer")
+            return view
+
+        return self._query_block_into(command, view_for, delay_time)
+
+    def query_binary_buffered(self, command: str, count: Optional[int] = None,
+                              buffers: int = 2, buffer_size: Optional[int] = None,
+                              delay_time: float = 0.0) -> Iterator[CaptureBuffer]:
+        """
+        Capture a block repeatedly into a ring of reusable buffers.
+
+        An I/O thread reads each capture straight into a free buffer while
+        the caller processes the previous one. Every yielded CaptureBuffer
+        must be released (release() or a with block) before it is refilled;
+        acquisition waits while all buffers are held, so memory stays at
+        buffers x the largest capture however long the run is. Stopping
+        the iteration early stops acquisition.
+
+        Args:
+            command: Text command returning a block (e.g. ':WAV:DATA?')
+            count: Number of captures (None runs until the iteration stops)
+            buffers: Number of buffers (2 for double buffering)
+            buffer_size: Initial buffer size in bytes (None sizes each buffer
+                         to its first capture); also the capacity used for
+                         indefinite-length blocks
+            delay_time: Delay between write and read of each capture (seconds)
+
+        Yields:
+            CaptureBuffer whose data is the capture's block data
+
+        Raises:
+            RuntimeError: If every buffer is held while waiting for the next capture
+            Exception: The first acquisition error
+        """
+        ring = BufferRing(buffers, buffer_size)
+        # Filled buffers (or the acquisition error / _DONE) in acquisition order
+        ready: "queue.Queue[Any]" = queue.Queue()
+        stop = threading.Event()
+
+        def fill_loop() -> None:
+            sequence = 0
             try:
-                # Send command and read binary response
-                self.write(command)
-                time.sleep(delay_time)
-                response = self.read_binary()
+                while count is None or sequence < count:
+                    capture = None
+                    while capture is None:
+                        if stop.is_set():
+                            return
+                        capture = ring.acquire(timeout=0.05)
+                    try:
+                        capture.size = self._query_block_into(
+                            command, lambda length: ring.reserve(capture, length), delay_time)
+                    except BaseException:
+                        ring.release(capture)
+                        raise
+                    capture.sequence = sequence
+                    capture.timestamp = time.time()
+                    ring.mark_ready(capture)
+                    ready.put(capture)
+                    sequence += 1
+            except BaseException as error:  # Delivered to the caller in order
+                ready.put(error)
+                return
+            ready.put(_DONE)
+
+        # The I/O thread runs in a copy of the caller's context (cancel tokens)
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(fill_loop,),
+                                  name=f"visa-buffers-{self.name}", daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    item = ready.get(timeout=0.05)
+                except queue.Empty:
+                    if ring.lent_count() == buffers:
+                        raise RuntimeError("All capture buffers are held; release() "
+                                           "them to continue acquiring")
+                    continue
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                ring.lend(item)
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+            # Captures that were never handed out go back to the ring
+            while True:
+                try:
+                    item = ready.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, CaptureBuffer):
+                    ring.release(item)
+
+    def download_file(self, remote: str, local: str,
+                      command: str = 'MMEM:DATA? "{remote}"',
+                      chunk_size: int = FILE_CHUNK_SIZE,
+                      on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                      expect_termination: bool = True) -> TransferResult:
+        """
+        Stream a file from instrument mass storage to a local file.
 
-                # Debug output if enabled
-                if Setting.VISA_Print_Enable:
-                    logger.debug(f"[{self.name}] Binary RX: {len(response)} bytes")
+        The IEEE 488.2 block is read in chunks and written to disk as it
+        arrives, without a pre-read delay. The data goes to '<local>.part'
+        first and replaces local only once the transfer is complete.
 
-                return response
+        Args:
+            remote: File name on the instrument
+            local: Local destination path
+            command: Query template with a '{remote}' placeholder
+            chunk_size: Bytes read per call
+            on_progress: Optional callback receiving (bytes done, total bytes);
+                         total is None for indefinite-length blocks
+            expect_termination: Read the termination that follows the block
 
-            except Exception:
-                # Communication error occurred
-                logger.error(f"VISA Query Binary Error: {self.name}", raise_error=False)
-                raise Exception("VISA Query Binary Error")
-        else:
-            # Invalid handle state
-            raise Exception("not MessageBasedResource")
+        Returns:
+            TransferResult with the size and duration
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Download: {remote} -> {local}")
+
+        # Transfer nothing if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return TransferResult(local, 0, 0.0)
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        partial = local + ".part"
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                def read(count: int, break_on_termchar: bool = False) -> bytes:
+                    return sliced_wait(handle, lambda: handle.read_bytes(
+                        count, break_on_termchar=break_on_termchar))
+
+                start = time.perf_counter()
+                done = 0
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+                    query = command.format(remote=remote)
+                    handle.write(query)
+                    self._count_io(sent=len(query))
+
+                    total = read_block_length(read)
+                    termination = (getattr(handle, "read_termination", None) or "\n").encode("ascii")
+                    with open(partial, "wb") as file:
+                        while total is None or done < total:
+                            check_interrupt()
+                            if total is None:
+                                # Indefinite block: ends with the termination and END
+                                chunk = read(chunk_size, True)
+                                last = len(chunk) < chunk_size or chunk.endswith(termination)
+                                if last:
+                                    chunk = self._strip_termination(handle, chunk)
+                            else:
+                                chunk = read(min(chunk_size, total - done))
+                                last = False
+                            file.write(chunk)
+                            self._count_io(received=len(chunk))
+                            done += len(chunk)
+                            if on_progress is not None:
+                                on_progress(done, total)
+                            if last:
+                                break
+
+                    if total is not None and expect_termination:
+                        self._read_optional_termination(handle, termination)
+                    _os.replace(partial, local)
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Download Error: {self.name}, address: {self.address}, file: {remote}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Download Error")
+                finally:
+                    # Never leave a partial download behind
+                    if _os.path.exists(partial):
+                        _os.remove(partial)
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+        result = TransferResult(local, done, time.perf_counter() - start)
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Downloaded {result.size} bytes "
+                         f"({result.throughput / 1e6:.1f} MB/s)")
+        return result
+
+    def upload_file(self, local: str, remote: str,
+                    command: str = 'MMEM:DATA "{remote}",',
+                    chunk_size: int = FILE_CHUNK_SIZE,
+                    on_progress: Optional[Callable[[int, Optional[int]], None]] = None
+                    ) -> TransferResult:
+        """
+        Stream a local file to instrument mass storage.
+
+        The file is sent as one IEEE 488.2 block message, read in chunks
+        through a reused buffer. VISA library handles are written a bytes
+        copy of each chunk (the ctypes backends do not accept buffers);
+        handles with accepts_buffers get the views directly. END is only
+        asserted on the final write of the message.
+
+        Args:
+            local: Local source path
+            remote: File name on the instrument
+            command: Command prefix template with a '{remote}' placeholder
+            chunk_size: Bytes written per call
+            on_progress: Optional callback receiving (bytes done, total bytes)
+
+        Returns:
+            TransferResult with the size and duration
+
+        Raises:
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Upload: {local} -> {remote}")
+
+        size = _os.path.getsize(local)
+
+        # Transfer nothing if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return TransferResult(local, 0, 0.0)
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        # Ensure we have a valid message-based resource
+        with self._io_scope():
+            handle = self.handle
+            if isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                send_end = getattr(handle, "send_end", None)
+                start = time.perf_counter()
+                done = 0
+                try:
+                    # Discard stale data from a previous transaction before sending
+                    self._flush_input_buffer()
+
+                    termination = (getattr(handle, "write_termination", "\n") or "").encode("ascii")
+                    with open(local, "rb") as file:
+                        if send_end is not None:
+                            handle.send_end = send_end and size == 0 and not termination
+                        prefix = command.format(remote=remote).encode("utf-8") + block_header(size)
+                        handle.write_raw(prefix)
+                        self._count_io(sent=len(prefix))
+                        accepts_buffers = getattr(handle, "accepts_buffers", False)
+                        for chunk in iter_file_chunks(file, chunk_size):
+                            check_interrupt()
+                            done += len(chunk)
+                            if send_end is not None:
+                                # Assert END only with the last piece of the message
+                                handle.send_end = send_end and done >= size and not termination
+                            handle.write_raw(chunk if accepts_buffers else bytes(chunk))
+                            self._count_io(sent=len(chunk))
+                            if on_progress is not None:
+                                on_progress(done, size)
+
+                    if termination:
+                        if send_end is not None:
+                            handle.send_end = send_end
+                        handle.write_raw(termination)
+
+                except VISAInterruptError:
+                    # Aborted: leave the session clean for the next operation
+                    self._abort_transaction()
+                    raise
+                except Exception:
+                    # Communication error occurred
+                    logger.error(
+                        f"VISA Upload Error: {self.name}, address: {self.address}, file: {remote}",
+                        raise_error=False,
+                    )
+                    raise Exception("VISA Upload Error")
+                finally:
+                    if send_end is not None:
+                        handle.send_end = send_end
+            else:
+                # Invalid handle state
+                raise Exception("not MessageBasedResource")
+
+        result = TransferResult(local, done, time.perf_counter() - start)
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Uploaded {result.size} bytes "
+                         f"({result.throughput / 1e6:.1f} MB/s)")
+        return result
+
+    def wait_for_srq(self, mask: int = STB_RQS, timeout: Optional[float] = None,
+                     poll_interval: float = SRQ_POLL_INTERVAL) -> int:
+        """
+        Wait until the instrument's status byte matches a mask.
+
+        Uses the backend's service request events where available (the wait
+        ends as soon as SRQ is asserted) and polls the status byte every
+        poll_interval otherwise. The instrument must be set up to request
+        service, e.g. write('*ESE 1;*SRE 32;INIT;*OPC') before waiting. Only
+        the status byte reads are I/O operations: the bus is not held while
+        waiting, so other operations can proceed, and the wait is not counted
+        in the session statistics.
+
+        Args:
+            mask: Status byte bits to wait for (any of them ends the wait)
+            timeout: Maximum wait in seconds (None waits indefinitely)
+            poll_interval: Polling interval without SRQ events (seconds)
+
+        Returns:
+            Status byte that matched
+
+        Raises:
+            SRQTimeoutError: If the status byte does not match in time
+            VISAInterruptError: If interrupted while waiting
+            Exception: If handle is not a valid MessageBasedResource
+            Exception: If communication error occurs
+        """
+        # Debug output if enabled
+        if Setting.VISA_Print_Enable:
+            logger.debug(f"[{self.name}] Wait SRQ: mask {mask:#04x}")
+
+        # Report the request as served if VISA is disabled
+        if not Setting.VISA_Send_Enable:
+            return mask
+
+        # Open deferred connection on first use
+        if self._pending_open:
+            self.ensure_open()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        first = True
+        while True:
+            check_interrupt()
+            remaining = SRQ_WAIT_SLICE if deadline is None else deadline - time.monotonic()
+            # Wait outside any I/O operation: the bus stays free and the wait
+            # is not counted; only the session is kept from being evicted
+            with self._session_held():
+                handle = self.handle
+                if not isinstance(handle, _registry.MESSAGE_BASED_TYPES):
+                    raise Exception("not MessageBasedResource")
+                if self._srq_events is None or self._srq_events[0] is not handle:
+                    self._srq_events = (handle, enable_srq_events(handle))
+                events = self._srq_events[1]
+                try:
+                    # Check once up front: the request may already be pending
+                    requested = first or not events or wait_srq_event(
+                        handle, max(0.0, min(remaining, SRQ_WAIT_SLICE)))
+                except Exception:
+                    # Communication error occurred
+                    logger.error(f"VISA SRQ Error: {self.name}", raise_error=False)
+                    raise Exception("VISA SRQ Error")
+            first = False
+
+            if requested:
+                # Reading the status byte is the I/O operation
+                with self._io_scope():
+                    try:
+                        status = read_status_byte(self.handle)
+                    except Exception:
+                        # Communication error occurred
+                        logger.error(f"VISA SRQ Error: {self.name}", raise_error=False)
+                        raise Exception("VISA SRQ Error")
+                if status & mask:
+                    if Setting.VISA_Print_Enable:
+                        logger.debug(f"[{self.name}] SRQ: status {status:#04x}")
+                    return status
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise SRQTimeoutError("VISA SRQ Timeout")
+            if not events:
+                interruptible_sleep(poll_interval if deadline is None
+                                    else min(poll_interval, max(0.0, deadline - time.monotonic())))
+
+    def on_srq(self, callback: Optional[Callable[[int], None]], mask: int = STB_RQS,
+               poll_interval: float = 0.05) -> Optional[SRQListener]:
+        """
+        Call a function on every service request of this instrument.
+
+        A background listener waits as in wait_for_srq() and calls
+        callback(status_byte) on its own thread. Only one callback is
+        registered per instance; close() removes it.
+
+        The listener needs a serial poll (GPIB, USBTMC, VXI-11/HiSLIP): on
+        transports that can only read the status byte with '*STB?', its polls
+        would interleave with the caller's own queries, so registering is
+        refused there. Use wait_for_srq() from the thread doing the I/O
+        instead.
+
+        Args:
+            callback: Function receiving the status byte, or None to remove
+                      the registered callback
+            mask: Status byte bits that count as a service request
+            poll_interval: Polling interval without SRQ events (seconds)
+
+        Returns:
+            The running listener, or None when removed
+
+        Raises:
+            RuntimeError: If the status byte can only be read with a query
+        """
+        if self._srq_listener is not None:
+            self._srq_listener.stop(0)
+            self._srq_listener = None
+        if callback is not None:
+            # Open deferred connection to check its transport
+            if self._pending_open:
+                self.ensure_open()
+            if Setting.VISA_Send_Enable and not has_serial_poll(self.handle):
+                raise RuntimeError(f"VISA SRQ Error: {self.name} has no serial poll; "
+                                   "a listener's '*STB?' would mix with other queries")
+            self._srq_listener = SRQListener(self, callback, mask, poll_interval)
+        return self._srq_listener
 
     # Static utility methods for resource management
     @staticmethod
@@ -449,11 +2214,44 @@ class VISA:
         Returns:
             List of VISA resource addresses
         """
-        try:
-            resource_manager = pyvisa.ResourceManager()
-            return list(resource_manager.list_resources())
-        except Exception:
-            return []
+        return _registry.list_resources()
+
+    @staticmethod
+    def _query_idn(address: str) -> Optional[str]:
+        """
+        Query *IDN? on an address, reusing a registered session if available.
+
+        Args:
+            address: VISA resource address
+
+        Returns:
+            Identification string, or None if the address cannot be queried
+        """
+        return _registry.query_idn(address)
+
+    @staticmethod
+    def register_alias(alias: str, address: str) -> str:
+        """
+        Register a logical name or serial number for a resource address.
+
+        The instrument is identified with *IDN? so that the alias can later
+        be re-located by a rescan if its address changes.
+
+        Args:
+            alias: Logical name or serial number
+            address: VISA resource address
+
+        Returns:
+            Identification string stored with the alias
+
+        Raises:
+            Exception: If the instrument at the address cannot be identified
+        """
+        idn = VISA._query_idn(address)
+        if idn is None:
+            raise Exception(f"VISA Alias Register Error: {alias}, address: {address}")
+        get_alias_cache().set(alias, address, idn)
+        return idn
 
     @staticmethod
     def get_opened_connections() -> List[Tuple[str, pyvisa.resources.MessageBasedResource]]:
@@ -470,16 +2268,276 @@ class VISA:
         """
         Close all opened VISA connections.
         """
-        global opened_connections
+        _registry.close_all()
+
+    @staticmethod
+    def get_pool_stats() -> Dict[str, Any]:
+        """
+        Get connection pool occupancy.
+
+        Returns:
+            Dictionary with open/in-use/idle session counts, per-interface
+            counts, configured limits and the number of evictions so far
+        """
+        return _registry.get_pool_stats()
+
+    @staticmethod
+    def get_session_stats() -> Dict[str, Dict[str, Any]]:
+        """
+        Get I/O statistics for every pooled session.
+
+        Cheap enough to poll from a monitoring thread: only counters are
+        copied. Sorting by 'io_seconds' or 'utilization' shows which
+        instrument a station spends its time on.
+
+        Returns:
+            Dictionary mapping address to open time, last use, users
+            (count and names), in-flight operations, operation count, bytes
+            out/in, cumulative I/O seconds, mean operation time,
+            utilization (I/O time / session age), errors, open retries and
+            input buffer flushes
+        """
+        return _registry.get_session_stats()
+
+    @staticmethod
+    def evict_idle_connections(idle_timeout: Optional[float] = None) -> int:
+        """
+        Close pooled sessions idle longer than the timeout.
+
+        Owners reopen evicted sessions transparently on next use.
+
+        Args:
+            idle_timeout: Idle time in seconds (defaults to
+                          Setting.VISA_Pool_Idle_Timeout)
+
+        Returns:
+            Number of sessions closed
+        """
+        return _registry.evict_idle_sessions(idle_timeout)
+
+    @staticmethod
+    def get_leaked_handles() -> List[Dict[str, Any]]:
+        """
+        Get VISA instances garbage-collected without close() or release().
+
+        Only recorded while Setting.VISA_Leak_Detect is enabled.
+
+        Returns:
+            List of leak records (name, address, opened_at, collected_at,
+            created_stack)
+        """
+        return _registry.get_leaked_handles()
+
+    @staticmethod
+    def get_bus_stats() -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-bus utilization metrics from the bus scheduler.
+
+        Returns:
+            Mapping of bus name (e.g. 'GPIB0') to transfers, busy/wait time,
+            max wait, utilization and queue length
+        """
+        return get_scheduler().get_stats()
+
+    @staticmethod
+    def warm_up_connections(station: Union[Dict[str, str], Iterable[str]],
+                            skip_clear: bool = False) -> List[str]:
+        """
+        Pre-open a station's connections in background threads.
+
+        A later VISA(name, address) for a warmed address picks up the ready
+        handle from the registry, waiting only if its warm-up is in flight.
+
+        Args:
+            station: Mapping of instrument name to address, or iterable of
+                     addresses (aliases and serial numbers are accepted)
+            skip_clear: Skip the device clear performed after opening
+
+        Returns:
+            Addresses whose warm-up was started
+        """
+        if not Setting.VISA_Send_Enable:
+            return []
+        return _registry.warm_up(station, skip_clear=skip_clear)
+
+    @staticmethod
+    def get_warming_connections() -> List[str]:
+        """
+        Get addresses whose background warm-up has not finished yet.
+
+        Returns:
+            List of addresses or aliases still being opened
+        """
+        return _registry.get_warming_connections()
+
+
+# Fast path: instances switched to specialized classes on Setting changes
+_FAST_PATH_SETTINGS = ("VISA_Send_Enable", "VISA_Print_Enable", "VISA_Bus_Schedule_Enable",
+                       "IS_INTERRUPT", "VISA_Interrupt_Slice")
+_fast_path_instances: "weakref.WeakSet[VISA]" = weakref.WeakSet()
+_fast_path_classes: Dict[Tuple[type, str], type] = {}
+_DISCARD_RECEIVE_BUFFER = pyvisa.constants.BufferOperation.discard_receive_buffer
 
-        for address, handle in opened_connections:
+
+class _SilentMethods:
+    """I/O methods while VISA_Send_Enable and VISA_Print_Enable are off."""
+
+    def query(self, command: str, delay_time: Optional[float] = None) -> str:
+        return "0"
+
+    def write(self, command: str) -> None:
+        return None
+
+    def read(self, count: Optional[int] = None) -> str:
+        return "0"
+
+    def query_bytes(self, command: str, delay_time: Optional[float] = None) -> bytes:
+        return b"0"
+
+    def read_binary(self) -> bytes:
+        return b""
+
+    def write_binary(self, command: bytes) -> None:
+        return None
+
+
+class _DirectMethods:
+    """
+    I/O methods while sending without tracing or bus scheduling.
+
+    A live pooled session guarantees a message-based handle, so the type
+    check is skipped; without one, inside a cancellation() block, with
+    adaptive timeouts or error checking, or nested in another operation, the
+    generic implementation (which reopens lazy or evicted sessions, checks
+    cancel tokens, applies timeouts and error checks and accounts nested
+    I/O) is used.
+    """
+
+    def query(self, command: str, delay_time: Optional[float] = None) -> str:
+        session = self._session
+        if (session is None or current_token() is not None or _io_state.depth
+                or self.adaptive_timeout is not None or self.error_check is not None
+                or not session.acquire()):
+            return VISA.query(self, command, delay_time)
+        start = time.perf_counter()
+        flushes = 0
+        response = None
+        try:
+            handle = self.handle
             try:
-                if isinstance(handle, pyvisa.resources.MessageBasedResource):
-                    handle.close()
+                handle.flush(_DISCARD_RECEIVE_BUFFER)
+                flushes = 1
             except Exception:
-                pass  # Ignore errors during close
+                pass  # Flush not supported by this backend/instrument; ignore
+            try:
+                response = handle.query(command, delay_time)
+                return response
+            except Exception:
+                logger.error(
+                    f"VISA Query Error: {self.name}, address: {self.address}, command: {command}",
+                    raise_error=False,
+                )
+                raise Exception("VISA Query Error")
+        finally:
+            session.release(time.perf_counter() - start, len(command),
+                            0 if response is None else len(response), flushes, response is None)
+
+    def write(self, command: str) -> None:
+        session = self._session
+        if (session is None or current_token() is not None or _io_state.depth
+                or self.adaptive_timeout is not None or self.error_check is not None
+                or not session.acquire()):
+            return VISA.write(self, command)
+        start = time.perf_counter()
+        flushes = 0
+        failed = True
+        try:
+            handle = self.handle
+            try:
+                handle.flush(_DISCARD_RECEIVE_BUFFER)
+                flushes = 1
+            except Exception:
+                pass  # Flush not supported by this backend/instrument; ignore
+            try:
+                handle.write(command)
+                failed = False
+            except Exception:
+                logger.error(
+                    f"VISA Write Error: {self.name}, address: {self.address}, command: {command}",
+                    raise_error=False,
+                )
+                raise Exception("VISA Write Error")
+        finally:
+            session.release(time.perf_counter() - start, 0 if failed else len(command), 0,
+                            flushes, failed)
+
+    def read(self, count: Optional[int] = None) -> str:
+        session = self._session
+        if (session is None or current_token() is not None or _io_state.depth
+                or not session.acquire()):
+            return VISA.read(self, count)
+        start = time.perf_counter()
+        response = None
+        try:
+            handle = self.handle
+            try:
+                if isinstance(count, int):
+                    response = handle.read_bytes(count).decode(self.encoding)
+                else:
+                    response = handle.read()
+                return response
+            except Exception:
+                logger.error(f"VISA Read Error: {self.name}", raise_error=False)
+                raise Exception("VISA Read Error")
+        finally:
+            session.release(time.perf_counter() - start, 0,
+                            0 if response is None else len(response), 0, response is None)
+
+
+def _fast_path_class(base: type) -> type:
+    """
+    Get the specialization of a VISA class for the current Setting values.
+
+    Only methods the base class inherits unchanged from VISA are replaced,
+    so driver subclasses keep their own overrides.
 
-        opened_connections.clear()
+    Args:
+        base: VISA or a subclass of it
+
+    Returns:
+        Specialized subclass of base, or base itself when no fast path applies
+    """
+    if not Setting.VISA_Send_Enable and not Setting.VISA_Print_Enable:
+        mode, methods = "silent", _SilentMethods
+    elif (Setting.VISA_Send_Enable and not Setting.VISA_Print_Enable
+          and not Setting.VISA_Bus_Schedule_Enable and not Setting.IS_INTERRUPT
+          and not Setting.VISA_Interrupt_Slice):
+        mode, methods = "direct", _DirectMethods
+    else:
+        return base
+
+    key = (base, mode)
+    specialized = _fast_path_classes.get(key)
+    if specialized is None:
+        namespace = {name: function for name, function in vars(methods).items()
+                     if callable(function) and getattr(base, name) is getattr(VISA, name)}
+        namespace["__doc__"] = base.__doc__
+        namespace["__module__"] = base.__module__
+        specialized = type(base.__name__, (base,), namespace)
+        specialized.__qualname__ = base.__qualname__
+        _fast_path_classes[key] = specialized
+    return specialized
+
+
+def _on_setting_changed(name: str, value: Any) -> None:
+    """Rebind fast-path instances when a setting they depend on changes."""
+    if name not in _FAST_PATH_SETTINGS:
+        return
+    for instance in list(_fast_path_instances):
+        instance.__class__ = _fast_path_class(instance._fast_path_base)
+
+
+Setting.add_listener(_on_setting_changed)
 
 
 class VISAManager:
@@ -492,14 +2550,19 @@ class VISAManager:
     def __init__(self):
         """Initialize VISA manager."""
         self.instruments: dict[str, VISA] = {}
+        self._station: Dict[str, str] = {}
 
-    def add_instrument(self, name: str, address: str) -> VISA:
+    def add_instrument(self, name: str, address: str, lazy: bool = False,
+                       transport: str = "visa", encoding: str = "utf-8") -> VISA:
         """
         Add and connect to an instrument.
 
         Args:
             name: Unique instrument identifier
-            address: VISA resource address
+            address: VISA resource address, logical name or serial number
+            lazy: Defer connecting until the instrument is first used
+            transport: "visa" or "socket" (see VISA)
+            encoding: Text encoding of read(count) responses (see VISA)
 
         Returns:
             VISA instrument instance
@@ -510,7 +2573,8 @@ class VISAManager:
         if name in self.instruments:
             raise ValueError(f"Instrument '{name}' already exists")
 
-        instrument = VISA(name, address)
+        instrument = VISA(name, address, lazy=lazy, transport=transport,
+                          encoding=encoding)
         self.instruments[name] = instrument
         return instrument
 
@@ -548,6 +2612,40 @@ class VISAManager:
             instrument.close()
         self.instruments.clear()
 
+    def warm_up(self, station: Dict[str, str], skip_clear: bool = False) -> None:
+        """
+        Pre-open a station's instruments in the background.
+
+        Instruments added later with add_instrument() pick up the warmed
+        handles from the connection registry.
+
+        Args:
+            station: Mapping of instrument name to address
+            skip_clear: Skip the device clear performed after opening
+        """
+        self._station = dict(station)
+        VISA.warm_up_connections(self._station, skip_clear=skip_clear)
+
+    def warming_instruments(self) -> List[str]:
+        """
+        List station instruments whose connections are still warming up.
+
+        Returns:
+            Names of instruments passed to warm_up() that are not ready yet
+        """
+        warming = set(VISA.get_warming_connections())
+        return [name for name, address in self._station.items() if address in warming]
+
+    def __enter__(self) -> "VISAManager":
+        """Return the manager for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        """Release every managed instrument's pooled session."""
+        for instrument in self.instruments.values():
+            instrument.release()
+        self.instruments.clear()
+
     def list_instruments(self) -> List[str]:
         """
         List all managed instrument names.
@@ -557,6 +2655,93 @@ class VISAManager:
         """
         return list(self.instruments.keys())
 
+    def run_parallel(self, operations: Dict[str, Callable[[VISA], Any]]) -> Dict[str, Any]:
+        """
+        Run one operation per instrument, parallel across buses.
+
+        Operations on instruments sharing a bus (e.g. GPIB0) run one after
+        another in instrument priority order; different buses and LAN
+        instruments run concurrently.
+
+        Args:
+            operations: Mapping of instrument name to a callable taking the
+                        VISA instance
+
+        Returns:
+            Mapping of instrument name to the operation's result
+
+        Raises:
+            KeyError: If an instrument name is not managed
+        """
+        names = list(operations.keys())
+        jobs = []
+        for name in names:
+            instrument = self.instruments[name]
+            operation = operations[name]
+            jobs.append((instrument.address, instrument.priority,
+                         lambda instrument=instrument, operation=operation: operation(instrument)))
+        results = get_scheduler().run_by_bus(jobs)
+        return dict(zip(names, results))
+
+    def run_sweep(self, axes: List[Any], measurements: List[Any],
+                  pipelined: bool = True) -> Any:
+        """
+        Run a declarative set/measure sweep over managed instruments.
+
+        Args:
+            axes: Sweep.SweepAxis setpoints, outermost first
+            measurements: Sweep.Measurement queries taken at every point
+            pipelined: Overlap measurements across instruments
+
+        Returns:
+            NumPy structured array of results (see Sweep.run)
+        """
+        # Imported here: Sweep builds on this module
+        from .Sweep import Sweep
+        return Sweep(self, axes, measurements).run(pipelined=pipelined)
+
+    def trigger_group(self, names: List[str]) -> Any:
+        """
+        Create a group of instruments armed, triggered and fetched together.
+
+        Args:
+            names: Instrument names in the group
+
+        Returns:
+            TriggerGroup.TriggerGroup for the instruments
+
+        Raises:
+            KeyError: If a name is not managed
+        """
+        # Imported here: TriggerGroup builds on this module
+        from .TriggerGroup import TriggerGroup
+        return TriggerGroup(self, names)
+
+    def pipeline(self, name: str, command: str, stages: List[Callable[[Any], Any]],
+                 **options: Any) -> Any:
+        """
+        Create an acquisition pipeline overlapping transfers with processing.
+
+        Args:
+            name: Instrument to acquire from
+            command: Binary query fetching one capture
+            stages: Processing functions applied in a worker pool
+            **options: AcquisitionPipeline options (max_pending, workers,
+                       executor, delay_time, acquire)
+
+        Returns:
+            Pipeline.AcquisitionPipeline for the instrument
+
+        Raises:
+            KeyError: If the instrument is not managed
+        """
+        instrument = self.get_instrument(name)
+        if instrument is None:
+            raise KeyError(f"Instrument '{name}' is not managed")
+        # Imported here: Pipeline builds on this module
+        from .Pipeline import AcquisitionPipeline
+        return AcquisitionPipeline(instrument, command, stages, **options)
+
     @staticmethod
     def discover_instruments() -> List[str]:
         """
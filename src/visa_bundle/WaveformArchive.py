@@ -0,0 +1,427 @@
+"""
+Waveform Archive - Chunked, compressed storage of captured data
+
+Stores captures (e.g. query_binary() results) as NumPy arrays split into
+chunks along their first axis, each compressed on its own with zlib or lzma
+from the standard library, together with per-capture metadata (instrument
+IDN, command, timestamps, scaling). Integer samples are delta-encoded
+within each chunk first, which shrinks slowly varying waveforms and speeds
+up compression. A JSON index at the end of the file records every chunk's
+offset, so one chunk or a range of samples is read without decompressing
+the rest of the capture.
+
+File layout::
+
+    MAGIC | chunk data ... | JSON index | index offset, index length, MAGIC
+
+Appending writes the new chunks, index and footer after the previous footer
+without touching earlier bytes, so the previous index stays valid until the
+new footer is complete. An archive whose append session did not close (e.g.
+a crash) opens with the last complete index, found by scanning back from
+the end; only the captures of that session are lost. NumPy is optional:
+without it captures are stored and returned as bytes.
+"""
+
+import json
+import lzma
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .BinaryBlock import block_data
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+MAGIC = b"VBWAVE01"
+_FOOTER = struct.Struct("<QQ8s")
+
+# Uncompressed bytes per chunk
+ARCHIVE_CHUNK_SIZE: int = 1 << 20
+
+CODECS = ("zlib", "lzma", "none")
+
+
+def _compress(data: memoryview, codec: str, level: int) -> bytes:
+    """Compress one chunk."""
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    return bytes(data)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Decompress one chunk."""
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return data
+
+
+class WaveformArchive:
+    """
+    Archive file of compressed captures with random chunk access.
+
+    Open with mode 'w' (create), 'a' (append) or 'r' (read). Not safe for
+    concurrent use from several threads.
+    """
+
+    def __init__(self, path: str, mode: str = "r", codec: str = "zlib",
+                 level: int = 1, chunk_size: int = ARCHIVE_CHUNK_SIZE, delta: bool = True):
+        """
+        Open the archive.
+
+        Args:
+            path: Archive file path
+            mode: 'r' to read, 'w' to create (overwrites), 'a' to append
+            codec: Compression of new captures ('zlib', 'lzma' or 'none')
+            level: Compression level (zlib 0-9, lzma preset 0-9)
+            chunk_size: Uncompressed bytes per chunk of new captures
+            delta: Delta-encode integer captures within each chunk
+
+        Raises:
+            ValueError: If the mode or codec is unknown, or the file is not an archive
+        """
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Unknown mode '{mode}'")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}'")
+        self.path: str = path
+        self.mode: str = mode
+        self.codec: str = codec
+        self.level: int = level
+        self.chunk_size: int = chunk_size
+        self.delta: bool = delta
+        self._captures: Dict[str, Dict[str, Any]] = {}
+        # Instrument IDN per address, queried once by capture()
+        self._idn: Dict[str, str] = {}
+        self._dirty: bool = False
+
+        if mode == "w" or (mode == "a" and not os.path.exists(path)):
+            self._file = open(path, "w+b")
+            self._file.write(MAGIC)
+            self._end = len(MAGIC)
+            self._dirty = True
+        else:
+            self._file = open(path, "rb" if mode == "r" else "r+b")
+            self._end = self._load_index()
+
+    def _load_index(self) -> int:
+        """Read the newest complete index and return the offset where it ends."""
+        file = self._file
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{self.path}' is not a waveform archive")
+        end = file.seek(0, os.SEEK_END)
+        captures = self._read_index(end)
+        if captures is None:
+            # An append session did not close: fall back to the previous index
+            captures, end = self._recover_index(end)
+            if self.mode == "a":
+                file.truncate(end)
+        self._captures = captures
+        return end
+
+    def _read_index(self, end: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read the index whose footer ends at offset end, or None if there is none."""
+        file = self._file
+        if end < len(MAGIC) + _FOOTER.size:
+            return None
+        file.seek(end - _FOOTER.size)
+        offset, length, magic = _FOOTER.unpack(file.read(_FOOTER.size))
+        if magic != MAGIC or offset < len(MAGIC) or offset + length != end - _FOOTER.size:
+            return None
+        file.seek(offset)
+        try:
+            captures = json.loads(file.read(length).decode("utf-8"))
+        except ValueError:
+            return None
+        return captures if isinstance(captures, dict) else None
+
+    def _recover_index(self, end: int) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Scan back from end for the last complete footer and read its index."""
+        file = self._file
+        stop = end
+        while stop > len(MAGIC):
+            start = max(len(MAGIC), stop - ARCHIVE_CHUNK_SIZE)
+            file.seek(start)
+            # Overlap the previous block so a footer split between blocks is found
+            data = file.read(min(end, stop + len(MAGIC) - 1) - start)
+            found = data.rfind(MAGIC)
+            while found >= 0:
+                if start + found < stop:
+                    footer_end = start + found + len(MAGIC)
+                    captures = self._read_index(footer_end)
+                    if captures is not None:
+                        return captures, footer_end
+                found = data.rfind(MAGIC, 0, found)
+            stop = start
+        raise ValueError(f"'{self.path}' is incomplete (archive not closed)")
+
+    def __enter__(self) -> "WaveformArchive":
+        """Return the open archive."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        """Close the archive, writing the index."""
+        self.close()
+
+    def close(self) -> None:
+        """Write the index (when modified) and close the file."""
+        if self._file.closed:
+            return
+        if self._dirty:
+            index = json.dumps(self._captures).encode("utf-8")
+            self._file.seek(self._end)
+            self._file.write(index)
+            self._file.write(_FOOTER.pack(self._end, len(index), MAGIC))
+            self._file.truncate()
+            self._dirty = False
+        self._file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._captures
+
+    def __len__(self) -> int:
+        return len(self._captures)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._captures)
+
+    def names(self) -> List[str]:
+        """
+        Get the capture names in the order they were added.
+
+        Returns:
+            Capture names
+        """
+        return list(self._captures)
+
+    def metadata(self, name: str) -> Dict[str, Any]:
+        """
+        Get a capture's metadata.
+
+        Args:
+            name: Capture name
+
+        Returns:
+            Metadata given to add() plus the stored dtype, shape and size
+
+        Raises:
+            KeyError: If the capture does not exist
+        """
+        capture = self._capture(name)
+        return dict(capture["metadata"], dtype=capture["dtype"],
+                    shape=capture["shape"], nbytes=capture["nbytes"])
+
+    def _capture(self, name: str) -> Dict[str, Any]:
+        """Get a capture's index entry."""
+        capture = self._captures.get(name)
+        if capture is None:
+            raise KeyError(f"Capture '{name}' not found")
+        return capture
+
+    def add(self, name: str, data: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Compress and store a capture.
+
+        Args:
+            name: Unique capture name
+            data: NumPy array, or bytes-like data (e.g. a query_binary() result;
+                  an IEEE block header is not stripped, see capture())
+            metadata: JSON-serializable metadata (e.g. IDN, command, timestamps,
+                      scaling with 'scale' and 'offset')
+
+        Raises:
+            ValueError: If the archive is read-only or the name exists
+        """
+        if self.mode == "r":
+            raise ValueError("Archive is opened read-only")
+        if name in self._captures:
+            raise ValueError(f"Capture '{name}' already exists")
+
+        if numpy is not None and isinstance(data, numpy.ndarray):
+            flat = numpy.ascontiguousarray(data).reshape(-1)
+            dtype, shape = data.dtype.str, list(data.shape)
+            row_size = int(numpy.prod(data.shape[1:])) if data.ndim > 1 else 1
+            delta = self.delta and data.dtype.kind in "iu"
+        elif numpy is not None:
+            flat = numpy.frombuffer(data, dtype=numpy.uint8)
+            dtype, shape, row_size, delta = "|u1", [len(flat)], 1, self.delta
+        else:
+            flat = memoryview(data).cast("B")
+            dtype, shape, row_size, delta = "|u1", [len(flat)], 1, False
+
+        # Chunks hold whole rows so each one decodes into complete rows
+        itemsize = flat.itemsize
+        rows_per_chunk = max(1, self.chunk_size // max(1, row_size * itemsize))
+        step = rows_per_chunk * row_size
+        chunks = []
+        file = self._file
+        file.seek(self._end)
+        for start in range(0, len(flat), step):
+            part = flat[start:start + step]
+            if delta:
+                # Wrapping differences; the first sample is kept as is
+                part = numpy.diff(part, prepend=part.dtype.type(0))
+            if numpy is not None:
+                part = memoryview(part.view(numpy.uint8))
+            compressed = _compress(part, self.codec, self.level)
+            file.write(compressed)
+            chunks.append([self._end, len(compressed)])
+            self._end += len(compressed)
+
+        self._captures[name] = {
+            "dtype": dtype, "shape": shape, "nbytes": len(flat) * itemsize, "codec": self.codec,
+            "delta": delta, "rows_per_chunk": rows_per_chunk, "chunks": chunks,
+            "metadata": dict(metadata or {}),
+        }
+        self._dirty = True
+
+    def capture(self, instrument: Any, command: str, name: Optional[str] = None,
+                dtype: str = "i1", scaling: Optional[Dict[str, float]] = None,
+                delay_time: float = 0.1, **metadata: Any) -> str:
+        """
+        Fetch a binary capture from an instrument and store it.
+
+        The block header is stripped and the data stored as dtype, together
+        with the instrument IDN (queried once per instrument), the command
+        and the request/response timestamps.
+
+        Args:
+            instrument: VISA instance to query
+            command: Binary query (e.g. ':WAV:DATA?')
+            name: Capture name (default '<instrument>_<n>')
+            dtype: Sample type of the block data (little-endian)
+            scaling: Optional scaling such as {'scale': ..., 'offset': ...,
+                     'x_increment': ...}
+            delay_time: Delay between write and read (seconds)
+            **metadata: Additional JSON-serializable metadata
+
+        Returns:
+            Capture name
+        """
+        address = instrument.address
+        if address not in self._idn:
+            self._idn[address] = instrument.query("*IDN?").strip()
+        requested_at = time.time()
+        response = instrument.query_binary(command, delay_time)
+        received_at = time.time()
+
+        data = block_data(response)
+        if numpy is not None:
+            data = numpy.frombuffer(data, dtype=numpy.dtype(dtype).newbyteorder("<"))
+        if name is None:
+            name = f"{instrument.name}_{len(self._captures)}"
+        self.add(name, data, dict(metadata, instrument=instrument.name, address=address,
+                                  idn=self._idn[address], command=command,
+                                  requested_at=requested_at, received_at=received_at,
+                                  scaling=scaling or {}))
+        return name
+
+    def chunk_count(self, name: str) -> int:
+        """
+        Get the number of chunks of a capture.
+
+        Args:
+            name: Capture name
+
+        Returns:
+            Number of chunks
+        """
+        return len(self._capture(name)["chunks"])
+
+    def _read_raw(self, capture: Dict[str, Any], index: int) -> Any:
+        """Read and decompress one chunk, returning its bytes."""
+        offset, length = capture["chunks"][index]
+        self._file.seek(offset)
+        raw = _decompress(self._file.read(length), capture["codec"])
+        if not capture.get("delta"):
+            return raw
+        if numpy is None:
+            raise ValueError("Delta-encoded captures need NumPy to be read")
+        dtype = numpy.dtype(capture["dtype"])
+        samples = numpy.frombuffer(raw, dtype=dtype).cumsum(dtype=dtype)
+        return memoryview(samples.view(numpy.uint8))
+
+    def _as_array(self, capture: Dict[str, Any], raw: Any) -> Any:
+        """Interpret decompressed bytes as rows of the capture's dtype."""
+        if numpy is None:
+            return bytes(raw)
+        rows = numpy.frombuffer(raw, dtype=numpy.dtype(capture["dtype"]))
+        return rows.reshape((-1,) + tuple(capture["shape"][1:]))
+
+    def read_chunk(self, name: str, index: int) -> Any:
+        """
+        Read one chunk without touching the rest of the capture.
+
+        Args:
+            name: Capture name
+            index: Chunk index (0 to chunk_count() - 1)
+
+        Returns:
+            Rows of the chunk (read-only array, or bytes without NumPy)
+        """
+        capture = self._capture(name)
+        return self._as_array(capture, self._read_raw(capture, index))
+
+    def read_range(self, name: str, start: int, stop: int) -> Any:
+        """
+        Read rows start:stop, decompressing only the chunks they span.
+
+        Args:
+            name: Capture name
+            start: First row
+            stop: End row (exclusive)
+
+        Returns:
+            The rows (array, or bytes without NumPy)
+        """
+        capture = self._capture(name)
+        rows_per_chunk = capture["rows_per_chunk"]
+        start, stop, _ = slice(start, stop).indices(capture["shape"][0] if capture["shape"] else 1)
+        if stop <= start:
+            return self._as_array(capture, b"")
+        first, last = start // rows_per_chunk, (stop - 1) // rows_per_chunk
+        parts = [self._as_array(capture, self._read_raw(capture, index))
+                 for index in range(first, last + 1)]
+        offset = first * rows_per_chunk
+        if numpy is None:
+            return b"".join(parts)[start - offset:stop - offset]
+        rows = parts[0] if len(parts) == 1 else numpy.concatenate(parts)
+        return rows[start - offset:stop - offset]
+
+    def read(self, name: str, scaled: bool = False) -> Any:
+        """
+        Read a whole capture.
+
+        Args:
+            name: Capture name
+            scaled: Apply the metadata scaling (value * scale + offset) and
+                    return float64 values
+
+        Returns:
+            The capture as an array of its dtype and shape (bytes without NumPy)
+        """
+        capture = self._capture(name)
+        if numpy is None:
+            return b"".join(bytes(self._read_raw(capture, index))
+                            for index in range(len(capture["chunks"])))
+
+        result = numpy.empty(capture["shape"], dtype=numpy.dtype(capture["dtype"]))
+        target = memoryview(result.reshape(-1).view(numpy.uint8))
+        position = 0
+        for index in range(len(capture["chunks"])):
+            raw = self._read_raw(capture, index)
+            target[position:position + len(raw)] = raw
+            position += len(raw)
+
+        if scaled:
+            scaling = capture["metadata"].get("scaling") or {}
+            return result * float(scaling.get("scale", 1.0)) + float(scaling.get("offset", 0.0))
+        return result
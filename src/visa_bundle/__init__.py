@@ -3,16 +3,64 @@
 VISA Bundle - 高效的 Python VISA 儀器控制包
 
 提供統一的 VISA 介面管理，包含連線追蹤、錯誤處理和全域設定功能。
+
+匯入本套件只載入 Setting；VISA、VISAManager 等匯出在第一次使用時才載入
+pyvisa、logger 與環境檢查（模組 __getattr__），`from visa_bundle import VISA, Setting`
+用法不變。
 """
 
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
+# 型別檢查器視為 True；避免執行時匯入 typing
+TYPE_CHECKING = False
+
 __version__ = "2.0.4"
 __author__ = "DS Platform Team"
 __email__ = "support@dsplatform.com"
 
-# 主要匯出
-from .VISA import VISA, VISAManager, opened_connections, Opened_List
 from . import Setting
-import pyvisa
+
+if TYPE_CHECKING:
+    import pyvisa
+    from .VISA import VISA, VISAManager, opened_connections, Opened_List
+
+# 延遲載入的匯出：名稱 -> 所在模組
+_LAZY_EXPORTS = {
+    "VISA": ".VISA",
+    "VISAManager": ".VISA",
+    "opened_connections": ".VISA",
+    "Opened_List": ".VISA",
+    "pyvisa": "pyvisa",
+}
 
 __all__ = ["VISA", "VISAManager",
            "opened_connections", "Opened_List", "Setting"]
+
+
+def __getattr__(name):
+    """第一次存取時載入匯出（之後直接從模組屬性取得）"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _importlib.import_module(module_name, __name__)
+    value = module if not module_name.startswith(".") else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+class _LazyPackage(_types.ModuleType):
+    """子模組 visa_bundle.VISA 載入時，套件屬性 VISA 仍指向 VISA 類別"""
+
+    def __setattr__(self, name, value):
+        if name == "VISA" and isinstance(value, _types.ModuleType):
+            value = value.VISA
+        super().__setattr__(name, value)
+
+
+_sys.modules[__name__].__class__ = _LazyPackage
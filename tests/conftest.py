@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the visa_bundle tests
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import pyvisa
+
+
+def _new_resource(address):
+    """Create a distinct mocked message-based resource per open."""
+    resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+    resource.query.return_value = address
+    return resource
+
+
+@pytest.fixture
+def pooled_rm():
+    """Patch pyvisa.ResourceManager so every open returns a distinct resource."""
+    with patch('pyvisa.ResourceManager') as mock_rm:
+        mock_rm.return_value.open_resource.side_effect = _new_resource
+        yield mock_rm
@@ -0,0 +1,114 @@
+"""
+Test module for adaptive per-command timeouts
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.AdaptiveTimeout import AdaptiveTimeout, scpi_header
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestAdaptiveTimeout:
+    """Test cases for latency statistics"""
+
+    def test_scpi_header(self):
+        """Test commands are keyed by their normalized header"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert scpi_header(":meas:volt? 10,0.001") == "MEAS:VOLT?"
+        assert scpi_header("*IDN?") == "*IDN?"
+        assert scpi_header("  ") == ""
+
+    def test_learns_percentile_timeout(self):
+        """Test the timeout follows the latency percentile and is capped"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        timeouts = AdaptiveTimeout(percentile=90, margin=2.0, padding=10, min_samples=3)
+        assert timeouts.timeout_for("READ?", 5000) == 5000
+
+        for latency in (0.010, 0.020, 0.030):
+            timeouts.record("READ?", latency)
+        assert timeouts.timeout_for("read?", 5000) == pytest.approx(70.0)
+        assert timeouts.timeout_for("READ?", 50) == 50
+        assert timeouts.stats()["READ?"]["count"] == 3
+
+        timeouts.set_override("*CAL?", 120000)
+        assert timeouts.timeout_for("*CAL?", 5000) == 120000
+
+        with pytest.raises(ValueError):
+            AdaptiveTimeout(percentile=0)
+
+
+class TestVISAAdaptiveTimeout:
+    """Test cases for adaptive timeouts applied by VISA"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.timeout = 60000
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_applies_and_restores_timeout(self):
+        """Test learned and overridden timeouts are set per transaction"""
+        visa = VISA("dmm", "USB0::1::INSTR", fast_path=True)
+        visa.enable_adaptive_timeout(overrides={"*CAL?": 300000}, min_samples=2, padding=50)
+
+        seen = []
+        self.resource.query.side_effect = lambda command, delay=None: (
+            seen.append(self.resource.timeout) or "1")
+
+        for _ in range(3):
+            visa.query("READ?")
+        visa.query("*CAL?")
+
+        # Resource timeout until learned, then a short learned timeout
+        assert seen[:2] == [60000, 60000]
+        assert seen[2] < 1000
+        assert seen[3] == 300000
+        assert self.resource.timeout == 60000
+
+    def test_timeout_raises_learned_limit(self):
+        """Test a timed-out command records its limit so the next one waits longer"""
+        visa = VISA("dmm", "USB0::1::INSTR")
+        timeouts = visa.enable_adaptive_timeout(min_samples=1, margin=2.0, padding=0)
+        timeouts.record("MEAS?", 0.1)
+
+        self.resource.query.side_effect = pyvisa.errors.VisaIOError(
+            pyvisa.constants.StatusCode.error_timeout)
+        with pytest.raises(Exception, match="VISA Query Error"):
+            visa.query("MEAS?")
+        assert timeouts.timeout_for("MEAS?", 60000) == pytest.approx(400.0)
+
+        visa.enable_adaptive_timeout(False)
+        assert visa.adaptive_timeout is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
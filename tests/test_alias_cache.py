@@ -0,0 +1,180 @@
+"""
+Test module for the persistent alias-to-address resolution cache
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle import AliasCache as alias_module
+    from visa_bundle.AliasCache import AliasCache, is_resource_address
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+IDN_A = "KEYSIGHT,34465A,MY12345678,A.03.01"
+
+
+class TestAliasCache:
+    """Test cases for AliasCache storage and resolution"""
+
+    def test_is_resource_address(self):
+        """Test distinguishing resource addresses from aliases"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert is_resource_address("USB0::0x1234::0x5678::INSTR")
+        assert is_resource_address("TCPIP::192.168.1.100::INSTR")
+        assert not is_resource_address("dmm_bench1")
+        assert not is_resource_address("MY12345678")
+
+    def test_persistence(self, tmp_path):
+        """Test entries survive a new cache instance on the same file"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        path = str(tmp_path / "aliases.json")
+        AliasCache(path).set("dmm", "USB0::1::INSTR", IDN_A)
+
+        reloaded = AliasCache(path)
+        assert reloaded.get("dmm") == {"address": "USB0::1::INSTR", "idn": IDN_A}
+        assert reloaded.aliases() == ["dmm"]
+        assert reloaded.remove("dmm") is True
+        assert AliasCache(path).get("dmm") is None
+
+    def test_corrupt_file_yields_empty_cache(self, tmp_path):
+        """Test that an unreadable cache file is treated as empty"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        path = tmp_path / "aliases.json"
+        path.write_text("not json")
+        assert AliasCache(str(path)).get("dmm") is None
+
+    def test_resolve_cached_address_skips_discovery(self, tmp_path):
+        """Test that a valid cached address never triggers a rescan"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        cache = AliasCache(str(tmp_path / "aliases.json"))
+        cache.set("dmm", "USB0::1::INSTR", IDN_A)
+        query_idn = Mock(return_value=IDN_A.replace("A.03.01", "A.04.00"))
+        list_resources = Mock(return_value=[])
+
+        assert cache.resolve("dmm", query_idn, list_resources) == "USB0::1::INSTR"
+        query_idn.assert_called_once_with("USB0::1::INSTR")
+        list_resources.assert_not_called()
+
+    def test_resolve_rescans_on_mismatch(self, tmp_path):
+        """Test targeted rescan and cache update when the address moved"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        cache = AliasCache(str(tmp_path / "aliases.json"))
+        cache.set("dmm", "USB0::1::INSTR", IDN_A)
+        idns = {"USB0::1::INSTR": "OTHER,MODEL,SN0,1.0", "USB0::2::INSTR": IDN_A}
+        query_idn = Mock(side_effect=lambda address: idns.get(address))
+        resources = ["ASRL1::INSTR", "GPIB0::5::INSTR", "USB0::1::INSTR", "USB0::2::INSTR"]
+
+        address = cache.resolve("dmm", query_idn, lambda: resources)
+
+        assert address == "USB0::2::INSTR"
+        assert AliasCache(cache.path).get("dmm")["address"] == "USB0::2::INSTR"
+        # Serial ports on another interface are never probed
+        assert "ASRL1::INSTR" not in [c.args[0] for c in query_idn.call_args_list]
+
+    def test_resolve_serial_number_without_entry(self, tmp_path):
+        """Test resolving a bare serial number that was never cached"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        cache = AliasCache(str(tmp_path / "aliases.json"))
+        resources = ["TCPIP::10.0.0.2::INSTR", "USB0::0x2A8D::0x0101::MY12345678::INSTR"]
+        query_idn = Mock(return_value=IDN_A)
+
+        address = cache.resolve("MY12345678", query_idn, lambda: resources)
+
+        # Addresses containing the serial number are probed first
+        assert address == "USB0::0x2A8D::0x0101::MY12345678::INSTR"
+        query_idn.assert_called_once_with(address)
+
+    def test_resolve_failure(self, tmp_path):
+        """Test that an unresolvable alias raises"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        cache = AliasCache(str(tmp_path / "aliases.json"))
+        with pytest.raises(Exception, match="VISA Alias Resolve Error"):
+            cache.resolve("missing", lambda address: None, lambda: ["USB0::1::INSTR"])
+
+
+class TestVISAAliasResolution:
+    """Test cases for alias support in the VISA class"""
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_opens_resolved_alias(self, mock_rm, tmp_path):
+        """Test that VISA resolves an alias before opening"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.query.return_value = IDN_A
+        mock_rm.return_value.open_resource.return_value = mock_resource
+        mock_rm.return_value.list_resources.return_value = ()
+
+        original_send = Setting.VISA_Send_Enable
+        original_path = Setting.VISA_Alias_Cache_Path
+
+        try:
+            Setting.VISA_Send_Enable = True
+            Setting.VISA_Alias_Cache_Path = str(tmp_path / "aliases.json")
+            VISA.close_all_connections()
+
+            VISA.register_alias("bench_dmm", "USB0::1::INSTR")
+            mock_rm.return_value.open_resource.reset_mock()
+            mock_resource.close.reset_mock()
+            visa = VISA("dmm", "bench_dmm")
+
+            assert visa.alias == "bench_dmm"
+            assert visa.address == "USB0::1::INSTR"
+            # The session that validated the cached address is the one kept
+            mock_rm.return_value.open_resource.assert_called_once_with("USB0::1::INSTR")
+            mock_resource.close.assert_not_called()
+            assert visa.handle is mock_resource
+            mock_rm.return_value.list_resources.assert_not_called()
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            Setting.VISA_Alias_Cache_Path = original_path
+            VISA.close_all_connections()
+
+    def test_default_cache_follows_setting(self, tmp_path):
+        """Test that the shared cache follows changes of the configured path"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        original_path = Setting.VISA_Alias_Cache_Path
+        try:
+            Setting.VISA_Alias_Cache_Path = str(tmp_path / "first.json")
+            first = alias_module.get_alias_cache()
+            assert alias_module.get_alias_cache() is first
+            Setting.VISA_Alias_Cache_Path = str(tmp_path / "second.json")
+            second = alias_module.get_alias_cache()
+            assert second is not first
+            assert second.path == str(tmp_path / "second.json")
+        finally:
+            Setting.VISA_Alias_Cache_Path = original_path
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
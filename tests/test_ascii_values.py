@@ -0,0 +1,97 @@
+"""
+Test module for bulk and streaming ASCII numeric response parsing
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.AsciiValues import AsciiValueParser, parse_ascii_values
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestAsciiValues:
+    """Test cases for the ASCII value parsers"""
+
+    def test_parse_ascii_values(self):
+        """Test bulk parsing with whitespace and termination"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert list(parse_ascii_values("1.5, 2e3,-4\n")) == [1.5, 2000.0, -4.0]
+        assert list(parse_ascii_values(b"1;2;3", int, separator=";")) == [1, 2, 3]
+        assert len(parse_ascii_values("\n")) == 0
+        with pytest.raises(ValueError):
+            parse_ascii_values("1,abc,3")
+
+    def test_parser_carries_split_numbers(self):
+        """Test numbers split across chunks are parsed once complete"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        parser = AsciiValueParser()
+        assert list(parser.feed(b"1.25,3")) == [1.25]
+        assert list(parser.feed(b"7")) == []
+        assert list(parser.feed(b".5,8,")) == [37.5, 8.0]
+        assert list(parser.feed(b"9\n")) == []
+        assert list(parser.finish()) == [9.0]
+
+
+class TestVISAAsciiValues:
+    """Test cases for VISA.query_ascii_values and its streaming variant"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.read_termination = "\n"
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_query_ascii_values(self):
+        """Test the whole response is parsed into values"""
+        self.resource.query.return_value = "1,2,3,4"
+        visa = VISA("sa", "USB0::1::INSTR")
+        assert list(visa.query_ascii_values("TRAC:DATA?")) == [1.0, 2.0, 3.0, 4.0]
+
+    def test_query_ascii_values_stream(self):
+        """Test chunks are parsed as they arrive"""
+        chunks = [b"1.0,2.0,3.", b"0,4.0,5.0,", b"6.0\n"]
+        self.resource.read_bytes.side_effect = chunks
+        visa = VISA("sa", "USB0::1::INSTR")
+
+        values = visa.query_ascii_values_stream("TRAC:DATA?", chunk_size=10)
+        assert list(values) == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        self.resource.write.assert_called_with("TRAC:DATA?")
+        self.resource.read_bytes.assert_called_with(10, break_on_termchar=True)
+
+        batches = []
+        self.resource.read_bytes.side_effect = chunks
+        assert visa.query_ascii_values_stream("TRAC:DATA?", chunk_size=10,
+                                              on_values=batches.append) is None
+        assert [list(batch) for batch in batches] == [[1.0, 2.0], [3.0, 4.0, 5.0], [], [6.0]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
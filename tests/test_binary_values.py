@@ -0,0 +1,166 @@
+"""
+Test module for IEEE block helpers and binary value uploads
+"""
+
+import pytest
+import sys
+import os
+import struct
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.BinaryBlock import block_header, iter_chunks, values_view
+    from visa_bundle.FileTransfer import FILE_CHUNK_SIZE
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestBinaryBlock:
+    """Test cases for block headers and byte views"""
+
+    def test_block_header(self):
+        """Test definite-length headers"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert block_header(0) == b"#10"
+        assert block_header(8000) == b"#48000"
+        with pytest.raises(ValueError):
+            block_header(10 ** 9)
+
+    def test_values_view_sequence(self):
+        """Test encoding plain sequences in either byte order"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert bytes(values_view([1, -2], "h", big_endian=True)) == struct.pack(">2h", 1, -2)
+        assert bytes(values_view([1.5], "f")) == struct.pack("<f", 1.5)
+
+    def test_values_view_numpy_without_copy(self):
+        """Test matching NumPy arrays are viewed in place"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        numpy = pytest.importorskip("numpy")
+
+        samples = numpy.arange(1000, dtype="<f4")
+        view = values_view(samples, "f")
+        assert numpy.shares_memory(numpy.frombuffer(view, dtype="<f4"), samples)
+        assert bytes(view) == samples.tobytes()
+
+        swapped = values_view(samples, "f", big_endian=True)
+        assert bytes(swapped) == samples.astype(">f4").tobytes()
+
+    def test_iter_chunks(self):
+        """Test zero-copy chunking"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        data = memoryview(bytes(range(10)))
+        chunks = list(iter_chunks(data, 4))
+        assert [bytes(chunk) for chunk in chunks] == [bytes(range(4)), bytes(range(4, 8)),
+                                                      bytes(range(8, 10))]
+        assert all(chunk.obj is data.obj for chunk in chunks)
+        assert len(list(iter_chunks(data))) == 1
+
+
+class TestWriteBinaryValues:
+    """Test cases for VISA.write_binary_values"""
+
+    @patch('pyvisa.ResourceManager')
+    def test_write_binary_values_chunks(self, mock_rm):
+        """Test header, chunks and termination are written separately"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.write_termination = "\n"
+        mock_resource.send_end = True
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        writes = []
+        # The VISA library's ctypes backend only accepts bytes
+        mock_resource.write_raw.side_effect = lambda piece: writes.append(
+            (piece, type(piece), mock_resource.send_end))
+
+        original_send = Setting.VISA_Send_Enable
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+            visa = VISA("awg", "USB0::1::INSTR")
+
+            visa.write_binary_values("DATA ", [1, 2, 3, 4, 5], "h", chunk_size=4)
+
+            payload = struct.pack("<5h", 1, 2, 3, 4, 5)
+            assert writes == [
+                (b"DATA #210", bytes, False),
+                (payload[0:4], bytes, False),
+                (payload[4:8], bytes, False),
+                (payload[8:10], bytes, False),
+                (b"\n", bytes, True),
+            ]
+            assert mock_resource.send_end is True
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_write_binary_values_bounded_by_default(self, mock_rm):
+        """Test VISA library handles get bounded bytes chunks without chunk_size"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.write_termination = "\n"
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        sizes = []
+
+        def write_raw(piece):
+            # Like the ctypes backend: only bytes are accepted
+            if type(piece) is not bytes:
+                raise TypeError("Don't know how to convert parameter 2")
+            sizes.append(len(piece))
+
+        mock_resource.write_raw.side_effect = write_raw
+
+        original_send = Setting.VISA_Send_Enable
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+            visa = VISA("awg", "USB0::1::INSTR")
+
+            data = bytes(2 * FILE_CHUNK_SIZE + 100)
+            visa.write_binary_values("DATA ", data, "B")
+
+            assert max(sizes) <= FILE_CHUNK_SIZE
+            assert sum(sizes) == len(b"DATA " + block_header(len(data))) + len(data) + 1
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    def test_write_binary_values_disabled(self):
+        """Test nothing is sent while VISA is disabled"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        original_send = Setting.VISA_Send_Enable
+        try:
+            Setting.VISA_Send_Enable = False
+            visa = VISA("awg", "USB0::1::INSTR")
+            assert visa.write_binary_values("DATA ", [1.0, 2.0]) is None
+        finally:
+            Setting.VISA_Send_Enable = original_send
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
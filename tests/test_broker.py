@@ -0,0 +1,255 @@
+"""
+Test module for the local connection broker
+"""
+
+import pytest
+import sys
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.Broker import (BrokerServer, BrokerClient, BrokerHandle,
+                                    OP_OPEN, OP_QUERY, OP_CLOSE, OP_LEASE, OP_RELEASE,
+                                    OP_SET_TIMEOUT, OP_GET_TIMEOUT)
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                                reason="Unix domain sockets not available")
+
+
+class TestBroker:
+    """Test cases for broker-routed VISA operations"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.VISA_Broker_Path)
+        self.directory = tempfile.mkdtemp(prefix="visa")
+        self.path = os.path.join(self.directory, "broker.sock")
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.query.return_value = "Test Device v1.0"
+        self.resource.read_raw.return_value = b"#15hello\n"
+        self.resource.timeout = 2000
+        self.open_resource = mock_rm.return_value.open_resource
+        self.open_resource.return_value = self.resource
+
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+        self.server = BrokerServer(self.path)
+        self.server.start()
+
+    def teardown_method(self):
+        Setting.VISA_Broker_Path = ""
+        VISA.close_all_connections()
+        self.server.stop()
+        self.rm_patch.stop()
+        os.rmdir(self.directory)
+        Setting.VISA_Send_Enable, Setting.VISA_Broker_Path = self.original
+
+    def test_visa_routes_through_broker(self):
+        """Test that VISA operations are executed by the broker's session"""
+        Setting.VISA_Broker_Path = self.path
+
+        visa = VISA("dmm", "MOCK::INSTR", skip_clear=True)
+
+        assert isinstance(visa.handle, BrokerHandle)
+        assert visa.query("*IDN?") == "Test Device v1.0"
+        self.resource.query.assert_called_with("*IDN?", None)
+        visa.write("*RST")
+        self.resource.write.assert_called_with("*RST")
+        assert visa.query_binary("CURV?", delay_time=0) == b"#15hello\n"
+        visa.write_binary(b"\x00\x01")
+        self.resource.write_raw.assert_called_with(b"\x00\x01")
+
+    def test_broker_errors_are_propagated(self):
+        """Test that instrument errors in the broker surface in the client"""
+        Setting.VISA_Broker_Path = self.path
+        self.resource.query.side_effect = Exception("Query failed")
+
+        visa = VISA("dmm", "MOCK::INSTR", skip_clear=True)
+
+        with pytest.raises(Exception, match="VISA Query Error"):
+            visa.query("*IDN?")
+
+    def test_clients_share_one_session(self):
+        """Test that separate client connections share the broker session"""
+        first = BrokerClient(self.path)
+        second = BrokerClient(self.path)
+
+        try:
+            payload = b"\x01MOCK::INSTR"
+            first_id = first.call(OP_OPEN, 0, payload)
+            second_id = second.call(OP_OPEN, 0, payload)
+
+            assert first_id == second_id
+            assert self.open_resource.call_count == 1
+
+            session_id = int.from_bytes(first_id, "big")
+            first.call(OP_CLOSE, session_id)
+            self.resource.close.assert_not_called()
+            second.call(OP_CLOSE, session_id)
+            self.resource.close.assert_called_once()
+        finally:
+            first.close()
+            second.close()
+
+    def test_pipelined_requests(self):
+        """Test many in-flight requests on one connection"""
+        self.resource.query.side_effect = lambda command, delay: command.upper()
+        client = BrokerClient(self.path)
+
+        try:
+            session_id = int.from_bytes(client.call(OP_OPEN, 0, b"\x01MOCK::INSTR"), "big")
+            nan_delay = b"\x7f\xf8\x00\x00\x00\x00\x00\x00"
+            futures = [client.submit(OP_QUERY, session_id, nan_delay + f"meas{i}?".encode())
+                       for i in range(50)]
+
+            assert [future.result(5) for future in futures] == \
+                [f"MEAS{i}?".encode() for i in range(50)]
+        finally:
+            client.close()
+
+    def test_sessions_run_concurrently(self):
+        """Test that a slow request on one session does not hold up another"""
+        release = threading.Event()
+        slow = Mock(spec=pyvisa.resources.MessageBasedResource)
+        slow.query.side_effect = lambda command, delay: release.wait(5) and "slow"
+        self.open_resource.side_effect = \
+            lambda address: slow if address == "SLOW::INSTR" else self.resource
+        client = BrokerClient(self.path)
+
+        try:
+            slow_id = int.from_bytes(client.call(OP_OPEN, 0, b"\x01SLOW::INSTR"), "big")
+            fast_id = int.from_bytes(client.call(OP_OPEN, 0, b"\x01MOCK::INSTR"), "big")
+            nan_delay = b"\x7f\xf8\x00\x00\x00\x00\x00\x00"
+
+            pending = client.submit(OP_QUERY, slow_id, nan_delay + b"*OPC?")
+            assert client.call(OP_QUERY, fast_id, nan_delay + b"*IDN?", timeout=2) == \
+                b"Test Device v1.0"
+            assert not pending.done()
+            release.set()
+            assert pending.result(5) == b"slow"
+        finally:
+            release.set()
+            client.close()
+
+    def test_handle_keeps_session_timeout(self):
+        """Test that saving and restoring the proxy timeout keeps the real value"""
+        Setting.VISA_Broker_Path = self.path
+
+        visa = VISA("dmm", "MOCK::INSTR", skip_clear=True)
+        assert visa.handle.timeout == 2000
+
+        visa.enable_adaptive_timeout(min_samples=1, padding=0)
+        visa.query("*IDN?")
+        visa.query("*IDN?")
+        assert self.resource.timeout == 2000
+
+    def test_lease_keeps_other_clients_out(self):
+        """Test that a leased session runs no other client's requests until released"""
+        first = BrokerClient(self.path)
+        second = BrokerClient(self.path)
+        nan_delay = b"\x7f\xf8\x00\x00\x00\x00\x00\x00"
+
+        try:
+            session_id = int.from_bytes(first.call(OP_OPEN, 0, b"\x01MOCK::INSTR"), "big")
+            second.call(OP_OPEN, 0, b"\x01MOCK::INSTR")
+
+            first.call(OP_LEASE, session_id)
+            pending = second.submit(OP_QUERY, session_id, nan_delay + b"*IDN?")
+            assert first.call(OP_QUERY, session_id, nan_delay + b"*IDN?", timeout=2)
+            time.sleep(0.1)
+            assert not pending.done()
+
+            first.call(OP_RELEASE, session_id)
+            assert pending.result(2) == b"Test Device v1.0"
+
+            # A client disconnecting with a lease releases it
+            first.call(OP_LEASE, session_id)
+            first.close()
+            assert second.call(OP_QUERY, session_id, nan_delay + b"*IDN?", timeout=2)
+        finally:
+            first.close()
+            second.close()
+
+    def test_timeouts_are_per_client(self):
+        """Test that a client's timeout applies to its own requests only"""
+        seen = []
+        self.resource.query.side_effect = (
+            lambda command, delay: seen.append(self.resource.timeout) or "1")
+        first = BrokerClient(self.path)
+        second = BrokerClient(self.path)
+        nan_delay = b"\x7f\xf8\x00\x00\x00\x00\x00\x00"
+
+        try:
+            session_id = int.from_bytes(first.call(OP_OPEN, 0, b"\x01MOCK::INSTR"), "big")
+            second.call(OP_OPEN, 0, b"\x01MOCK::INSTR")
+
+            first.call(OP_SET_TIMEOUT, session_id, struct.pack("!d", 500.0))
+            first.call(OP_QUERY, session_id, nan_delay + b"A?")
+            second.call(OP_QUERY, session_id, nan_delay + b"B?")
+
+            assert seen == [500.0, 2000]
+            assert self.resource.timeout == 2000
+            assert first.call(OP_GET_TIMEOUT, session_id) == struct.pack("!d", 500.0)
+        finally:
+            first.close()
+            second.close()
+
+    def test_visa_operations_lease_the_session(self):
+        """Test that VISA holds the broker session for each operation"""
+        Setting.VISA_Broker_Path = self.path
+        visa = VISA("dmm", "MOCK::INSTR", skip_clear=True)
+        other = BrokerClient(self.path)
+        nan_delay = b"\x7f\xf8\x00\x00\x00\x00\x00\x00"
+        order = []
+        session_id = int.from_bytes(other.call(OP_OPEN, 0, b"\x01MOCK::INSTR"), "big")
+
+        def write(command):
+            # Another client's request arrives between this write and its read
+            order.append(command)
+            other.submit(OP_QUERY, session_id, nan_delay + b"OTHER?")
+            time.sleep(0.1)
+
+        self.resource.write.side_effect = write
+        self.resource.query.side_effect = lambda command, delay: order.append(command) or "1"
+        self.resource.read_raw.side_effect = lambda: order.append("read") or b"#15hello\n"
+
+        try:
+            assert visa.query_binary("CURV?", delay_time=0) == b"#15hello\n"
+            time.sleep(0.2)
+            assert order == ["CURV?", "read", "OTHER?"]
+        finally:
+            other.close()
+
+    def test_disconnect_releases_sessions(self):
+        """Test that a client disconnecting without closing releases its sessions"""
+        client = BrokerClient(self.path)
+        client.call(OP_OPEN, 0, b"\x01MOCK::INSTR")
+        client.close()
+
+        deadline = time.monotonic() + 5
+        while not self.resource.close.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.resource.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+"""
+Test module for double-buffered acquisition into reusable buffers
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.BufferRing import BufferRing
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestBufferRing:
+    """Test cases for query_binary_into() and query_binary_buffered()"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.read_termination = "\n"
+        self.stream = bytearray()
+        self.captures = 0
+
+        def write(command):
+            # Each query answers with a block of 1000 copies of its capture number
+            self.captures += 1
+            data = bytes([self.captures % 256]) * 1000
+            self.stream += b"#41000" + data + b"\n"
+
+        def read_bytes(count, break_on_termchar=False):
+            data = bytes(self.stream[:count])
+            del self.stream[:count]
+            return data
+
+        self.resource.write.side_effect = write
+        self.resource.read_bytes.side_effect = read_bytes
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_query_binary_into(self):
+        """Test block data is read into the caller's buffer"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        buffer = bytearray(4096)
+
+        assert visa.query_binary_into(":WAV:DATA?", buffer) == 1000
+        assert buffer[:1000] == b"\x01" * 1000
+        assert self.stream == b""
+
+        with pytest.raises(ValueError):
+            visa.query_binary_into(":WAV:DATA?", bytearray(10))
+
+    def test_block_without_termination(self):
+        """Test a missing termination after a block is read with an immediate timeout"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        self.resource.timeout = 2000
+        replies = [b"#1", b"3", b"abc"]
+        timeouts = []
+
+        def read_bytes(count, break_on_termchar=False):
+            timeouts.append(self.resource.timeout)
+            if not replies:
+                raise Exception("timeout")
+            return replies.pop(0)
+
+        self.resource.write.side_effect = None
+        self.resource.read_bytes.side_effect = read_bytes
+
+        buffer = bytearray(8)
+        assert visa.query_binary_into(":WAV:DATA?", buffer) == 3
+        assert buffer[:3] == b"abc"
+        assert timeouts == [2000, 2000, 2000, 0]
+        assert self.resource.timeout == 2000
+
+    def test_buffers_are_reused(self):
+        """Test captures cycle through two buffers allocated once"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        storage = set()
+        sequences = []
+
+        for capture in visa.query_binary_buffered(":WAV:DATA?", count=20):
+            with capture:
+                assert capture.data == bytes([capture.sequence + 1]) * 1000
+                storage.add(id(capture.buffer))
+                sequences.append(capture.sequence)
+            with pytest.raises(ValueError):
+                capture.data
+
+        assert sequences == list(range(20))
+        assert len(storage) == 2
+        stats = capture.ring.stats()
+        assert stats["allocations"] == 2
+        assert stats["allocated_bytes"] == 2000
+
+    def test_acquisition_waits_for_release(self):
+        """Test acquisition never runs more than the ring ahead of the caller"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        captures = visa.query_binary_buffered(":WAV:DATA?", buffers=2)
+
+        first = next(captures)
+        time.sleep(0.1)
+        # One buffer is held by the caller, the other holds the next capture
+        assert self.captures == 2
+        first.release()
+        second = next(captures)
+        assert second.sequence == 1
+        third = next(captures)
+        with pytest.raises(RuntimeError):
+            next(captures)
+        second.release()
+        third.release()
+        captures.close()
+
+    def test_ring_validation(self):
+        """Test ring arguments and idempotent release"""
+        with pytest.raises(ValueError):
+            BufferRing(0)
+
+        ring = BufferRing(1, size=64)
+        buffer = ring.acquire()
+        assert ring.acquire(timeout=0.01) is None
+        assert len(ring.reserve(buffer, 16)) == 16
+        assert len(buffer.buffer) == 64
+        buffer.release()
+        buffer.release()
+        assert ring.acquire(timeout=0.01) is buffer
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
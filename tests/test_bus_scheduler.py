@@ -0,0 +1,256 @@
+"""
+Test module for the per-bus I/O scheduler
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle.BusScheduler import BusScheduler, bus_of, get_scheduler
+    from visa_bundle.Cancellation import CancelToken, VISAInterruptError, cancellation
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestBusScheduler:
+    """Test cases for bus grouping and per-bus serialization"""
+
+    def test_bus_of(self):
+        """Test bus parsing from resource strings"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert bus_of("GPIB0::5::INSTR") == "GPIB0"
+        assert bus_of("GPIB0::7::INSTR") == "GPIB0"
+        assert bus_of("USB0::0x1234::0x5678::SN1::INSTR") == "USB0"
+        assert bus_of("TCPIP::10.0.0.2::INSTR") == "TCPIP0::10.0.0.2"
+        assert bus_of("TCPIP0::10.0.0.3::5025::SOCKET") == "TCPIP0::10.0.0.3"
+
+    def test_same_bus_is_serialized(self):
+        """Test that transfers on one bus never overlap"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        active = []
+        overlaps = []
+
+        def transfer(address):
+            with scheduler.slot(address):
+                active.append(address)
+                overlaps.append(len(active))
+                time.sleep(0.02)
+                active.remove(address)
+
+        threads = [threading.Thread(target=transfer, args=(f"GPIB0::{i}::INSTR",))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(overlaps) == 1
+        stats = scheduler.get_stats()["GPIB0"]
+        assert stats["transfers"] == 4
+        assert stats["wait_time"] > 0
+        assert 0 < stats["utilization"] <= 1
+
+    def test_different_buses_run_in_parallel(self):
+        """Test that transfers on different buses proceed concurrently"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        barrier = threading.Barrier(3, timeout=2)
+
+        def transfer(address):
+            with scheduler.slot(address):
+                barrier.wait()
+
+        threads = [threading.Thread(target=transfer, args=(address,)) for address in
+                   ("GPIB0::1::INSTR", "USB0::1::INSTR", "TCPIP::10.0.0.2::INSTR")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not barrier.broken
+
+    def test_priority_order_and_reentrancy(self):
+        """Test that waiters are served by priority and slots are reentrant"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        order = []
+
+        def waiter(priority):
+            with scheduler.slot("GPIB0::1::INSTR", priority):
+                order.append(priority)
+
+        with scheduler.slot("GPIB0::2::INSTR"):
+            with scheduler.slot("GPIB0::2::INSTR"):
+                threads = []
+                for priority in (5, 1, 3):
+                    thread = threading.Thread(target=waiter, args=(priority,))
+                    thread.start()
+                    threads.append(thread)
+                    while scheduler.get_stats()["GPIB0"]["queued"] < len(threads):
+                        time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        assert order == [1, 3, 5]
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a task waiting for a busy bus wakes it up"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        token = CancelToken()
+        errors = []
+
+        def waiter():
+            with cancellation(token):
+                try:
+                    with scheduler.slot("GPIB0::1::INSTR"):
+                        pass
+                except VISAInterruptError as error:
+                    errors.append(error)
+
+        with scheduler.slot("GPIB0::2::INSTR"):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            while scheduler.get_stats()["GPIB0"]["queued"] < 1:
+                time.sleep(0.001)
+            token.cancel()
+            thread.join(2)
+            assert not thread.is_alive()
+            assert scheduler.get_stats()["GPIB0"]["queued"] == 0
+
+        assert len(errors) == 1
+        assert not scheduler.get_stats()["GPIB0"]["busy"]
+
+    def test_released_lets_others_transfer(self):
+        """Test that the bus is free during a released block and held again after"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        done = threading.Event()
+
+        def other():
+            with scheduler.slot("GPIB0::1::INSTR"):
+                done.set()
+
+        with scheduler.slot("GPIB0::2::INSTR"):
+            with scheduler.slot("GPIB0::2::INSTR"):
+                thread = threading.Thread(target=other)
+                thread.start()
+                with scheduler.released("GPIB0::2::INSTR"):
+                    assert done.wait(2)
+                thread.join()
+                assert scheduler.get_stats()["GPIB0"]["busy"]
+            assert scheduler.get_stats()["GPIB0"]["busy"]
+        assert not scheduler.get_stats()["GPIB0"]["busy"]
+
+    def test_run_by_bus(self):
+        """Test grouped execution returns results in job order"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        scheduler = BusScheduler()
+        calls = []
+        jobs = [
+            ("GPIB0::1::INSTR", 2, lambda: calls.append("a") or "a"),
+            ("USB0::1::INSTR", 0, lambda: "b"),
+            ("GPIB0::2::INSTR", 1, lambda: calls.append("c") or "c"),
+        ]
+
+        assert scheduler.run_by_bus(jobs) == ["a", "b", "c"]
+        assert calls == ["c", "a"]
+
+
+class TestVISABusScheduling:
+    """Test cases for scheduler integration in VISA"""
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_io_is_scheduled(self, mock_rm):
+        """Test that VISA I/O is accounted on its bus when scheduling is enabled"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.query.return_value = "1"
+        mock_resource.read_raw.return_value = b"#10"
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        original = (Setting.VISA_Send_Enable, Setting.VISA_Bus_Schedule_Enable)
+
+        try:
+            Setting.VISA_Send_Enable = True
+            Setting.VISA_Bus_Schedule_Enable = True
+            VISA.close_all_connections()
+            get_scheduler().reset()
+
+            visa = VISA("dmm", "GPIB0::22::INSTR", skip_clear=True)
+            visa.query("*OPC?")
+            visa.query_binary("CURV?", delay_time=0)
+
+            # query_binary holds the bus once across its write and read
+            assert VISA.get_bus_stats()["GPIB0"]["transfers"] == 2
+
+        finally:
+            Setting.VISA_Send_Enable, Setting.VISA_Bus_Schedule_Enable = original
+            VISA.close_all_connections()
+            get_scheduler().reset()
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_manager_run_parallel(self, mock_rm):
+        """Test running one operation per managed instrument"""
+        if not IMPORT_SUCCESS or VISAManager is None:
+            pytest.skip("VISAManager not available")
+
+        def new_resource(address):
+            resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+            resource.query.return_value = address
+            return resource
+
+        mock_rm.return_value.open_resource.side_effect = new_resource
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+            manager = VISAManager()
+            manager.add_instrument("dmm", "GPIB0::22::INSTR")
+            manager.add_instrument("scope", "TCPIP::10.0.0.2::INSTR")
+
+            results = manager.run_parallel({
+                "dmm": lambda instrument: instrument.query("*IDN?"),
+                "scope": lambda instrument: instrument.query("*IDN?"),
+            })
+
+            assert results == {"dmm": "GPIB0::22::INSTR",
+                               "scope": "TCPIP::10.0.0.2::INSTR"}
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
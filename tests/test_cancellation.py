@@ -0,0 +1,190 @@
+"""
+Test module for cooperative cancellation of VISA I/O
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.Cancellation import (STB_MAV, CancelToken, VISAInterruptError,
+                                          cancellation, interruptible_sleep)
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+def timeout_error():
+    """A VISA timeout as raised by pyvisa."""
+    return pyvisa.errors.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+
+
+class TestCancelToken:
+    """Test cases for tokens and interruptible sleeps"""
+
+    def test_sleep_aborts_on_cancel(self):
+        """Test a cancelled token ends a long sleep promptly"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(VISAInterruptError):
+            interruptible_sleep(10, token)
+        assert time.monotonic() - start < 1.0
+
+    def test_deadline(self):
+        """Test a token with a time budget cancels itself"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        token = CancelToken(timeout=0.05)
+        assert not token.cancelled
+        assert 0 < token.remaining() <= 0.05
+        time.sleep(0.06)
+        assert token.cancelled
+
+
+class TestVISACancellation:
+    """Test cases for interrupting VISA operations"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.IS_INTERRUPT,
+                         Setting.VISA_Interrupt_Slice)
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.timeout = 30000
+        self.resource.read_stb.return_value = 0
+        self.resource.query.return_value = "1"
+        self.open_resource = mock_rm.return_value.open_resource
+        self.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        Setting.IS_INTERRUPT = False
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        (Setting.VISA_Send_Enable, Setting.IS_INTERRUPT,
+         Setting.VISA_Interrupt_Slice) = self.original
+
+    def test_interrupt_blocks_new_operations(self):
+        """Test IS_INTERRUPT aborts operations before any I/O"""
+        visa = VISA("dmm", "USB0::1::INSTR")
+        Setting.IS_INTERRUPT = True
+        with pytest.raises(VISAInterruptError):
+            visa.query("READ?")
+        self.resource.query.assert_not_called()
+
+        Setting.IS_INTERRUPT = False
+        assert visa.query("READ?") == "1"
+
+    def test_sliced_read_aborts_within_slice(self):
+        """Test a long response wait ends soon after IS_INTERRUPT is set"""
+        Setting.VISA_Interrupt_Slice = 0.05
+        visa = VISA("dmm", "USB0::1::INSTR")
+
+        def read():
+            time.sleep(0.05)
+            raise timeout_error()
+
+        self.resource.read.side_effect = read
+        threading.Timer(0.2, lambda: setattr(Setting, "IS_INTERRUPT", True)).start()
+
+        start = time.monotonic()
+        with pytest.raises(VISAInterruptError):
+            visa.query("MEAS?")
+        assert time.monotonic() - start < 1.0
+
+        # The session is cleaned up and the original timeout restored
+        self.resource.write.assert_called_with("MEAS?")
+        self.resource.clear.assert_called()
+        assert self.resource.timeout == 30000
+
+    def test_sliced_read_keeps_total_timeout(self):
+        """Test slicing still times out after the handle's own timeout"""
+        Setting.VISA_Interrupt_Slice = 0.02
+        self.resource.timeout = 100
+        visa = VISA("dmm", "USB0::1::INSTR")
+
+        def read():
+            time.sleep(0.01)
+            raise timeout_error()
+
+        self.resource.read.side_effect = read
+
+        with pytest.raises(Exception, match="VISA Read Error"):
+            visa.read()
+        # Only the wait is sliced; the read itself runs once
+        assert self.resource.read_stb.call_count > 1
+        assert self.resource.read.call_count == 1
+        assert self.resource.timeout == 100
+
+    def test_sliced_read_is_not_truncated(self):
+        """Test a response arriving in parts is read whole rather than retried"""
+        Setting.VISA_Interrupt_Slice = 0.02
+        self.resource.timeout = 2000
+        visa = VISA("dmm", "USB0::1::INSTR")
+        parts = ["1.23", "45"]
+        start = time.monotonic()
+        first, last = start + 0.05, start + 0.15
+
+        def read():
+            # Like pyvisa, a timeout drops the part received before it
+            end = time.monotonic() + self.resource.timeout / 1000.0
+            if end < last:
+                time.sleep(max(0.0, end - time.monotonic()))
+                if end >= first and len(parts) == 2:
+                    parts.pop(0)
+                raise timeout_error()
+            time.sleep(max(0.0, last - time.monotonic()))
+            return "".join(parts)
+
+        self.resource.read.side_effect = read
+        self.resource.read_stb.side_effect = (
+            lambda: STB_MAV if time.monotonic() >= first else 0)
+
+        assert visa.query("MEAS?") == "1.2345"
+        assert self.resource.read.call_count == 1
+        assert self.resource.timeout == 2000
+
+    def test_token_cancels_query_binary_delay(self):
+        """Test a cancelled token interrupts the query_binary delay"""
+        visa = VISA("scope", "USB0::1::INSTR")
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        start = time.monotonic()
+        with cancellation(token), pytest.raises(VISAInterruptError):
+            visa.query_binary("CURV?", delay_time=10)
+        assert time.monotonic() - start < 1.0
+        self.resource.read_raw.assert_not_called()
+
+    def test_interrupt_aborts_open_retries(self):
+        """Test open retries stop when interrupted"""
+        self.open_resource.side_effect = Exception("not found")
+        threading.Timer(0.1, lambda: setattr(Setting, "IS_INTERRUPT", True)).start()
+
+        start = time.monotonic()
+        with pytest.raises(VISAInterruptError):
+            VISA("dmm", "USB0::1::INSTR")
+        assert time.monotonic() - start < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,396 @@
+"""
+Test module for the connection registry and background warm pool
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle import ConnectionRegistry
+    from visa_bundle.Cancellation import VISAInterruptError
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestConnectionRegistry:
+    """Test cases for registry helpers"""
+
+    def test_register_existing_address_wins(self):
+        """Test that registering a duplicate address returns the first handle"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        VISA.close_all_connections()
+        first = Mock(spec=pyvisa.resources.MessageBasedResource)
+        second = Mock(spec=pyvisa.resources.MessageBasedResource)
+
+        try:
+            assert ConnectionRegistry.register_session("MOCK::INSTR", first) is first
+            assert ConnectionRegistry.register_session("MOCK::INSTR", second) is first
+            assert ConnectionRegistry.find_session("MOCK::INSTR") is first
+
+            ConnectionRegistry.unregister_session(first)
+            assert ConnectionRegistry.find_session("MOCK::INSTR") is None
+        finally:
+            VISA.close_all_connections()
+
+
+class TestWarmPool:
+    """Test cases for background warm-up of station connections"""
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_picks_up_warmed_handle(self, mock_rm):
+        """Test that VISA reuses a handle opened by the warm pool"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        release = threading.Event()
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+
+        def slow_open(address):
+            release.wait(5)
+            return mock_resource
+
+        mock_rm.return_value.open_resource.side_effect = slow_open
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            started = VISA.warm_up_connections({"dmm": "MOCK::INSTR"}, skip_clear=True)
+            assert started == ["MOCK::INSTR"]
+            assert VISA.get_warming_connections() == ["MOCK::INSTR"]
+
+            release.set()
+            visa = VISA("dmm", "MOCK::INSTR")
+
+            assert visa.handle is mock_resource
+            assert mock_rm.return_value.open_resource.call_count == 1
+            assert VISA.get_warming_connections() == []
+
+        finally:
+            release.set()
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_open_does_not_wait_for_hung_warm_up(self, mock_rm):
+        """Test that VISA opens the resource itself once the warm-up wait is bounded out"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        release = threading.Event()
+        warm_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        own_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        opens = []
+
+        def open_resource(address):
+            opens.append(address)
+            if len(opens) == 1:
+                release.wait(10)  # warm-up hangs
+                return warm_resource
+            return own_resource
+
+        mock_rm.return_value.open_resource.side_effect = open_resource
+        original_send = Setting.VISA_Send_Enable
+        original_wait = ConnectionRegistry.WARM_UP_WAIT_TIMEOUT
+
+        try:
+            Setting.VISA_Send_Enable = True
+            ConnectionRegistry.WARM_UP_WAIT_TIMEOUT = 0.2
+            VISA.close_all_connections()
+
+            VISA.warm_up_connections(["MOCK::INSTR"], skip_clear=True)
+            started = time.monotonic()
+            visa = VISA("dmm", "MOCK::INSTR")
+
+            assert time.monotonic() - started < 2
+            assert visa.handle is own_resource
+
+            release.set()
+            assert ConnectionRegistry.wait_for_warm_up(timeout=10) is True
+            assert ConnectionRegistry.find_session("MOCK::INSTR") is own_resource
+            warm_resource.close.assert_called_once()
+            visa.close()
+
+        finally:
+            release.set()
+            ConnectionRegistry.WARM_UP_WAIT_TIMEOUT = original_wait
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    def test_warm_up_wait_is_interruptible(self):
+        """Test that IS_INTERRUPT aborts a wait for a hung warm-up"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        event = threading.Event()
+        original_interrupt = Setting.IS_INTERRUPT
+
+        with ConnectionRegistry.registry_lock:
+            ConnectionRegistry._warming["MOCK::INSTR"] = event
+        try:
+            Setting.IS_INTERRUPT = True
+            with pytest.raises(VISAInterruptError):
+                ConnectionRegistry.wait_for_warm_up("MOCK::INSTR")
+        finally:
+            Setting.IS_INTERRUPT = original_interrupt
+            with ConnectionRegistry.registry_lock:
+                ConnectionRegistry._warming.pop("MOCK::INSTR", None)
+            event.set()
+
+    @patch('pyvisa.ResourceManager')
+    def test_warm_up_failure_is_reported(self, mock_rm):
+        """Test that warm-up errors are recorded instead of raised"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_rm.return_value.open_resource.side_effect = Exception("Connection failed")
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            VISA.warm_up_connections(["MOCK::INSTR"])
+            assert ConnectionRegistry.wait_for_warm_up(timeout=10) is True
+
+            errors = ConnectionRegistry.get_warm_up_errors()
+            assert "VISA Open Error" in errors["MOCK::INSTR"]
+            assert VISA.get_opened_connections() == []
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    def test_warm_up_disabled_send(self):
+        """Test that warm-up does nothing when VISA is disabled"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = False
+            assert VISA.warm_up_connections(["MOCK::INSTR"]) == []
+            assert VISA.get_warming_connections() == []
+        finally:
+            Setting.VISA_Send_Enable = original_send
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_manager_warming_instruments(self, mock_rm):
+        """Test VISAManager reporting of instruments still warming"""
+        if not IMPORT_SUCCESS or VISAManager is None:
+            pytest.skip("VISAManager not available")
+
+        release = threading.Event()
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_rm.return_value.open_resource.side_effect = \
+            lambda address: release.wait(5) and mock_resource
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+            manager = VISAManager()
+
+            manager.warm_up({"dmm": "MOCK1::INSTR"}, skip_clear=True)
+            assert manager.warming_instruments() == ["dmm"]
+
+            release.set()
+            instrument = manager.add_instrument("dmm", "MOCK1::INSTR")
+            assert instrument.handle is mock_resource
+            assert manager.warming_instruments() == []
+
+        finally:
+            release.set()
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+
+class TestPoolPolicies:
+    """Test cases for pool capacity limits and idle eviction"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.VISA_Pool_Max_Sessions,
+                         Setting.VISA_Pool_Max_Per_Interface, Setting.VISA_Pool_Idle_Timeout)
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+    def teardown_method(self):
+        (Setting.VISA_Send_Enable, Setting.VISA_Pool_Max_Sessions,
+         Setting.VISA_Pool_Max_Per_Interface, Setting.VISA_Pool_Idle_Timeout) = self.original
+        VISA.close_all_connections()
+
+    def test_interface_of(self):
+        """Test interface parsing from resource strings"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        assert ConnectionRegistry.interface_of("GPIB0::5::INSTR") == "GPIB0"
+        assert ConnectionRegistry.interface_of("gpib1::5::INSTR") == "GPIB1"
+        assert ConnectionRegistry.interface_of("TCPIP::10.0.0.2::INSTR") == "TCPIP0"
+
+    def test_lru_eviction_and_transparent_reopen(self, pooled_rm):
+        """Test that the least recently used idle session is evicted and reopened"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        Setting.VISA_Pool_Max_Sessions = 1
+
+        first = VISA("first", "USB0::1::INSTR", skip_clear=True)
+        first_handle = first.handle
+        second = VISA("second", "USB0::2::INSTR", skip_clear=True)
+
+        first_handle.close.assert_called_once()
+        assert first.handle is None
+        assert [address for address, _ in VISA.get_opened_connections()] == ["USB0::2::INSTR"]
+
+        # Transparent reopen evicts the now least recently used session
+        assert first.query("*IDN?") == "USB0::1::INSTR"
+        assert second.handle is None
+        assert VISA.get_pool_stats()["evictions"] == 2
+
+    def test_per_interface_limit(self, pooled_rm):
+        """Test that the per-interface limit only evicts the same interface"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        Setting.VISA_Pool_Max_Per_Interface = 1
+
+        usb = VISA("usb", "USB0::1::INSTR", skip_clear=True)
+        gpib_a = VISA("gpib_a", "GPIB0::1::INSTR", skip_clear=True)
+        gpib_b = VISA("gpib_b", "GPIB0::2::INSTR", skip_clear=True)
+
+        assert usb.handle is not None
+        assert gpib_a.handle is None
+        assert gpib_b.handle is not None
+        assert VISA.get_pool_stats()["per_interface"] == {"USB0": 1, "GPIB0": 1}
+
+    def test_in_use_session_is_not_evicted(self, pooled_rm):
+        """Test that sessions with I/O in flight are never evicted"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        busy = VISA("busy", "USB0::1::INSTR", skip_clear=True)
+        Setting.VISA_Pool_Max_Sessions = 1
+
+        with busy._io_scope():
+            assert VISA.get_pool_stats()["in_use"] == 1
+            assert ConnectionRegistry.make_room("USB0::2::INSTR") == 0
+        assert busy.handle is not None
+
+    def test_session_used_after_selection_is_kept(self, pooled_rm):
+        """Test that a session used between LRU selection and close stays open"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        visa = VISA("visa", "USB0::1::INSTR", skip_clear=True)
+        info = visa._session
+        selected_at = info.last_used - 1.0
+        evictions = VISA.get_pool_stats()["evictions"]
+
+        assert not ConnectionRegistry._evict(info, idle_since=selected_at)
+        assert visa.handle is not None
+        assert VISA.get_pool_stats()["evictions"] == evictions
+        assert ConnectionRegistry._evict(info, idle_since=info.last_used)
+        assert VISA.get_pool_stats()["evictions"] == evictions + 1
+
+    def test_idle_timeout_eviction(self, pooled_rm):
+        """Test that sessions idle longer than the timeout are closed"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        idle = VISA("idle", "USB0::1::INSTR", skip_clear=True)
+        active = VISA("active", "USB0::2::INSTR", skip_clear=True)
+        idle._session.last_used -= 60
+
+        assert VISA.evict_idle_connections(0) == 0
+        assert VISA.evict_idle_connections(30) == 1
+        assert idle.handle is None
+        assert active.handle is not None
+
+        stats = VISA.get_pool_stats()
+        assert stats["open_sessions"] == 1
+        assert stats["idle"] == 1
+
+
+class TestSessionStats:
+    """Test cases for per-session I/O statistics"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+    def teardown_method(self):
+        Setting.VISA_Send_Enable = self.original_send
+        VISA.close_all_connections()
+
+    def test_operations_bytes_and_errors(self, pooled_rm):
+        """Test each outermost operation is counted once with its bytes"""
+        dmm = VISA("dmm", "USB0::1::INSTR", skip_clear=True)
+        other = VISA("dmm2", "USB0::1::INSTR", skip_clear=True)
+        dmm.handle.read_raw.return_value = b"#15abcde\n"
+
+        assert dmm.query("*IDN?") == "USB0::1::INSTR"
+        dmm.write("*RST")
+        dmm.query_binary("CURV?", delay_time=0)
+        dmm.handle.write.side_effect = Exception("bus error")
+        with pytest.raises(Exception):
+            dmm.write("*CLS")
+
+        stats = VISA.get_session_stats()["USB0::1::INSTR"]
+        # query_binary's nested write/read_binary count as one operation
+        assert stats["operations"] == 4
+        assert stats["bytes_out"] == len("*IDN?") + len("*RST") + len("CURV?")
+        assert stats["bytes_in"] == len("USB0::1::INSTR") + len(b"#15abcde\n")
+        assert stats["errors"] == 1
+        assert stats["flushes"] == 4
+        assert stats["users"] == 2 and stats["owners"] == ["dmm", "dmm2"]
+        assert stats["in_use"] == 0 and stats["retries"] == 0
+        assert stats["io_seconds"] > 0 and stats["last_used"] >= stats["opened_at"]
+        other.release()
+
+    def test_fast_path_is_counted(self, pooled_rm):
+        """Test fast-path calls feed the same statistics"""
+        dmm = VISA("dmm", "USB0::1::INSTR", skip_clear=True, fast_path=True)
+
+        for _ in range(5):
+            dmm.query("MEAS?")
+        dmm.write("*RST")
+
+        stats = VISA.get_session_stats()["USB0::1::INSTR"]
+        assert stats["operations"] == 6
+        assert stats["bytes_out"] == 5 * len("MEAS?") + len("*RST")
+        assert stats["flushes"] == 6
+
+    @patch('visa_bundle.ConnectionRegistry.interruptible_sleep')
+    def test_open_retries(self, mock_sleep, pooled_rm):
+        """Test failed open attempts are reported on the opened session"""
+        resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        pooled_rm.return_value.open_resource.side_effect = [Exception("busy"), resource]
+
+        VISA("psu", "GPIB0::5::INSTR", skip_clear=True)
+        assert VISA.get_session_stats()["GPIB0::5::INSTR"]["retries"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
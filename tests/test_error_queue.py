@@ -0,0 +1,219 @@
+"""
+Test module for deferred, batched SCPI error-queue checking
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.ErrorQueue import InstrumentError, attribute_error, parse_error
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class SimulatedSCPI:
+    """Instrument with a standard event status register and an error queue."""
+
+    HEADERS = ("*CLS", "*RST", "VOLT", "CURR", "OUTP")
+
+    def __init__(self):
+        self.esr = 0
+        self.queue = []
+        self.responses = []
+        self.messages = []
+
+    def write(self, message):
+        self.messages.append(message)
+        replies = []
+        for command in message.split(";"):
+            header = command.split()[0].lstrip(":").upper()
+            if header == "*ESR?":
+                replies.append(f"+{self.esr}")
+                self.esr = 0
+            elif header == "SYST:ERR?":
+                code, text = self.queue.pop(0) if self.queue else (0, "No error")
+                replies.append(f'{code:+d},"{text}"')
+            elif header == "MEAS:VOLT?":
+                replies.append("1.25")
+            elif header == "FETC?":
+                # Answers, but flags the data it returned
+                replies.append("1,2,3")
+                self.queue.append((-230, "Data corrupt or stale"))
+                self.esr |= 0x10
+            elif header == "*CLS":
+                self.esr = 0
+                self.queue.clear()
+            elif header not in self.HEADERS:
+                self.queue.append((-113, f"Undefined header;{header}"))
+                self.esr |= 0x20
+        if replies:
+            self.responses.append(";".join(replies))
+
+    def read(self):
+        return self.responses.pop(0)
+
+    def read_raw(self):
+        return (self.read() + "\n").encode("ascii")
+
+    def read_bytes(self, count, break_on_termchar=False):
+        return self.read_raw()
+
+
+class TestErrorQueue:
+    """Test cases for enable_error_check(), error_batch() and check_errors()"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.instrument = SimulatedSCPI()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.write.side_effect = self.instrument.write
+        self.resource.read.side_effect = self.instrument.read
+        self.resource.read_raw.side_effect = self.instrument.read_raw
+        self.resource.read_bytes.side_effect = self.instrument.read_bytes
+        self.resource.read_termination = "\n"
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_parse_and_attribute(self):
+        """Test error replies are parsed and matched to commands"""
+        assert parse_error('-113,"Undefined header"\n') == (-113, "Undefined header")
+        assert parse_error('+0,"No error"') == (0, "No error")
+        assert attribute_error("Undefined header;VOLX", ["VOLT 1", "VOLX 2"]) == "VOLX 2"
+        assert attribute_error("Settings conflict", ["VOLT 1", "CURR 2"]) is None
+        assert attribute_error("Settings conflict", ["VOLT 1"]) == "VOLT 1"
+
+    def test_per_call_probe_in_same_message(self):
+        """Test call mode sends the probe with the command and raises at the cause"""
+        psu = VISA("psu", "GPIB0::5::INSTR", fast_path=True)
+        psu.enable_error_check(mode="call")
+
+        psu.write("VOLT 5")
+        assert self.instrument.messages[-1] == "VOLT 5;*ESR?"
+
+        with pytest.raises(InstrumentError) as error:
+            psu.write("VOLX 5")
+        assert [(e.code, e.command) for e in error.value.errors] == [(-113, "VOLX 5")]
+        assert self.instrument.queue == []
+
+    def test_call_mode_write_then_read(self):
+        """Test a query sent with write() leaves its reply for read()"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+        psu.enable_error_check(mode="call")
+
+        psu.write("MEAS:VOLT?")
+        assert self.instrument.messages[-1] == "MEAS:VOLT?"
+        assert psu.read() == "1.25"
+
+        # The query is checked with the next probe
+        psu.write("VOLT 5")
+        assert self.instrument.messages[-1] == "VOLT 5;*ESR?"
+        assert not psu.error_check.pending
+        assert psu.error_check.checks == 1
+
+    def test_batch_checks_once(self):
+        """Test a batch is checked with one probe and errors name their command"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+        psu.enable_error_check(mode="call")
+        self.instrument.messages.clear()
+
+        with pytest.raises(InstrumentError) as error:
+            with psu.error_batch():
+                psu.write("VOLT 5")
+                psu.write("BOGUS 1")
+                psu.write("CURR 1")
+                psu.write("OUTP ON")
+        assert self.instrument.messages == ["VOLT 5", "BOGUS 1", "CURR 1", "OUTP ON",
+                                            "*ESR?", "SYST:ERR?", "SYST:ERR?"]
+        entry = error.value.errors[0]
+        assert entry.command == "BOGUS 1"
+        assert entry.batch == ("VOLT 5", "BOGUS 1", "CURR 1", "OUTP ON")
+
+        # A clean batch costs a single probe
+        self.instrument.messages.clear()
+        with psu.error_batch():
+            psu.write("VOLT 1")
+            psu.write("CURR 1")
+        assert self.instrument.messages == ["VOLT 1", "CURR 1", "*ESR?"]
+
+    def test_raw_queries_are_attributed(self):
+        """Test query_bytes() and the streamed ASCII query record their command"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+        psu.enable_error_check(mode="call")
+
+        with pytest.raises(InstrumentError) as error:
+            with psu.error_batch():
+                assert psu.query_bytes("FETC?") == b"1,2,3"
+        assert [e.command for e in error.value.errors] == ["FETC?"]
+
+        with pytest.raises(InstrumentError) as error:
+            with psu.error_batch():
+                assert list(psu.query_ascii_values_stream("FETC?", dtype=int)) == [1, 2, 3]
+        assert [e.command for e in error.value.errors] == ["FETC?"]
+
+    def test_batch_without_mode_keeps_status(self):
+        """Test a block without an enabled mode neither clears nor stays enabled"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+
+        with psu.error_batch():
+            psu.write("VOLT 5")
+        assert "*CLS" not in self.instrument.messages
+        assert psu.error_check is None
+
+        with pytest.raises(InstrumentError) as error:
+            with psu.error_batch():
+                psu.write("BOGUS 1")
+        assert [e.command for e in error.value.errors] == ["BOGUS 1"]
+        assert psu.error_check is None
+
+    def test_periodic_collects_errors(self):
+        """Test periodic mode probes every Nth write and can only collect errors"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+        checker = psu.enable_error_check(mode="periodic", every=3, probe="SYST:ERR?",
+                                         raise_errors=False)
+
+        for command in ("VOLT 1", "BAD1 1", "CURR 1", "VOLT 2", "CURR 2", "BAD2 2"):
+            psu.write(command)
+        probed = [message for message in self.instrument.messages if ";" in message]
+        assert probed == ["CURR 1;:SYST:ERR?", "BAD2 2;:SYST:ERR?"]
+        assert [entry.command for entry in checker.errors] == ["BAD1 1", "BAD2 2"]
+
+    def test_drain_and_validation(self):
+        """Test the whole queue is drained in one call and options are checked"""
+        psu = VISA("psu", "GPIB0::5::INSTR")
+        for command in ("BAD1", "BAD2", "BAD3"):
+            psu.write(command)
+
+        assert [code for code, _ in psu.drain_errors()] == [-113, -113, -113]
+        assert psu.drain_errors() == []
+        assert psu.check_errors() == []
+
+        with pytest.raises(ValueError):
+            psu.enable_error_check(mode="sometimes")
+        with pytest.raises(ValueError):
+            psu.enable_error_check(mode="periodic")
+        assert psu.enable_error_check(False) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
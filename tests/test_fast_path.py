@@ -0,0 +1,125 @@
+"""
+Test module for Setting change notification and fast-path dispatch
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestSettingNotification:
+    """Test cases for Setting change listeners"""
+
+    def test_listener_called_on_assignment(self):
+        """Test assigning a setting notifies listeners"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        changes = []
+        original_print = Setting.VISA_Print_Enable
+        Setting.add_listener(lambda name, value: changes.append((name, value)))
+        listener = Setting._listeners[-1]
+        try:
+            Setting.VISA_Print_Enable = True
+            assert changes == [("VISA_Print_Enable", True)]
+        finally:
+            Setting.remove_listener(listener)
+            Setting.VISA_Print_Enable = original_print
+        assert len(changes) == 1
+
+
+class TestFastPath:
+    """Test cases for fast-path specialized VISA methods"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.VISA_Print_Enable,
+                         Setting.VISA_Bus_Schedule_Enable)
+        Setting.VISA_Print_Enable = False
+        Setting.VISA_Bus_Schedule_Enable = False
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.query.return_value = "+1.0E+00"
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        (Setting.VISA_Send_Enable, Setting.VISA_Print_Enable,
+         Setting.VISA_Bus_Schedule_Enable) = self.original
+
+    def test_rebinds_on_setting_change(self):
+        """Test the specialized class follows Setting changes"""
+        visa = VISA("dmm", "USB0::1::INSTR", fast_path=True)
+        direct = type(visa)
+        assert direct is not VISA and isinstance(visa, VISA)
+        assert visa.query("READ?") == "+1.0E+00"
+        self.resource.query.assert_called_with("READ?", None)
+
+        Setting.VISA_Send_Enable = False
+        assert type(visa) not in (VISA, direct)
+        assert visa.query("READ?") == "0"
+        assert self.resource.query.call_count == 1
+
+        Setting.VISA_Print_Enable = True
+        assert type(visa) is VISA
+
+        Setting.VISA_Print_Enable = False
+        Setting.VISA_Send_Enable = True
+        assert type(visa) is direct
+
+        visa.enable_fast_path(False)
+        assert type(visa) is VISA
+        Setting.VISA_Send_Enable = False
+        assert type(visa) is VISA
+
+    def test_direct_errors_match_generic(self):
+        """Test fast-path errors keep the generic messages"""
+        visa = VISA("dmm", "USB0::1::INSTR", fast_path=True)
+        self.resource.query.side_effect = Exception("timeout")
+        with pytest.raises(Exception, match="VISA Query Error"):
+            visa.query("READ?")
+        self.resource.write.side_effect = Exception("timeout")
+        with pytest.raises(Exception, match="VISA Write Error"):
+            visa.write("*RST")
+
+    def test_lazy_instance_falls_back(self):
+        """Test lazy instances open through the generic path"""
+        visa = VISA("dmm", "USB0::1::INSTR", lazy=True, fast_path=True)
+        assert visa.handle is None
+        assert visa.query("READ?") == "+1.0E+00"
+        assert visa.handle is self.resource
+
+    def test_subclass_overrides_kept(self):
+        """Test driver subclasses keep their own method overrides"""
+        class Driver(VISA):
+            def query(self, command, delay_time=None):
+                return "driver:" + VISA.query(self, command, delay_time)
+
+        driver = Driver("dmm", "USB0::1::INSTR", fast_path=True)
+        assert isinstance(driver, Driver) and type(driver) is not Driver
+        assert driver.query("READ?") == "driver:+1.0E+00"
+        driver.write("*CLS")
+        self.resource.write.assert_called_with("*CLS")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
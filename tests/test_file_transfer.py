@@ -0,0 +1,121 @@
+"""
+Test module for streaming file transfers to and from instrument storage
+"""
+
+import io
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.FileTransfer import read_block_length
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestFileTransfer:
+    """Test cases for download_file() and upload_file()"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.read_termination = "\n"
+        self.resource.write_termination = "\n"
+        self.resource.send_end = True
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def respond(self, response):
+        """Serve read_bytes() calls from a response stream."""
+        stream = io.BytesIO(response)
+        self.read_sizes = []
+
+        def read_bytes(count, break_on_termchar=False):
+            self.read_sizes.append(count)
+            return stream.read(count)
+
+        self.resource.read_bytes.side_effect = read_bytes
+
+    def test_block_header(self):
+        """Test block headers are parsed from the response"""
+        assert read_block_length(io.BytesIO(b"#3100").read) == 100
+        assert read_block_length(io.BytesIO(b"#0").read) is None
+        with pytest.raises(ValueError):
+            read_block_length(io.BytesIO(b"1.0E+00").read)
+
+    def test_download_streams_to_disk(self, tmp_path):
+        """Test a block is written to disk in chunks with progress"""
+        data = bytes(range(256)) * 40
+        self.respond(b"#5%05d" % len(data) + data + b"\n")
+        visa = VISA("sa", "TCPIP0::10.0.0.9::INSTR")
+
+        progress = []
+        local = tmp_path / "screen.png"
+        result = visa.download_file("C:/screen.png", str(local), chunk_size=4096,
+                                    on_progress=lambda done, total: progress.append((done, total)))
+
+        self.resource.write.assert_called_with('MMEM:DATA? "C:/screen.png"')
+        assert local.read_bytes() == data
+        assert result.size == len(data) and result.throughput > 0
+        assert progress == [(4096, 10240), (8192, 10240), (10240, 10240)]
+        assert max(self.read_sizes) == 4096
+        assert not (tmp_path / "screen.png.part").exists()
+
+    def test_failed_download_leaves_no_file(self, tmp_path):
+        """Test a transfer cut short removes the partial file"""
+        self.resource.read_bytes.side_effect = [b"#4", b"1000", b"x" * 10,
+                                                Exception("timeout")]
+        visa = VISA("sa", "TCPIP0::10.0.0.9::INSTR")
+
+        local = tmp_path / "trace.csv"
+        with pytest.raises(Exception, match="VISA Download Error"):
+            visa.download_file("trace.csv", str(local), chunk_size=10)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_upload_streams_block(self, tmp_path):
+        """Test a file is sent as one block message in chunks"""
+        data = os.urandom(10000)
+        local = tmp_path / "setup.sta"
+        local.write_bytes(data)
+
+        sent = []
+        self.resource.write_raw.side_effect = (
+            lambda piece: sent.append((bytes(piece), self.resource.send_end)))
+        visa = VISA("sa", "TCPIP0::10.0.0.9::INSTR")
+
+        result = visa.upload_file(str(local), "setup.sta", chunk_size=4096)
+
+        # The VISA library's ctypes backend only accepts bytes
+        assert all(type(call.args[0]) is bytes
+                   for call in self.resource.write_raw.call_args_list)
+
+        assert result.size == len(data)
+        assert b"".join(piece for piece, _ in sent) == (
+            b'MMEM:DATA "setup.sta",#510000' + data + b"\n")
+        assert len(sent) == 5
+        assert [end for _, end in sent] == [False, False, False, False, True]
+        assert self.resource.send_end is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
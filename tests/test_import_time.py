@@ -0,0 +1,74 @@
+"""
+Test module for lazy package imports (import-time regression)
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    import visa_bundle
+    from visa_bundle import VISA, Setting
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+# Modules that must not load when only Setting or version info is used
+HEAVY_MODULES = ("pyvisa", "numpy", "am_shared", "visa_bundle.VISA",
+                 "visa_bundle.ConnectionRegistry")
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter with -X importtime and list the imported modules."""
+    env = dict(os.environ, PYTHONPATH=src_path)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env, timeout=60)
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestImportTime:
+    """Test cases for lazy loading of heavy dependencies"""
+
+    def test_setting_import_is_light(self):
+        """Test importing the package and Setting loads no heavy dependency"""
+        modules = imported_modules(
+            "import visa_bundle; from visa_bundle import Setting; "
+            "Setting.VISA_Send_Enable = True; print(visa_bundle.__version__)")
+
+        assert "visa_bundle.Setting" in modules
+        loaded = [name for name in modules
+                  if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)]
+        assert loaded == []
+
+    def test_lazy_exports_resolve(self):
+        """Test lazy exports resolve to the same objects as before"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        import visa_bundle.Sweep  # noqa: F401  (loads the VISA submodule)
+        from visa_bundle.VISA import VISAManager, opened_connections
+
+        assert visa_bundle.VISA is VISA and isinstance(VISA, type)
+        assert visa_bundle.VISAManager is VISAManager
+        assert visa_bundle.opened_connections is opened_connections
+        assert visa_bundle.Setting is Setting
+        assert "VISA" in dir(visa_bundle)
+        with pytest.raises(AttributeError):
+            visa_bundle.missing_name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+"""
+Test module for lazy open mode of VISA instances
+"""
+
+import pytest
+import sys
+import os
+import threading
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestVISALazyOpen:
+    """Test cases for deferred connection opening"""
+
+    @patch('pyvisa.ResourceManager')
+    def test_lazy_instance_does_not_open(self, mock_rm):
+        """Test that a lazy instance does not connect on construction"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            visa = VISA("test_device", "MOCK::INSTR", lazy=True)
+
+            assert visa.handle is None
+            mock_rm.return_value.open_resource.assert_not_called()
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_lazy_instance_opens_on_first_io(self, mock_rm):
+        """Test that the first I/O call opens the connection once"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.query.return_value = "Test Device v1.0"
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            visa = VISA("test_device", "MOCK::INSTR", lazy=True, skip_clear=True)
+            assert visa.query("*IDN?") == "Test Device v1.0"
+            visa.write("*RST")
+
+            assert visa.handle is mock_resource
+            mock_rm.return_value.open_resource.assert_called_once_with("MOCK::INSTR")
+            mock_resource.clear.assert_not_called()
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_ensure_open_is_thread_safe(self, mock_rm):
+        """Test that concurrent first use performs a single open"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            visa = VISA("test_device", "MOCK::INSTR", lazy=True)
+            threads = [threading.Thread(target=visa.ensure_open) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert visa.handle is mock_resource
+            assert mock_rm.return_value.open_resource.call_count == 1
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_lazy_instance_closed_before_use(self, mock_rm):
+        """Test that closing an unused lazy instance cancels the deferred open"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            visa = VISA("test_device", "MOCK::INSTR", lazy=True)
+            visa.close()
+
+            with pytest.raises(Exception, match="not MessageBasedResource"):
+                visa.query("*IDN?")
+            mock_rm.return_value.open_resource.assert_not_called()
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+    @patch('pyvisa.ResourceManager')
+    def test_visa_manager_lazy_add(self, mock_rm):
+        """Test adding a lazy instrument to VISAManager"""
+        if not IMPORT_SUCCESS or VISAManager is None:
+            pytest.skip("VISAManager not available")
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            manager = VISAManager()
+
+            instrument = manager.add_instrument("dmm", "MOCK::INSTR", lazy=True)
+
+            assert instrument.handle is None
+            mock_rm.return_value.open_resource.assert_not_called()
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
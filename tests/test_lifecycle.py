@@ -0,0 +1,131 @@
+"""
+Test module for VISA lifecycle management and handle leak detection
+"""
+
+import pytest
+import sys
+import os
+import gc
+import time
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle import ConnectionRegistry
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestVISALifecycle:
+    """Test cases for context managers, release and finalizers"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.VISA_Leak_Detect,
+                         Setting.VISA_Pool_Idle_Timeout)
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+        ConnectionRegistry.clear_leaked_handles()
+
+    def teardown_method(self):
+        (Setting.VISA_Send_Enable, Setting.VISA_Leak_Detect,
+         Setting.VISA_Pool_Idle_Timeout) = self.original
+        VISA.close_all_connections()
+        ConnectionRegistry.clear_leaked_handles()
+
+    def test_context_manager_releases_session(self, pooled_rm):
+        """Test that leaving the context closes a session with no other owners"""
+
+        with VISA("test_device", "MOCK::INSTR", lazy=True) as visa:
+            handle = visa.handle
+            assert handle is not None
+            assert len(VISA.get_opened_connections()) == 1
+
+        handle.close.assert_called_once()
+        assert visa.handle is None
+        assert VISA.get_opened_connections() == []
+
+    def test_release_keeps_shared_session_open(self, pooled_rm):
+        """Test that releasing one owner leaves the session to the others"""
+
+        first = VISA("first", "MOCK::INSTR", skip_clear=True)
+        second = VISA("second", "MOCK::INSTR", skip_clear=True)
+        handle = second.handle
+
+        first.release()
+        handle.close.assert_not_called()
+        second.write("*RST")
+        handle.write.assert_called_with("*RST")
+
+        second.release()
+        handle.close.assert_called_once()
+        assert VISA.get_opened_connections() == []
+
+    def test_release_with_idle_timeout_keeps_session_pooled(self, pooled_rm):
+        """Test that released sessions stay pooled when idle eviction is enabled"""
+        Setting.VISA_Pool_Idle_Timeout = 3600.0
+
+        with VISA("test_device", "MOCK::INSTR", skip_clear=True) as visa:
+            handle = visa.handle
+
+        handle.close.assert_not_called()
+        assert VISA.get_opened_connections() == [("MOCK::INSTR", handle)]
+
+    def test_garbage_collected_owner_is_released_and_reported(self, pooled_rm):
+        """Test finalizer-based release and leak detection"""
+        Setting.VISA_Leak_Detect = True
+
+        visa = VISA("leaky", "MOCK::INSTR", skip_clear=True)
+        handle = visa.handle
+        del visa
+        gc.collect()
+
+        # Finalizer releases are processed by the releaser thread
+        deadline = time.monotonic() + 5
+        while VISA.get_opened_connections() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        handle.close.assert_called_once()
+        assert VISA.get_opened_connections() == []
+        leaks = VISA.get_leaked_handles()
+        assert len(leaks) == 1
+        assert leaks[0]["name"] == "leaky"
+        assert leaks[0]["address"] == "MOCK::INSTR"
+        assert "test_lifecycle" in leaks[0]["created_stack"]
+
+    def test_closed_owner_is_not_reported(self, pooled_rm):
+        """Test that explicitly closed instances are not reported as leaks"""
+        Setting.VISA_Leak_Detect = True
+
+        visa = VISA("tidy", "MOCK::INSTR", skip_clear=True)
+        visa.close()
+        del visa
+        gc.collect()
+        time.sleep(0.05)
+
+        assert VISA.get_leaked_handles() == []
+
+    def test_visa_manager_context_manager(self, pooled_rm):
+        """Test that VISAManager releases all instruments on exit"""
+        if VISAManager is None:
+            pytest.skip("VISAManager not available")
+
+        with VISAManager() as manager:
+            dmm = manager.add_instrument("dmm", "MOCK1::INSTR")
+            scope = manager.add_instrument("scope", "MOCK2::INSTR")
+            handles = [dmm.handle, scope.handle]
+
+        for handle in handles:
+            handle.close.assert_called_once()
+        assert manager.list_instruments() == []
+        assert VISA.get_opened_connections() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
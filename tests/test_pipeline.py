@@ -0,0 +1,135 @@
+"""
+Test module for the producer/consumer acquisition pipeline
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle.Pipeline import AcquisitionPipeline
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+def decode(data):
+    """Module-level stage so it can run in a worker process."""
+    return sum(data)
+
+
+def slow_stage(data):
+    """Stage taking as long as one acquisition."""
+    time.sleep(0.02)
+    return data
+
+
+class TestAcquisitionPipeline:
+    """Test cases for AcquisitionPipeline"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.captures = 0
+
+        def read_raw():
+            time.sleep(0.02)
+            self.captures += 1
+            return bytes([self.captures])
+
+        self.resource.read_raw.side_effect = read_raw
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_overlaps_in_order(self):
+        """Test acquisition overlaps processing and results keep their order"""
+        manager = VISAManager()
+        manager.add_instrument("scope", "TCPIP0::10.0.0.7::INSTR")
+        pipeline = manager.pipeline("scope", ":WAV:DATA?", [slow_stage, decode],
+                                    executor="thread", workers=2)
+
+        start = time.perf_counter()
+        results = pipeline.run(10)
+        elapsed = time.perf_counter() - start
+
+        assert results == list(range(1, 11))
+        # Sequential would take 10 x (20 ms + 20 ms)
+        assert elapsed < 0.32
+        stats = pipeline.stats()
+        assert stats["stages"]["acquire"]["count"] == 10
+        assert stats["stages"]["slow_stage"]["mean_ms"] >= 15
+        assert stats["stages"]["decode"]["count"] == 10
+        self.resource.write.assert_called_with(":WAV:DATA?")
+
+    def test_backpressure(self):
+        """Test acquisition pauses while max_pending captures await processing"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        processed = []
+
+        def slow_consumer(data):
+            time.sleep(0.05)
+            processed.append(data)
+            return data
+
+        ahead = []
+        pipeline = AcquisitionPipeline(
+            visa, ":WAV:DATA?", [slow_consumer], max_pending=2, executor="thread", workers=1,
+            acquire=lambda instrument: ahead.append(self.captures - len(processed))
+            or instrument.query_binary(":WAV:DATA?", 0))
+
+        assert len(pipeline.run(8)) == 8
+        assert max(ahead) <= 2
+        assert pipeline.stats()["backpressure_s"] > 0.05
+
+    def test_stage_error_stops_acquisition(self):
+        """Test a stage error is raised in order and stops acquiring"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+
+        def fail_on_third(data):
+            if data[0] == 3:
+                raise ValueError("bad capture")
+            return data[0]
+
+        pipeline = AcquisitionPipeline(visa, ":WAV:DATA?", [fail_on_third],
+                                       max_pending=2, executor="thread")
+        received = []
+        with pytest.raises(ValueError, match="bad capture"):
+            for result in pipeline.results():
+                received.append(result)
+        assert received == [1, 2]
+        captured = self.captures
+        time.sleep(0.1)
+        assert self.captures == captured <= 6
+
+    def test_process_pool(self):
+        """Test stages run in worker processes"""
+        visa = VISA("scope", "TCPIP0::10.0.0.7::INSTR")
+        pipeline = AcquisitionPipeline(visa, ":WAV:DATA?", [decode], workers=2)
+        assert pipeline.run(4) == [1, 2, 3, 4]
+
+        with pytest.raises(ValueError):
+            AcquisitionPipeline(visa, ":WAV:DATA?", [decode], max_pending=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,172 @@
+"""
+Test module for the remote instrument server and RemoteVISA client
+"""
+
+import pytest
+import sys
+import os
+import socketserver
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle import RemoteServer as remote_module
+    from visa_bundle.RemoteServer import (InstrumentServer, RemoteVISA,
+                                          encode_batch, decode_batch)
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestRemoteServer:
+    """Test cases for remote instrument access"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original = (Setting.VISA_Send_Enable, Setting.IS_SERVER)
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        self.resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        self.resource.query.return_value = "Test Device v1.0"
+        self.resource.read_raw.return_value = b"#15hello\n"
+        mock_rm.return_value.open_resource.return_value = self.resource
+
+        Setting.VISA_Send_Enable = True
+        Setting.IS_SERVER = True
+        VISA.close_all_connections()
+        self.manager = VISAManager()
+        self.manager.add_instrument("dmm", "USB0::1::INSTR")
+        self.server = InstrumentServer(self.manager, host="127.0.0.1", port=0)
+        self.server.start()
+
+    def teardown_method(self):
+        self.server.stop()
+        self.manager.close_all()
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable, Setting.IS_SERVER = self.original
+
+    def test_batch_encoding_round_trip(self):
+        """Test batch items survive encoding"""
+        items = [(3, b"*RST"), (4, b""), (1, b"x" * 300)]
+        assert decode_batch(encode_batch(items)) == items
+
+    def test_server_requires_is_server(self):
+        """Test the server refuses to start outside server mode"""
+        Setting.IS_SERVER = False
+        with pytest.raises(Exception, match="IS_SERVER"):
+            InstrumentServer(self.manager, host="127.0.0.1", port=0).start()
+
+    def test_network_interface_requires_token(self):
+        """Test the server only leaves loopback with a token and checks it"""
+        with pytest.raises(Exception, match="token"):
+            InstrumentServer(self.manager, host="0.0.0.0", port=0).start()
+        assert not socketserver.ThreadingTCPServer.allow_reuse_address
+
+        server = InstrumentServer(self.manager, host="127.0.0.1", port=0, token="s3cret")
+        server.start()
+        try:
+            with pytest.raises(Exception, match="VISA Open Error"):
+                RemoteVISA("dmm", "127.0.0.1", server.port)
+            with pytest.raises(Exception, match="VISA Open Error"):
+                RemoteVISA("dmm", "127.0.0.1", server.port, token="wrong")
+            with RemoteVISA("dmm", "127.0.0.1", server.port, token="s3cret") as remote:
+                assert remote.query("*IDN?") == "Test Device v1.0"
+            assert RemoteVISA.list_remote_instruments(
+                "127.0.0.1", server.port, token="s3cret") == ["dmm"]
+        finally:
+            server.stop()
+
+    def test_remote_query_and_write(self):
+        """Test RemoteVISA operations run on the server's instrument"""
+        with RemoteVISA("dmm", "127.0.0.1", self.server.port) as remote:
+            assert remote.query("*IDN?") == "Test Device v1.0"
+            remote.write("*RST")
+            self.resource.query.assert_called_with("*IDN?", None)
+            self.resource.write.assert_called_with("*RST")
+
+        assert RemoteVISA.list_remote_instruments("127.0.0.1", self.server.port) == ["dmm"]
+
+    def test_lease_is_exclusive(self):
+        """Test a leased instrument cannot be leased by another client"""
+        first = RemoteVISA("dmm", "127.0.0.1", self.server.port)
+        try:
+            with pytest.raises(Exception, match="VISA Open Error"):
+                RemoteVISA("dmm", "127.0.0.1", self.server.port)
+        finally:
+            first.close()
+
+        # Released leases are available again
+        RemoteVISA("dmm", "127.0.0.1", self.server.port).close()
+
+    def test_unknown_instrument(self):
+        """Test leasing an instrument the server does not manage"""
+        with pytest.raises(Exception, match="VISA Open Error"):
+            RemoteVISA("scope", "127.0.0.1", self.server.port)
+
+    def test_execute_batch(self):
+        """Test several operations in one round trip"""
+        with RemoteVISA("dmm", "127.0.0.1", self.server.port) as remote:
+            results = remote.execute_batch([("write", "*CLS"), ("query", "*IDN?")])
+        assert results == [None, "Test Device v1.0"]
+        self.resource.write.assert_called_with("*CLS")
+
+    def test_query_binary_streams_chunks(self):
+        """Test binary responses are streamed in chunks while they are read"""
+        payload = bytes(range(256)) * 40
+        block = b"#510240" + payload + b"\n"
+        stream = bytearray()
+        reads = []
+
+        def read_bytes(count, break_on_termchar=False):
+            reads.append(count)
+            data = bytes(stream[:count])
+            del stream[:count]
+            return data
+
+        self.resource.read_termination = "\n"
+        self.resource.write.side_effect = lambda command: stream.extend(block)
+        self.resource.read_bytes.side_effect = read_bytes
+        original_chunk = remote_module.STREAM_CHUNK_SIZE
+        try:
+            remote_module.STREAM_CHUNK_SIZE = 1024
+            with RemoteVISA("dmm", "127.0.0.1", self.server.port) as remote:
+                assert remote.query_binary("CURV?", delay_time=0) == block
+
+                chunks = []
+                total = remote.query_binary("CURV?", delay_time=0, on_chunk=chunks.append)
+                assert len(chunks) == 11
+                assert b"".join(chunks) == block
+                assert total == len(block)
+
+            # The instrument is read in chunks, never as one whole block
+            assert max(reads) == 1024
+            self.resource.read_raw.assert_not_called()
+        finally:
+            remote_module.STREAM_CHUNK_SIZE = original_chunk
+
+    def test_query_bytes_and_lease_helpers(self):
+        """Test query_bytes, ensure_open and release on the remote client"""
+        self.resource.read_raw.return_value = b"1.25\n"
+        self.resource.read_termination = "\n"
+        remote = RemoteVISA("dmm", "127.0.0.1", self.server.port)
+        try:
+            assert remote.query_bytes("READ?") == b"1.25"
+            remote.release()
+            assert remote.lease_id == 0
+            remote.ensure_open()
+            assert remote.lease_id
+            assert remote.query("*IDN?") == "Test Device v1.0"
+        finally:
+            remote.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+"""
+Test module for service request (SRQ) driven waits
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.BusScheduler import get_scheduler
+    from visa_bundle.ServiceRequest import STB_ESB, STB_RQS, SRQTimeoutError
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+def simulated_srq_resource(events=True, delay=0.1):
+    """
+    Resource whose '*OPC' requests service after a delay.
+
+    With events the SRQ is delivered through wait_on_event(); without them
+    enable_event() fails and the status byte has to be polled with '*STB?'.
+    """
+    resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+    resource.timeout = 2000
+    state = {"stb": 0}
+    srq = threading.Event()
+
+    def assert_srq():
+        state["stb"] |= STB_ESB | STB_RQS
+        srq.set()
+
+    def write(command):
+        if command.endswith("*OPC"):
+            threading.Timer(delay, assert_srq).start()
+
+    def wait_on_event(event_type, timeout):
+        if not srq.wait(timeout / 1000.0):
+            raise pyvisa.errors.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+        srq.clear()
+
+    def read_stb():
+        status = state["stb"]
+        state["stb"] &= ~STB_RQS
+        return status
+
+    resource.write.side_effect = write
+    if events:
+        resource.wait_on_event.side_effect = wait_on_event
+        resource.read_stb.side_effect = read_stb
+    else:
+        resource.enable_event.side_effect = pyvisa.errors.VisaIOError(
+            pyvisa.constants.StatusCode.error_invalid_event)
+        del resource.read_stb
+        resource.query.side_effect = lambda command, delay=None: str(state["stb"])
+    return resource
+
+
+class TestServiceRequest:
+    """Test cases for wait_for_srq() and on_srq()"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        self.open_resource = self.rm_patch.start().return_value.open_resource
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_waits_on_srq_event(self):
+        """Test the wait ends on the SRQ event without polling"""
+        resource = simulated_srq_resource(events=True)
+        self.open_resource.return_value = resource
+        visa = VISA("dmm", "GPIB0::5::INSTR")
+
+        visa.write("*ESE 1;*SRE 32;INIT;*OPC")
+        start = time.monotonic()
+        status = visa.wait_for_srq(timeout=2.0)
+        assert 0.05 < time.monotonic() - start < 1.0
+        assert status & STB_RQS
+        resource.enable_event.assert_called_once()
+        # One status read up front, one after the event
+        assert resource.read_stb.call_count == 2
+
+    def test_wait_does_not_hold_bus(self):
+        """Test the bus is free and no I/O time is counted while waiting"""
+        self.open_resource.return_value = simulated_srq_resource(events=True, delay=0.3)
+        original = Setting.VISA_Bus_Schedule_Enable
+        try:
+            Setting.VISA_Bus_Schedule_Enable = True
+            get_scheduler().reset()
+            visa = VISA("dmm", "GPIB0::5::INSTR")
+            visa.write("INIT;*OPC")
+
+            taken = threading.Event()
+
+            def other():
+                time.sleep(0.1)
+                with get_scheduler().slot("GPIB0::9::INSTR"):
+                    taken.set()
+
+            thread = threading.Thread(target=other)
+            thread.start()
+            assert visa.wait_for_srq(timeout=2.0) & STB_RQS
+            thread.join()
+            assert taken.is_set()
+
+            stats = VISA.get_session_stats()["GPIB0::5::INSTR"]
+            assert stats["io_seconds"] < 0.1
+        finally:
+            Setting.VISA_Bus_Schedule_Enable = original
+            get_scheduler().reset()
+
+    def test_polls_without_events(self):
+        """Test the status byte is polled when the backend has no SRQ events"""
+        resource = simulated_srq_resource(events=False)
+        self.open_resource.return_value = resource
+        visa = VISA("psu", "TCPIP0::10.0.0.5::5025::SOCKET")
+
+        visa.write("INIT;*OPC")
+        assert visa.wait_for_srq(STB_ESB, timeout=2.0) & STB_ESB
+        resource.query.assert_called_with("*STB?")
+        resource.wait_on_event.assert_not_called()
+
+    def test_timeout(self):
+        """Test an SRQ that never arrives raises SRQTimeoutError"""
+        self.open_resource.return_value = simulated_srq_resource(events=True)
+        visa = VISA("dmm", "GPIB0::5::INSTR")
+
+        start = time.monotonic()
+        with pytest.raises(SRQTimeoutError):
+            visa.wait_for_srq(timeout=0.2)
+        assert time.monotonic() - start < 1.0
+
+    def test_on_srq_callback(self):
+        """Test a registered callback receives each service request"""
+        self.open_resource.return_value = simulated_srq_resource(events=True, delay=0.05)
+        visa = VISA("dmm", "GPIB0::5::INSTR")
+
+        received = []
+        done = threading.Event()
+        listener = visa.on_srq(lambda status: (received.append(status), done.set()))
+        visa.write("INIT;*OPC")
+        assert done.wait(2.0)
+        assert received[0] & STB_RQS
+
+        visa.close()
+        listener._thread.join(1.0)
+        assert not listener.running
+        assert listener.error is None
+
+    def test_on_srq_refused_without_serial_poll(self):
+        """Test no listener polls '*STB?' alongside the caller's own queries"""
+        resource = simulated_srq_resource(events=False)
+        self.open_resource.return_value = resource
+        visa = VISA("psu", "TCPIP0::10.0.0.5::5025::SOCKET")
+
+        with pytest.raises(RuntimeError):
+            visa.on_srq(lambda status: None)
+        assert visa._srq_listener is None
+        resource.query.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
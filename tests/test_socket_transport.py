@@ -0,0 +1,171 @@
+"""
+Test module for the native raw TCP socket transport
+"""
+
+import pytest
+import sys
+import os
+import socket
+import threading
+import time
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, Setting
+    from visa_bundle.SocketTransport import SocketResource, parse_socket_address
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+# Binary block whose data contains the termination character
+BLOCK = b"#210" + b"ab\ncd\nef\n!" + b"\n"
+
+
+class FakeInstrument:
+    """Minimal raw SCPI instrument on a local port."""
+
+    def __init__(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(4)
+        self.port = self.listener.getsockname()[1]
+        self.received = []
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        try:
+            while True:
+                connection, _ = self.listener.accept()
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        except OSError:
+            pass
+
+    def _handle(self, connection):
+        pending = b""
+        with connection:
+            while True:
+                data = connection.recv(4096)
+                if not data:
+                    return
+                pending += data
+                while b"\n" in pending:
+                    line, pending = pending.split(b"\n", 1)
+                    self.received.append(line)
+                    if line == b"*IDN?":
+                        # Split the response to exercise buffering
+                        connection.sendall(b"ACME,SOCK")
+                        connection.sendall(b"ET,1,1.0\n")
+                    elif line == b"CURV?":
+                        connection.sendall(BLOCK)
+                    elif line == b"NOTERM?":
+                        connection.sendall(b"#13abc")
+                    elif line == b"STALE":
+                        connection.sendall(b"old data, sent in one piece\n")
+
+    def close(self):
+        self.listener.close()
+
+
+class TestSocketTransport:
+    """Test cases for SocketResource and VISA(transport="socket")"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+        self.instrument = FakeInstrument()
+        self.address = f"TCPIP0::127.0.0.1::{self.instrument.port}::SOCKET"
+
+    def teardown_method(self):
+        VISA.close_all_connections()
+        self.instrument.close()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_parse_socket_address(self):
+        """Test parsing host and port from SOCKET resources"""
+        assert parse_socket_address("TCPIP0::10.0.0.5::5025::SOCKET") == ("10.0.0.5", 5025)
+        assert parse_socket_address("TCPIP::scope.lan::SOCKET") == ("scope.lan", 5025)
+        with pytest.raises(ValueError):
+            parse_socket_address("TCPIP0::10.0.0.5::inst0::INSTR")
+
+    def test_resource_query_and_block(self):
+        """Test text queries and IEEE blocks containing terminations"""
+        resource = SocketResource.open(self.address)
+        try:
+            assert resource.query("*IDN?") == "ACME,SOCKET,1,1.0"
+            resource.write("CURV?")
+            assert resource.read_raw() == BLOCK
+            resource.write("*IDN?")
+            assert resource.read_bytes(4) == b"ACME"
+            assert resource.read() == ",SOCKET,1,1.0"
+        finally:
+            resource.close()
+
+    def test_flush_discards_stale_data(self):
+        """Test flushing drops unread responses"""
+        resource = SocketResource.open(self.address)
+        try:
+            resource.write("STALE")
+            resource.read_bytes(1)
+            resource.flush(0)
+            assert resource.query("*IDN?") == "ACME,SOCKET,1,1.0"
+        finally:
+            resource.close()
+
+    def test_visa_socket_transport(self):
+        """Test VISA routes through the native transport when selected"""
+        visa = VISA("sock", self.address, transport="socket")
+        try:
+            assert isinstance(visa.handle, SocketResource)
+            assert visa.query("*IDN?") == "ACME,SOCKET,1,1.0"
+            assert visa.query_binary("CURV?", delay_time=0) == BLOCK
+            visa.write("*RST")
+            assert visa.query("*IDN?") == "ACME,SOCKET,1,1.0"
+        finally:
+            visa.close()
+        assert b"*RST" in self.instrument.received
+
+    def test_block_into_buffer(self):
+        """Test blocks are received straight into a caller's buffer"""
+        visa = VISA("sock", self.address, transport="socket")
+        try:
+            buffer = bytearray(64)
+            for _ in range(3):
+                assert visa.query_binary_into("CURV?", buffer) == 10
+                assert buffer[:10] == BLOCK[4:-1]
+            assert visa.query("*IDN?") == "ACME,SOCKET,1,1.0"
+        finally:
+            visa.close()
+
+    def test_block_without_termination(self):
+        """Test a block that ends without a termination does not wait for the timeout"""
+        visa = VISA("sock", self.address, transport="socket")
+        try:
+            visa.handle.timeout = 5000
+            start = time.monotonic()
+            visa.write("NOTERM?")
+            assert visa.handle.read_raw() == b"#13abc"
+            buffer = bytearray(8)
+            assert visa.query_binary_into("NOTERM?", buffer) == 3
+            assert buffer[:3] == b"abc"
+            assert time.monotonic() - start < 2
+            assert visa.query("*IDN?") == "ACME,SOCKET,1,1.0"
+        finally:
+            visa.close()
+
+    def test_unknown_transport(self):
+        """Test an unknown transport is rejected"""
+        with pytest.raises(ValueError):
+            VISA("sock", self.address, transport="serial")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
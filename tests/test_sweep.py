@@ -0,0 +1,156 @@
+"""
+Test module for the declarative sweep engine
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle.Sweep import Measurement, Sweep, SweepAxis
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestSweep:
+    """Test cases for Sweep"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.log = []
+        self.resources = {}
+
+        def open_resource(address):
+            resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+            resource.write.side_effect = lambda command: self.log.append((address, "write", command))
+            resource.read.side_effect = lambda: self.log.append((address, "read")) or "1.5"
+            resource.query.side_effect = lambda command, delay=None: (
+                self.log.append((address, "query", command)) or "2.5")
+            self.resources[address] = resource
+            return resource
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        mock_rm.return_value.open_resource.side_effect = open_resource
+
+        self.manager = VISAManager()
+        self.manager.add_instrument("src", "GPIB0::1::INSTR")
+        self.manager.add_instrument("dmm", "GPIB0::2::INSTR")
+        self.manager.add_instrument("scope", "USB0::3::INSTR")
+        self.log.clear()
+
+    def teardown_method(self):
+        self.manager.close_all()
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_pipelined_sweep_results(self):
+        """Test results table and that triggers precede reads"""
+        sweep = Sweep(self.manager,
+                      [SweepAxis("v", "src", "VOLT {value}", [1.0, 2.0])],
+                      [Measurement("i", "dmm", "CURR?"), Measurement("f", "scope", "FREQ?")])
+        result = sweep.run()
+
+        assert result.dtype.names == ("v", "i", "f")
+        assert list(result["v"]) == [1.0, 2.0]
+        assert list(result["i"]) == [1.5, 1.5]
+        assert self.log[:5] == [
+            ("GPIB0::1::INSTR", "write", "VOLT 1.0"),
+            ("GPIB0::2::INSTR", "write", "CURR?"),
+            ("USB0::3::INSTR", "write", "FREQ?"),
+            ("GPIB0::2::INSTR", "read"),
+            ("USB0::3::INSTR", "read"),
+        ]
+
+    def test_settled_instruments_measure_during_settling(self):
+        """Test a measurement independent of a settling axis is read meanwhile"""
+        sweep = Sweep(self.manager,
+                      [SweepAxis("v", "src", "VOLT {value}", [1.0], settle=0.2),
+                       SweepAxis("f", "scope", "FREQ {value}", [10])],
+                      [Measurement("i", "dmm", "CURR?"),
+                       Measurement("p", "scope", "PER?", settle_on=["f"])])
+        read_at = {}
+        for address in ("GPIB0::2::INSTR", "USB0::3::INSTR"):
+            self.resources[address].read.side_effect = (
+                lambda address=address: read_at.setdefault(address, time.perf_counter()) and "1.5")
+
+        start = time.perf_counter()
+        sweep.run()
+
+        assert [entry[2] for entry in self.log if entry[1] == "write"] == [
+            "VOLT 1.0", "FREQ 10", "PER?", "CURR?"]
+        assert read_at["USB0::3::INSTR"] - start < 0.1
+        assert read_at["GPIB0::2::INSTR"] - start >= 0.2
+
+        with pytest.raises(KeyError):
+            Sweep(self.manager, [SweepAxis("v", "src", "VOLT {value}", [1])],
+                  [Measurement("i", "dmm", "CURR?", settle_on=["x"])])
+
+    def test_only_changed_axes_are_written(self):
+        """Test nested axes write the outer setpoint once per change"""
+        sweep = Sweep(self.manager,
+                      [SweepAxis("v", "src", "VOLT {value}", [1, 2]),
+                       SweepAxis("f", "scope", "FREQ {value}", [10, 20, 30])],
+                      [Measurement("i", "dmm", "CURR?")])
+        result = sweep.run(pipelined=False)
+
+        assert len(result) == 6
+        writes = [entry[2] for entry in self.log if entry[1] == "write"]
+        assert writes.count("VOLT 1") == 1 and writes.count("VOLT 2") == 1
+        assert writes.count("FREQ 10") == 2
+        assert [entry[2] for entry in self.log if entry[1] == "query"] == ["CURR?"] * 6
+
+    def test_list_mode_axis(self):
+        """Test list axes load values once and step with triggers"""
+        sweep = Sweep(self.manager,
+                      [SweepAxis("v", "src", "VOLT {value}", [1, 2, 3],
+                                 list_command="LIST:VOLT {values}", step_command="*TRG")],
+                      [Measurement("i", "dmm", "CURR?")])
+        sweep.run()
+
+        source_writes = [entry[2] for entry in self.log if entry[0] == "GPIB0::1::INSTR"]
+        assert source_writes == ["LIST:VOLT 1,2,3", "*TRG", "*TRG"]
+
+    def test_axis_columns_keep_their_types(self):
+        """Test axis column dtypes are inferred from the values or given per axis"""
+        pytest.importorskip("numpy")
+        sweep = Sweep(self.manager,
+                      [SweepAxis("ch", "scope", "CHAN {value}", ["CH1", "CH10"]),
+                       SweepAxis("rng", "dmm", "RANG {value[0]},{value[1]}", [(0, 10), (0, 100)]),
+                       SweepAxis("n", "src", "COUN {value}", [3, 2 ** 40]),
+                       SweepAxis("v", "src", "VOLT {value}", [1, 2], dtype="f4")],
+                      [Measurement("i", "dmm", "CURR?")])
+        result = sweep.run()
+
+        assert [result.dtype[name].kind for name in ("ch", "rng", "n", "v")] == [
+            "U", "O", "i", "f"]
+        assert result.dtype["v"].itemsize == 4
+        assert list(result["ch"][::8]) == ["CH1", "CH10"]
+        assert result["rng"][-1] == (0, 100)
+        assert result["n"][-1] == 2 ** 40
+        assert "RANG 0,100" in [entry[2] for entry in self.log if entry[1] == "write"]
+
+    def test_unknown_instrument(self):
+        """Test sweeps naming unmanaged instruments are rejected"""
+        with pytest.raises(KeyError):
+            Sweep(self.manager, [SweepAxis("v", "psu", "VOLT {value}", [1])], [])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
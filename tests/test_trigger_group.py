@@ -0,0 +1,112 @@
+"""
+Test module for synchronized multi-instrument trigger groups
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+import pyvisa
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import VISA, VISAManager, Setting
+    from visa_bundle.TriggerGroup import Acquisition, TriggerGroup
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+FETCH_TIME = 0.2
+
+
+class TestTriggerGroup:
+    """Test cases for TriggerGroup"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+        self.original_send = Setting.VISA_Send_Enable
+        Setting.VISA_Send_Enable = True
+        VISA.close_all_connections()
+
+        self.writes = []
+
+        def open_resource(address):
+            resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+            resource.write.side_effect = lambda command: self.writes.append((address, command))
+            resource.query.return_value = "1"
+
+            def read_raw():
+                time.sleep(FETCH_TIME)
+                return address.encode("ascii")
+
+            resource.read_raw.side_effect = read_raw
+            return resource
+
+        self.rm_patch = patch('pyvisa.ResourceManager')
+        mock_rm = self.rm_patch.start()
+        mock_rm.return_value.open_resource.side_effect = open_resource
+
+        self.manager = VISAManager()
+        for index in range(4):
+            self.manager.add_instrument(f"scope{index}", f"TCPIP0::10.0.0.{index}::INSTR")
+
+    def teardown_method(self):
+        self.manager.close_all()
+        VISA.close_all_connections()
+        self.rm_patch.stop()
+        Setting.VISA_Send_Enable = self.original_send
+
+    def test_acquire_fetches_concurrently(self):
+        """Test the group arms, triggers and fetches all scopes in parallel"""
+        group = self.manager.trigger_group([f"scope{index}" for index in range(4)])
+        assert isinstance(group, TriggerGroup)
+
+        start = time.perf_counter()
+        results = group.acquire(arm=":SING", fetch=":WAV:DATA?")
+        elapsed = time.perf_counter() - start
+
+        # Four fetches on separate LAN hosts overlap instead of adding up
+        assert elapsed < FETCH_TIME * 3
+        assert set(results) == {f"scope{index}" for index in range(4)}
+        acquisition = results["scope2"]
+        assert isinstance(acquisition, Acquisition)
+        assert acquisition.data == b"TCPIP0::10.0.0.2::INSTR"
+        assert acquisition.triggered_at <= acquisition.completed_at <= acquisition.fetched_at
+
+        arms = [command for _, command in self.writes if command == ":SING"]
+        triggers = [command for _, command in self.writes if command == "*TRG"]
+        assert len(arms) == 4 and len(triggers) == 4
+        # Every instrument is armed before any trigger is sent
+        commands = [command for _, command in self.writes]
+        assert commands.index("*TRG") > len(commands) - 1 - commands[::-1].index(":SING")
+
+    def test_external_trigger_callable(self):
+        """Test an external trigger source replaces software triggers"""
+        group = TriggerGroup(self.manager, ["scope0", "scope1"])
+        fired = threading.Event()
+
+        group.arm({"scope0": "INIT", "scope1": ":SING"})
+        group.fire(fired.set)
+        completed = group.wait_complete()
+
+        assert fired.is_set()
+        assert set(completed) == {"scope0", "scope1"}
+        assert ("TCPIP0::10.0.0.0::INSTR", "INIT") in self.writes
+        assert not any(command == "*TRG" for _, command in self.writes)
+
+    def test_unknown_instrument(self):
+        """Test groups naming unmanaged instruments are rejected"""
+        with pytest.raises(KeyError):
+            self.manager.trigger_group(["scope9"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
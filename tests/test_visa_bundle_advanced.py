@@ -274,6 +274,35 @@ class TestVISAAdvancedScenarios:
             Setting.VISA_Send_Enable = original_send
             VISA.close_all_connections()
 
+    @patch('pyvisa.ResourceManager')
+    def test_visa_query_bytes_strips_termination(self, mock_rm):
+        """Test VISA query_bytes returns undecoded bytes without termination"""
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+        mock_resource = Mock(spec=pyvisa.resources.MessageBasedResource)
+        mock_resource.read_termination = "\n"
+        mock_resource.read_raw.return_value = b"+1.2345E+00\n"
+        mock_resource.read_bytes.return_value = b"\xb5A"
+        mock_rm.return_value.open_resource.return_value = mock_resource
+
+        original_send = Setting.VISA_Send_Enable
+
+        try:
+            Setting.VISA_Send_Enable = True
+            VISA.close_all_connections()
+
+            visa = VISA("test_device", "MOCK::INSTR", encoding="latin-1")
+            assert visa.query_bytes("MEAS?") == b"+1.2345E+00"
+            mock_resource.write.assert_called_with("MEAS?")
+            assert visa.read_bytes() == b"+1.2345E+00"
+            assert visa.read_bytes(2) == b"\xb5A"
+            assert visa.read(count=2) == "µA"
+
+        finally:
+            Setting.VISA_Send_Enable = original_send
+            VISA.close_all_connections()
+
 
 class TestVISAErrorScenarios:
     """Test error handling scenarios"""
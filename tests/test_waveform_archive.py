@@ -0,0 +1,140 @@
+"""
+Test module for the chunked, compressed waveform archive
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path to import the package
+src_path = os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+try:
+    from visa_bundle import WaveformArchive as archive_module
+    from visa_bundle.BinaryBlock import block_data
+    from visa_bundle.WaveformArchive import WaveformArchive
+    IMPORT_SUCCESS = True
+except ImportError:
+    IMPORT_SUCCESS = False
+
+
+class TestWaveformArchive:
+    """Test cases for writing and reading archives"""
+
+    def setup_method(self):
+        if not IMPORT_SUCCESS:
+            pytest.skip("Failed to import required modules")
+
+    def test_block_data(self):
+        """Test block headers and terminations are stripped without copying"""
+        assert bytes(block_data(b"#15hello\n")) == b"hello"
+        assert bytes(block_data(b"#0hello\r\n")) == b"hello"
+        assert bytes(block_data(b"1,2,3")) == b"1,2,3"
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma", "none"])
+    def test_round_trip(self, tmp_path, codec):
+        """Test captures and metadata survive a write/read round trip"""
+        numpy = pytest.importorskip("numpy")
+        path = str(tmp_path / "run.vbw")
+        wave = (numpy.sin(numpy.arange(100000) / 50.0) * 100).astype("<i2")
+        frames = numpy.arange(4000, dtype="<f4").reshape(100, 40)
+
+        with WaveformArchive(path, "w", codec=codec, chunk_size=16384) as archive:
+            archive.add("ch1", wave, {"idn": "SCOPE", "scaling": {"scale": 0.5, "offset": 1.0}})
+            archive.add("frames", frames)
+            with pytest.raises(ValueError):
+                archive.add("ch1", wave)
+
+        with WaveformArchive(path) as archive:
+            assert archive.names() == ["ch1", "frames"]
+            assert numpy.array_equal(archive.read("ch1"), wave)
+            assert numpy.array_equal(archive.read("frames"), frames)
+            assert numpy.allclose(archive.read("ch1", scaled=True), wave * 0.5 + 1.0)
+            assert archive.metadata("ch1")["idn"] == "SCOPE"
+            assert archive.metadata("frames")["shape"] == [100, 40]
+        if codec != "none":
+            assert os.path.getsize(path) < wave.nbytes
+
+    def test_random_access_decompresses_only_needed_chunks(self, tmp_path):
+        """Test chunks and ranges are read without the rest of the capture"""
+        numpy = pytest.importorskip("numpy")
+        path = str(tmp_path / "run.vbw")
+        data = numpy.arange(100000, dtype="<i4")
+        with WaveformArchive(path, "w", chunk_size=4000) as archive:
+            archive.add("ch1", data)
+
+        with WaveformArchive(path) as archive:
+            assert archive.chunk_count("ch1") == 100
+            with patch.object(archive_module, "_decompress",
+                              wraps=archive_module._decompress) as decompress:
+                assert numpy.array_equal(archive.read_chunk("ch1", 7), data[7000:8000])
+                assert numpy.array_equal(archive.read_range("ch1", 1500, 2500), data[1500:2500])
+            assert decompress.call_count == 3
+
+    def test_append_and_capture(self, tmp_path):
+        """Test appending instrument captures to an existing archive"""
+        numpy = pytest.importorskip("numpy")
+        path = str(tmp_path / "run.vbw")
+        with WaveformArchive(path, "w") as archive:
+            archive.add("first", numpy.zeros(10, dtype="<i1"))
+
+        scope = Mock()
+        scope.name = "scope"
+        scope.address = "TCPIP0::10.0.0.7::INSTR"
+        scope.query.return_value = "KEYSIGHT,DSOX,1,1.0\n"
+        scope.query_binary.return_value = b"#16" + bytes([1, 2, 3, 253, 254, 255]) + b"\n"
+
+        with WaveformArchive(path, "a") as archive:
+            name = archive.capture(scope, ":WAV:DATA?", scaling={"scale": 0.01}, channel=1)
+            archive.capture(scope, ":WAV:DATA?")
+        scope.query.assert_called_once_with("*IDN?")
+
+        with WaveformArchive(path) as archive:
+            assert archive.names() == ["first", name, "scope_2"]
+            assert archive.read(name).tolist() == [1, 2, 3, -3, -2, -1]
+            metadata = archive.metadata(name)
+            assert metadata["idn"] == "KEYSIGHT,DSOX,1,1.0"
+            assert metadata["command"] == ":WAV:DATA?" and metadata["channel"] == 1
+            assert metadata["received_at"] >= metadata["requested_at"]
+            with pytest.raises(ValueError):
+                archive.add("more", b"x")
+
+
+    def test_unclosed_append_keeps_previous_index(self, tmp_path, monkeypatch):
+        """Test an append session that never closes loses only its own captures"""
+        numpy = pytest.importorskip("numpy")
+        # Small scan blocks so the footer search crosses block boundaries
+        monkeypatch.setattr(archive_module, "ARCHIVE_CHUNK_SIZE", 37)
+        path = str(tmp_path / "run.vbw")
+        first = numpy.arange(5000, dtype="<i2")
+        with WaveformArchive(path, "w", chunk_size=1024) as archive:
+            archive.add("first", first)
+
+        archive = WaveformArchive(path, "a")
+        archive.add("lost", numpy.ones(5000, dtype="<i2"))
+        archive._file.close()  # Crash: the new index is never written
+
+        with WaveformArchive(path) as archive:
+            assert archive.names() == ["first"]
+            assert numpy.array_equal(archive.read("first"), first)
+
+        with WaveformArchive(path, "a") as archive:
+            archive.add("second", numpy.full(10, 7, dtype="<i1"))
+        with WaveformArchive(path) as archive:
+            assert archive.names() == ["first", "second"]
+            assert numpy.array_equal(archive.read("first"), first)
+            assert archive.read("second").tolist() == [7] * 10
+
+        # Without any complete index the archive is still rejected
+        archive = WaveformArchive(str(tmp_path / "new.vbw"), "w")
+        archive.add("lost", first)
+        archive._file.close()
+        with pytest.raises(ValueError):
+            WaveformArchive(str(tmp_path / "new.vbw"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])